@@ -29,6 +29,7 @@ try:
 except ImportError:
     HUGGINGFACE_AVAILABLE = False
 
+from augmentation_view import materialize_dataset
 from config_manager import OLMoSecurityConfig
 
 # Setup logging
@@ -271,10 +272,10 @@ class ArtifactUploader:
 
             logger.info(f"📦 Staging dataset artifacts: {dataset_staging_dir}")
 
-            # Copy datasets to staging
+            # Copy datasets to staging (regenerating augmented examples stored in augmentation views)
             import shutil
-            shutil.copy2(train_file, dataset_staging_dir / "train.jsonl")
-            shutil.copy2(val_file, dataset_staging_dir / "valid.jsonl")
+            materialize_dataset(train_file, dataset_staging_dir / "train.jsonl")
+            materialize_dataset(val_file, dataset_staging_dir / "valid.jsonl")
             shutil.copy2(test_file, dataset_staging_dir / "test.jsonl")
 
             # Create README.md in staging with model reference
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Augmentation views: augmented examples stored as recipes instead of copies
+
+Writing every augmented example into train_dataset.jsonl and
+validation_dataset.jsonl made those files (and the memory to process them)
+about four times the size of the original examples. With an augmentation
+view, a dataset file holds only the originals, and a sidecar file
+(<dataset>.augmentation.jsonl) holds one small record per augmented example:
+
+    {"sources": [12], "type": "semantic_paraphrase", "seed": 8315...}
+
+A header line records the augmentation config and a fingerprint of the
+augmentor sources; a view written by a different augmentor is rejected rather
+than regenerated into different examples. The augmented examples are
+regenerated from the records (see SecurityDataAugmentor.create_variant) only
+when the dataset is streamed to a consumer, such as the trainer's data
+directory or Stage 2 mixing.
+
+iter_dataset_examples() yields the originals first, then the augmented examples
+in record order (grouped by augmentation type). materialize_dataset() shuffles
+them with a fixed seed, so files handed to MLX or uploaded are mixed the way a
+dataset written without a view is.
+
+Datasets without a sidecar file stream as-is, so every reader can use
+iter_dataset_examples() unconditionally.
+
+Usage:
+    write_augmentation_view(train_file, augmentor, augmentor.iter_augmentation_records(originals))
+    for example in iter_dataset_examples(train_file):
+        ...
+"""
+
+import json
+import random
+import shutil
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List
+
+from dataset_augmentor import AugmentationConfig, SecurityDataAugmentor
+from parse_cache import source_fingerprint
+from training_dataset_io import ShuffledJsonlWriter
+
+# Bump when the record layout changes
+VIEW_FORMAT_VERSION = 2
+
+# Sources that decide what a record regenerates into
+AUGMENTOR_SOURCES = [Path(__file__).resolve().parent / "dataset_augmentor.py"]
+
+# Seed of the shuffle applied when a view is materialized
+MATERIALIZE_SHUFFLE_SEED = 42
+
+
+def augmentation_view_path(dataset_file: Path) -> Path:
+    """Augmentation view accompanying a dataset file."""
+    dataset_file = Path(dataset_file)
+    return dataset_file.with_name(f"{dataset_file.stem}.augmentation.jsonl")
+
+
+def write_augmentation_view(dataset_file: Path, augmentor: SecurityDataAugmentor,
+                            records: Iterable[Dict[str, Any]]) -> int:
+    """
+    Write the augmentation view of a dataset file (whose lines the records' sources index).
+
+    Returns:
+        Number of records written
+    """
+    count = 0
+    with open(augmentation_view_path(dataset_file), 'w') as f:
+        header = {
+            'format_version': VIEW_FORMAT_VERSION,
+            'config': asdict(augmentor.config),
+            'augmentor_fingerprint': source_fingerprint(AUGMENTOR_SOURCES),
+        }
+        f.write(json.dumps(header) + '\n')
+        for record in records:
+            f.write(json.dumps(record) + '\n')
+            count += 1
+    return count
+
+
+def _line_offsets(path: Path) -> List[int]:
+    offsets = []
+    with open(path, 'rb') as f:
+        position = 0
+        for line in f:
+            if line.strip():
+                offsets.append(position)
+            position += len(line)
+    return offsets
+
+
+def augmentation_record_count(dataset_file: Path) -> int:
+    """Number of augmented examples in a dataset's view (0 without a view)."""
+    view_file = augmentation_view_path(dataset_file)
+    if not view_file.exists():
+        return 0
+    with open(view_file, 'r') as f:
+        # Every line after the header is a record
+        return sum(1 for line in f if line.strip()) - 1
+
+
+def iter_augmented_examples(dataset_file: Path) -> Iterator[Dict[str, Any]]:
+    """
+    Regenerate the augmented examples of a dataset's view (nothing without a view).
+
+    Only line offsets of the dataset are kept in memory; the sources of each record
+    are read back from the dataset file when the record is regenerated.
+
+    Raises:
+        ValueError: If the view has an unsupported format, was written by different augmentor
+            sources, or a record cannot be regenerated
+    """
+    view_file = augmentation_view_path(dataset_file)
+    if not view_file.exists():
+        return
+
+    offsets = _line_offsets(dataset_file)
+    with open(view_file, 'r') as view, open(dataset_file, 'rb') as dataset:
+        header = json.loads(view.readline())
+        if header.get('format_version') != VIEW_FORMAT_VERSION:
+            raise ValueError(f"Unsupported augmentation view format in {view_file}: {header.get('format_version')}")
+        if header.get('augmentor_fingerprint') != source_fingerprint(AUGMENTOR_SOURCES):
+            # FAIL FAST - the records would regenerate into different examples than were written
+            raise ValueError(f"Augmentation view {view_file} was written by different augmentor sources; "
+                             f"regenerate the datasets (run the datasets phase with --force)")
+        augmentor = SecurityDataAugmentor(AugmentationConfig(**header['config']))
+
+        for line in view:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            sources = []
+            for index in record['sources']:
+                dataset.seek(offsets[index])
+                sources.append(json.loads(dataset.readline()))
+            variant = augmentor.create_variant(record, sources)
+            if not variant:
+                # FAIL FAST - the view no longer matches its dataset or the augmentor
+                raise ValueError(f"Could not regenerate {record['type']} example from {view_file}: {record}")
+            yield variant
+
+
+def iter_dataset_examples(dataset_file: Path) -> Iterator[Dict[str, Any]]:
+    """Stream a dataset: its examples, then the augmented examples of its view (if any), unshuffled."""
+    with open(dataset_file, 'r') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+    yield from iter_augmented_examples(dataset_file)
+
+
+def materialize_dataset(dataset_file: Path, output_file: Path):
+    """
+    Write a dataset with its augmented examples regenerated (a plain copy if it has no view).
+
+    Originals and augmented examples are shuffled together with MATERIALIZE_SHUFFLE_SEED,
+    leaving the global random state untouched.
+    """
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    if not augmentation_view_path(dataset_file).exists():
+        shutil.copy2(dataset_file, output_file)
+        return
+
+    with ShuffledJsonlWriter(output_file, rng=random.Random(MATERIALIZE_SHUFFLE_SEED)) as writer:
+        writer.write_many(iter_dataset_examples(dataset_file))
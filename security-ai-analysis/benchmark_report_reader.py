@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Benchmark json.load against the incremental report reader
+
+Compares peak RSS and wall time of reading every finding from a security scan
+report with json.load (the previous parser behaviour) and with the streaming
+reader in parsers/streaming_json.py. Each reader runs in a fresh subprocess so
+peak RSS measurements do not influence each other.
+
+Only report reading is measured; code extraction and fix generation cost the
+same with either reader.
+
+Usage:
+    # Benchmark an existing report
+    python3 benchmark_report_reader.py --scan-type semgrep --report path/to/semgrep-results.json
+
+    # Benchmark a synthetic report built by repeating the findings of the test fixture
+    python3 benchmark_report_reader.py --scan-type zap --findings 200000
+
+For OSV Scanner reports a "finding" is a whole lockfile result (with all of its
+packages), so use a much smaller --findings value there.
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from parsers.streaming_json import iter_json_items, load_json_skeleton
+
+FIXTURES_DIR = Path(__file__).parent / "tests" / "fixtures" / "sample_security_artifacts"
+
+# Per scan type: findings prefix, metadata members skipped by the parser, fixture report
+REPORT_LAYOUTS = {
+    'semgrep': ('results.item', ['results'],
+                FIXTURES_DIR / "semgrep-results-workflow_dispatch-392" / "semgrep-results.json"),
+    'osv': ('results.item', None,
+            FIXTURES_DIR / "osv-scanner-results-workflow_dispatch-392" / "osv-results.json"),
+    'trivy': ('runs.item.results.item', ['runs.item.results'],
+              FIXTURES_DIR / "docker-security-scan-results-trivy-action" / "webauthn-comprehensive.sarif"),
+    'checkov': ('runs.item.results.item', ['runs.item.results'],
+                FIXTURES_DIR / "checkov-results-workflow_dispatch-392" / "checkov-results.sarif"),
+    'zap': ('site.item.alerts.item', ['site.item.alerts'],
+            FIXTURES_DIR / "zap-full-scan-webauthn-server" / "report_json.json"),
+}
+
+
+def _findings_list(data: Any, prefix: str) -> List[Any]:
+    """Return the list holding the findings of the first container on the prefix path."""
+    parts = prefix.split('.')
+    for part in parts[:-1]:
+        data = data[0] if part == 'item' else data[part]
+    return data
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _count_with_json_load(report: Path, prefix: str) -> int:
+    with open(report, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    count = 0
+    stack = [(data, prefix.split('.'))]
+    while stack:
+        value, parts = stack.pop()
+        if not parts:
+            count += 1
+        elif parts[0] == 'item' and isinstance(value, list):
+            stack.extend((item, parts[1:]) for item in value)
+        elif isinstance(value, dict) and parts[0] in value:
+            stack.append((value[parts[0]], parts[1:]))
+    return count
+
+
+def _count_with_streaming(report: Path, prefix: str, skip) -> int:
+    if skip is not None:
+        load_json_skeleton(str(report), skip=skip)
+    return sum(1 for _ in iter_json_items(str(report), prefix))
+
+
+def run_reader(report: Path, scan_type: str, reader: str) -> Dict[str, Any]:
+    """Read all findings with one reader in the current process and report its cost."""
+    prefix, skip, _ = REPORT_LAYOUTS[scan_type]
+    start = time.perf_counter()
+    if reader == 'json':
+        count = _count_with_json_load(report, prefix)
+    else:
+        count = _count_with_streaming(report, prefix, skip)
+    return {
+        'reader': reader,
+        'findings': count,
+        'seconds': round(time.perf_counter() - start, 3),
+        'peak_rss_mb': round(_peak_rss_mb(), 1),
+    }
+
+
+def build_synthetic_report(scan_type: str, findings: int, output: Path) -> Path:
+    """Write a report with the given number of findings by repeating the fixture's findings."""
+    prefix, _, fixture = REPORT_LAYOUTS[scan_type]
+    with open(fixture, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    original = _findings_list(data, prefix)
+    if not original:
+        raise ValueError(f"Fixture {fixture} has no findings to repeat")
+    original[:] = [original[i % len(original)] for i in range(findings)]
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    return output
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark json.load against the streaming report reader")
+    parser.add_argument("--scan-type", choices=sorted(REPORT_LAYOUTS), required=True,
+                        help="Report format to benchmark")
+    parser.add_argument("--report", type=Path,
+                        help="Existing report to read (default: synthetic report built from the test fixture)")
+    parser.add_argument("--findings", type=int, default=100000,
+                        help="Number of findings in the synthetic report (default: 100000)")
+    parser.add_argument("--reader", choices=['json', 'streaming'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.reader:
+        # Child process: measure a single reader
+        print(json.dumps(run_reader(args.report, args.scan_type, args.reader)))
+        return 0
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        report = args.report or build_synthetic_report(
+            args.scan_type, args.findings, Path(temp_dir) / f"synthetic-{args.scan_type}.json")
+        size_mb = report.stat().st_size / (1024 * 1024)
+        print(f"📊 Report: {report} ({size_mb:.1f} MB)")
+
+        results = []
+        for reader in ('json', 'streaming'):
+            completed = subprocess.run(
+                [sys.executable, __file__, "--scan-type", args.scan_type, "--report", str(report),
+                 "--reader", reader],
+                capture_output=True, text=True, check=True, cwd=Path(__file__).parent
+            )
+            results.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+
+    print(f"{'reader':<10} {'findings':>10} {'seconds':>9} {'peak RSS (MB)':>14}")
+    for result in results:
+        print(f"{result['reader']:<10} {result['findings']:>10} {result['seconds']:>9} {result['peak_rss_mb']:>14}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -136,6 +136,15 @@ class OLMoSecurityConfig:
         project_root = Path(__file__).parent.parent
         self.data_dir = project_root / "security-ai-analysis" / "data"
         self.results_dir = project_root / "security-ai-analysis" / "results"
+
+        # Cache of parsed scan reports (environment override keeps tests isolated)
+        self.parse_cache_dir = Path(os.getenv('OLMO_PARSE_CACHE_DIR', str(self.results_dir / "parse_cache")))
+
+        # Memoized fix generation results, kept next to the parse cache by default
+        self.fix_cache_file = Path(os.getenv('OLMO_FIX_CACHE_FILE', str(self.parse_cache_dir / "fix_cache.json")))
+
+        # Persisted route table of URLToCodeMapper, refreshed incrementally
+        self.route_index_file = Path(os.getenv('OLMO_ROUTE_INDEX_FILE', str(self.results_dir / "route_index.json")))
         
         # Model configuration with environment variable override
         self.default_base_model = os.getenv('OLMO_DEFAULT_BASE_MODEL',
@@ -209,11 +218,17 @@ class OLMoSecurityConfig:
             'fine_tuned_models_dir': str(self.fine_tuned_models_dir),
             'data_dir': str(self.data_dir),
             'results_dir': str(self.results_dir),
+            'parse_cache_dir': str(self.parse_cache_dir),
+            'fix_cache_file': str(self.fix_cache_file),
+            'route_index_file': str(self.route_index_file),
             'default_base_model': self.default_base_model,
             'environment_overrides': {
                 'OLMO_BASE_MODELS_DIR': os.getenv('OLMO_BASE_MODELS_DIR'),
                 'OLMO_FINE_TUNED_MODELS_DIR': os.getenv('OLMO_FINE_TUNED_MODELS_DIR'),
                 'OLMO_DEFAULT_BASE_MODEL': os.getenv('OLMO_DEFAULT_BASE_MODEL'),
+                'OLMO_PARSE_CACHE_DIR': os.getenv('OLMO_PARSE_CACHE_DIR'),
+                'OLMO_FIX_CACHE_FILE': os.getenv('OLMO_FIX_CACHE_FILE'),
+                'OLMO_ROUTE_INDEX_FILE': os.getenv('OLMO_ROUTE_INDEX_FILE'),
             }
         }
 
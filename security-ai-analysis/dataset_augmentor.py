@@ -15,21 +15,64 @@ Techniques:
 - Semantic variations: Paraphrase security terminology
 - Context blending: Combine similar vulnerability types
 
+By default augmentation runs in one process and draws from the global random
+state. Sharded augmentation (workers=N) splits the work into fixed-size shards,
+each with its own random generator seeded from (seed, phase, shard index), and
+can run them in worker processes; shards are merged and deduplicated in order,
+so the output is identical for any number of workers.
+
+Context blending picks categories from a precomputed index (_BlendIndex): an
+alias table over the categories with at least two blendable examples, weighted
+by their size, so each blend costs O(1) however many tools/categories there are.
+
+Augmented examples are deduplicated against the originals and each other by
+MinHash similarity (see near_duplicate_index): an example whose estimated
+Jaccard similarity to a kept one reaches dedup_similarity_threshold is dropped.
+
+Augmentation views (iter_augmentation_records) describe each augmented example
+by a small record - source example indices, augmentation type and seed - from
+which create_variant() regenerates it on demand (see augmentation_view).
+
 Usage:
     from dataset_augmentor import SecurityDataAugmentor
 
     augmentor = SecurityDataAugmentor(config)
     augmented_data = augmentor.augment_training_data(original_examples)
+    augmented_data = augmentor.augment_training_data(original_examples, workers=8)
 """
 
+import hashlib
 import logging
 import random
 import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Any, Pattern, Tuple
+
+from near_duplicate_index import NearDuplicateIndex, example_signature
 
 logger = logging.getLogger(__name__)
 
+# Sharded augmentation: work is split independently of the worker count, so these
+# sizes (not the number of workers) determine which random generator produces what
+AUGMENTATION_SHARD_SIZE = 64      # Original examples per semantic/mixup shard
+BLEND_CHUNK_SIZE = 64             # Context-blended examples per blending shard
+AUGMENTATION_SEED = 42
+
+SEMANTIC, MIXUP, BLENDING = 'semantic', 'mixup', 'blending'
+
+SEMANTIC_VARIATION_TYPES = ['paraphrase', 'technical_detail', 'severity_perspective']
+
+
+def _match_case(matched: str, replacement: str) -> str:
+    """Give a replacement the case of the text it replaces (UPPER, Capitalized or as written)."""
+    if matched.isupper():
+        return replacement.upper()
+    if matched[0].isupper():
+        return replacement[0].upper() + replacement[1:]
+    return replacement
+
 
 @dataclass
 class AugmentationConfig:
@@ -39,6 +82,7 @@ class AugmentationConfig:
     multiplier: int = 4                      # Target: 4x total examples
     mixup_alpha: float = 0.3                 # Optimal mixing ratio
     semantic_variations: int = 3              # Variations per technique
+    dedup_similarity_threshold: float = 0.95  # Estimated Jaccard similarity of near-duplicates
 
     @classmethod
     def from_config(cls, config_dict: Dict[str, Any]) -> 'AugmentationConfig':
@@ -48,7 +92,8 @@ class AugmentationConfig:
             enabled=aug_config.get('enabled', True),
             multiplier=aug_config.get('multiplier', 4),
             mixup_alpha=aug_config.get('mixup_alpha', 0.3),
-            semantic_variations=aug_config.get('semantic_variations', 3)
+            semantic_variations=aug_config.get('semantic_variations', 3),
+            dedup_similarity_threshold=aug_config.get('dedup_similarity_threshold', 0.95)
         )
 
 
@@ -105,122 +150,300 @@ class SecurityDataAugmentor:
             ]
         }
 
-    def augment_training_data(self, training_examples: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # One alternation regex per pattern set, compiled once
+        self._substitution_regexes: Dict[str, Pattern] = {
+            pattern_type: self._compile_substitution_regex(original for original, _ in patterns)
+            for pattern_type, patterns in self.semantic_patterns.items()
+        }
+
+    def augment_training_data(self, training_examples: List[Dict[str, Any]],
+                              workers: Optional[int] = None,
+                              seed: int = AUGMENTATION_SEED) -> List[Dict[str, Any]]:
         """
         Apply comprehensive data augmentation to training examples.
 
         Args:
             training_examples: Original training examples in ChatML format
+            workers: None to augment in this process from the global random state, or
+                the number of worker processes for sharded augmentation (see iter_augmented_training_data)
+            seed: Base seed of the shard random generators (sharded augmentation only)
 
         Returns:
             Augmented training examples (target: 3x original count)
         """
+        return list(self.iter_augmented_training_data(training_examples, workers, seed))
+
+    def iter_augmented_training_data(self, training_examples: List[Dict[str, Any]],
+                                     workers: Optional[int] = None,
+                                     seed: int = AUGMENTATION_SEED) -> Iterator[Dict[str, Any]]:
+        """
+        Generate augmented examples one at a time (same examples and order as augment_training_data).
+
+        Only the originals and the MinHash signatures used for deduplication are kept in
+        memory, so augmented examples can be written out as they are produced.
+
+        Args:
+            training_examples: Original training examples in ChatML format
+            workers: None (default) generates every example in this process, drawing from
+                the global random state. A number of worker processes (1 = this process)
+                selects sharded augmentation: each shard of AUGMENTATION_SHARD_SIZE originals
+                (or BLEND_CHUNK_SIZE blended examples) uses its own generator seeded from
+                seed, phase and shard index, and shards are merged in order before
+                deduplication. Its output is identical for any worker count, but differs
+                from the default mode's.
+            seed: Base seed of the shard random generators (sharded augmentation only)
+
+        Yields:
+            Augmented training examples (target: 3x original count)
+        """
+        if workers is None:
+            yield from self._augment(training_examples, self._phase_runner(training_examples))
+            return
+
+        sharded = _ShardedAugmentation(self, training_examples, workers, seed)
+        try:
+            yield from self._augment(training_examples, sharded.run_phase)
+        finally:
+            sharded.close()
+
+    def iter_augmentation_records(self, training_examples: List[Dict[str, Any]],
+                                  seed: int = AUGMENTATION_SEED) -> Iterator[Dict[str, Any]]:
+        """
+        Describe augmented examples by records instead of generating copies to keep.
+
+        Each variant is generated from its own seed, deduplicated like the other modes,
+        and yielded as a record that create_variant() turns back into the same example:
+            {"sources": [index, ...], "type": "semantic_paraphrase", "seed": 123}
+        where sources index into training_examples ("type" is the variant's augmentation_type).
+
+        Args:
+            training_examples: Original training examples in ChatML format
+            seed: Base seed the per-variant seeds are derived from
+
+        Yields:
+            Augmentation records of the kept variants
+        """
+        for record, _ in self._augment(training_examples, self._view_phase_runner(training_examples, seed),
+                                       example_of=lambda item: item[1]):
+            yield record
+
+    def create_variant(self, record: Dict[str, Any], sources: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Regenerate the augmented example described by a record from iter_augmentation_records.
+
+        Args:
+            record: Augmentation record
+            sources: The examples referenced by record['sources'], in order
+
+        Returns:
+            The augmented example (None if the record's variant cannot be built)
+
+        Raises:
+            ValueError: If the record's augmentation type is unknown
+        """
+        augmentation_type = record['type']
+        if augmentation_type.startswith('semantic_'):
+            rng = random.Random(record['seed'])
+            return self._create_semantic_variant(sources[0], augmentation_type[len('semantic_'):], rng)
+        if augmentation_type == 'self_mixup':
+            return self._create_mixup_variant(sources[0], self.config.mixup_alpha, random.Random(record['seed']))
+        if augmentation_type == 'context_blending':
+            return self._blend_two_examples(sources[0], sources[1])
+        raise ValueError(f"Unknown augmentation type in augmentation record: {augmentation_type}")
+
+    def _augment(self, training_examples: List[Dict[str, Any]],
+                 run_phase: Callable[[str, Optional[int]], Iterator[Any]],
+                 example_of: Callable[[Any], Dict[str, Any]] = lambda item: item) -> Iterator[Any]:
+        """
+        Run the three augmentation phases with deduplication and the target count.
+
+        Args:
+            training_examples: Original training examples
+            run_phase: run_phase(phase, target_count) generating one phase's items
+            example_of: The augmented example of an item (items are the examples themselves
+                except for augmentation views)
+
+        Yields:
+            Kept items, in generation order
+        """
         if not self.config.enabled:
             self.logger.info("⏭️  Data augmentation disabled")
-            return []
+            return
 
         original_count = len(training_examples)
+        if original_count == 0:
+            # e.g. an empty validation set from the hash split of a small dataset
+            return
         target_count = original_count * (self.config.multiplier - 1)  # -1 because originals already added
 
         self.logger.info(f"🎨 Starting data augmentation: {original_count} → target {target_count} new examples")
 
-        augmented_examples = []
+        # Quality filtering and deduplication, applied as examples are generated
+        seen = NearDuplicateIndex(self.config.dedup_similarity_threshold)
+        for example in training_examples:
+            seen.add(example_signature(example))
+        counts = {'generated': 0, 'kept': 0}
 
         # Phase 1: Semantic variations (most diverse)
         self.logger.info("📝 Phase 1: Generating semantic variations...")
-        semantic_examples = self._apply_semantic_variations(training_examples)
-        augmented_examples.extend(semantic_examples)
+        generated = counts['generated']
+        yield from self._unique(run_phase(SEMANTIC, None), seen, counts, example_of)
+        self.logger.info(f"   ✅ Generated {counts['generated'] - generated} semantic variations")
 
         # Phase 2: Self-mixup augmentation
         self.logger.info("🔄 Phase 2: Applying self-mixup augmentation...")
-        mixup_examples = self._apply_self_mixup(training_examples)
-        augmented_examples.extend(mixup_examples)
+        generated = counts['generated']
+        yield from self._unique(run_phase(MIXUP, None), seen, counts, example_of)
+        self.logger.info(f"   ✅ Generated {counts['generated'] - generated} self-mixup variants")
 
         # Phase 3: Context blending (if needed to reach target)
-        remaining = target_count - len(augmented_examples)
+        remaining = target_count - counts['generated']
         if remaining > 0:
             self.logger.info(f"🎯 Phase 3: Context blending ({remaining} examples needed)...")
-            blended_examples = self._apply_context_blending(training_examples, remaining)
-            augmented_examples.extend(blended_examples)
-
-        # Quality filtering and deduplication
-        final_examples = self._ensure_quality_and_diversity(augmented_examples, training_examples)
-
-        augmentation_ratio = (original_count + len(final_examples)) / original_count
-        self.logger.info(f"✅ Augmentation complete: {original_count} → +{len(final_examples)} augmented ({augmentation_ratio:.1f}x total)")
+            generated = counts['generated']
+            yield from self._unique(run_phase(BLENDING, remaining), seen, counts, example_of)
+            self.logger.info(f"   ✅ Generated {counts['generated'] - generated} context-blended variants")
 
-        return final_examples
+        removed = counts['generated'] - counts['kept']
+        if removed > 0:
+            self.logger.info(f"   🧹 Quality filtering: removed {removed} duplicates")
 
-    def _apply_semantic_variations(self, examples: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        augmentation_ratio = (original_count + counts['kept']) / original_count
+        self.logger.info(f"✅ Augmentation complete: {original_count} → +{counts['kept']} augmented ({augmentation_ratio:.1f}x total)")
+
+    def _phase_runner(self, examples: List[Dict[str, Any]], rng=random,
+                      blend_index: Optional['_BlendIndex'] = None) -> Callable[[str, Optional[int]], Iterator[Dict[str, Any]]]:
+        """Function generating one phase's examples from examples with rng: run_phase(phase, target_count)."""
+        def run_phase(phase: str, target_count: Optional[int]) -> Iterator[Dict[str, Any]]:
+            if phase == SEMANTIC:
+                return self._apply_semantic_variations(examples, rng)
+            if phase == MIXUP:
+                return self._apply_self_mixup(examples, rng)
+            return self._apply_context_blending(examples, target_count, rng, blend_index)
+        return run_phase
+
+    def _view_phase_runner(self, examples: List[Dict[str, Any]],
+                           seed: int) -> Callable[[str, Optional[int]], Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]]:
+        """Like _phase_runner, but yields (record, example) with every variant generated from its own seed."""
+        def variants(records: Iterator[Dict[str, Any]]) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+            for record in records:
+                try:
+                    variant = self.create_variant(record, [examples[index] for index in record['sources']])
+                except Exception as e:
+                    self.logger.warning(f"Failed to create {record['type']} variant: {e}")
+                    continue
+                if variant:
+                    yield record, variant
+
+        def semantic_records() -> Iterator[Dict[str, Any]]:
+            variant = 0
+            for index in range(len(examples)):
+                for variation_type in SEMANTIC_VARIATION_TYPES:
+                    for _ in range(2):
+                        yield {'sources': [index], 'type': f'semantic_{variation_type}',
+                               'seed': derive_seed(seed, SEMANTIC, variant)}
+                        variant += 1
+
+        def mixup_records() -> Iterator[Dict[str, Any]]:
+            for index in range(len(examples)):
+                yield {'sources': [index], 'type': 'self_mixup', 'seed': derive_seed(seed, MIXUP, index)}
+
+        def blends(target_count: int) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+            # Pairs are drawn as by _apply_context_blending, from one generator for the whole phase
+            positions = {id(example): index for index, example in enumerate(examples)}
+            rng = random.Random(derive_seed(seed, BLENDING, 0))
+            for ex1, ex2, blended in self._iter_context_blends(examples, target_count, rng):
+                yield {'sources': [positions[id(ex1)], positions[id(ex2)]], 'type': 'context_blending',
+                       'seed': None}, blended
+
+        def run_phase(phase: str, target_count: Optional[int]) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+            if phase == SEMANTIC:
+                return variants(semantic_records())
+            if phase == MIXUP:
+                return variants(mixup_records())
+            return blends(target_count)
+        return run_phase
+
+    def _unique(self, items: Iterator[Any], seen: NearDuplicateIndex, counts: Dict[str, int],
+                example_of: Callable[[Any], Dict[str, Any]] = lambda item: item) -> Iterator[Any]:
+        """Drop near-duplicates: examples too similar to one already seen (originals included)."""
+        for item in items:
+            counts['generated'] += 1
+            signature = example_signature(example_of(item))
+            if seen.find(signature) is None:
+                seen.add(signature)
+                counts['kept'] += 1
+                yield item
+
+    def _apply_semantic_variations(self, examples: List[Dict[str, Any]], rng=random) -> Iterator[Dict[str, Any]]:
         """Generate semantic variations by paraphrasing security terminology."""
-        augmented = []
-
         for example in examples:
             # Generate TWO variations of each type per example (2x increase)
-            for variation_type in ['paraphrase', 'technical_detail', 'severity_perspective']:
+            for variation_type in SEMANTIC_VARIATION_TYPES:
                 for _ in range(2):  # Create 2 variants of each type
                     try:
-                        varied = self._create_semantic_variant(example, variation_type)
-                        if varied:
-                            augmented.append(varied)
+                        varied = self._create_semantic_variant(example, variation_type, rng)
                     except Exception as e:
                         self.logger.warning(f"Failed to create semantic variation: {e}")
                         continue
+                    if varied:
+                        yield varied
 
-        self.logger.info(f"   ✅ Generated {len(augmented)} semantic variations")
-        return augmented
-
-    def _apply_self_mixup(self, examples: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _apply_self_mixup(self, examples: List[Dict[str, Any]], rng=random) -> Iterator[Dict[str, Any]]:
         """Apply self-mixup augmentation to create blended variants."""
-        augmented = []
-
         for example in examples:
             # Create mixup variant with configured alpha
             try:
-                mixed = self._create_mixup_variant(example, self.config.mixup_alpha)
-                if mixed:
-                    augmented.append(mixed)
+                mixed = self._create_mixup_variant(example, self.config.mixup_alpha, rng)
             except Exception as e:
                 self.logger.warning(f"Failed to create mixup variant: {e}")
                 continue
+            if mixed:
+                yield mixed
 
-        self.logger.info(f"   ✅ Generated {len(augmented)} self-mixup variants")
-        return augmented
-
-    def _apply_context_blending(self, examples: List[Dict[str, Any]], target_count: int) -> List[Dict[str, Any]]:
+    def _apply_context_blending(self, examples: List[Dict[str, Any]], target_count: int,
+                                rng=random, blend_index: Optional['_BlendIndex'] = None) -> Iterator[Dict[str, Any]]:
         """Blend contexts from similar vulnerability types."""
-        # Group by tool/category
-        grouped = self._group_by_category(examples)
+        for _, _, blended in self._iter_context_blends(examples, target_count, rng, blend_index):
+            yield blended
 
-        augmented = []
-        attempts = 0
-        max_attempts = target_count * 2  # Prevent infinite loop
+    def _iter_context_blends(self, examples: List[Dict[str, Any]], target_count: int, rng=random,
+                             blend_index: Optional['_BlendIndex'] = None
+                             ) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]]:
+        """
+        Blended examples with the two examples each was blended from: (ex1, ex2, blended).
 
-        while len(augmented) < target_count and attempts < max_attempts:
-            attempts += 1
+        Args:
+            examples: Examples to blend
+            target_count: Number of blended examples to generate
+            rng: Random generator drawing the pairs
+            blend_index: Index of examples (built from examples when not given)
+        """
+        if blend_index is None:
+            blend_index = self._blend_index(examples)
+        if not blend_index:
+            return
 
-            # Pick random category with multiple examples
-            categories_with_multiple = [cat for cat, exs in grouped.items() if len(exs) >= 2]
-            if not categories_with_multiple:
-                break
+        count = 0
+        attempts = 0
+        max_attempts = target_count * 2  # Fixed budget - blends only fail on malformed examples
 
-            category = random.choice(categories_with_multiple)
-            category_examples = grouped[category]
+        while count < target_count and attempts < max_attempts:
+            attempts += 1
 
-            # Blend two random examples
-            ex1, ex2 = random.sample(category_examples, 2)
+            # Blend two random examples of a random category with multiple examples
+            ex1, ex2 = blend_index.sample_pair(rng)
             try:
                 blended = self._blend_two_examples(ex1, ex2)
-                if blended:
-                    augmented.append(blended)
             except Exception as e:
                 self.logger.warning(f"Failed to blend examples: {e}")
                 continue
+            if blended:
+                count += 1
+                yield ex1, ex2, blended
 
-        self.logger.info(f"   ✅ Generated {len(augmented)} context-blended variants")
-        return augmented
-
-    def _create_semantic_variant(self, example: Dict[str, Any], variation_type: str) -> Optional[Dict[str, Any]]:
+    def _create_semantic_variant(self, example: Dict[str, Any], variation_type: str,
+                                 rng=random) -> Optional[Dict[str, Any]]:
         """Create semantic variation of an example."""
         messages = example.get('messages', [])
         if not messages:
@@ -236,7 +459,7 @@ class SecurityDataAugmentor:
             if role == 'system':
                 varied_messages.append(msg)
             else:
-                varied_content = self._apply_semantic_patterns(content, variation_type)
+                varied_content = self._apply_semantic_patterns(content, variation_type, rng)
                 varied_messages.append({**msg, 'content': varied_content})
 
         # Create varied example with updated metadata
@@ -249,7 +472,8 @@ class SecurityDataAugmentor:
             'metadata': metadata
         }
 
-    def _create_mixup_variant(self, example: Dict[str, Any], mix_ratio: float) -> Optional[Dict[str, Any]]:
+    def _create_mixup_variant(self, example: Dict[str, Any], mix_ratio: float,
+                              rng=random) -> Optional[Dict[str, Any]]:
         """Create self-mixup variant by varying instruction phrasing."""
         messages = example.get('messages', [])
         if not messages:
@@ -263,7 +487,7 @@ class SecurityDataAugmentor:
 
             if role == 'user':
                 # Add variation to user prompt structure
-                mixed_content = self._vary_prompt_structure(content)
+                mixed_content = self._vary_prompt_structure(content, rng)
                 mixed_messages.append({**msg, 'content': mixed_content})
             else:
                 mixed_messages.append(msg)
@@ -311,28 +535,63 @@ class SecurityDataAugmentor:
             'metadata': metadata
         }
 
-    def _apply_semantic_patterns(self, content: str, pattern_type: str) -> str:
-        """Apply semantic patterns to vary content while preserving meaning."""
+    def _apply_semantic_patterns(self, content: str, pattern_type: str, rng=random) -> str:
+        """
+        Apply semantic patterns to vary content while preserving meaning.
+
+        The drawn patterns are substituted in a single pass: the pattern set's alternation
+        regex matches any of its patterns (whole words, case-insensitively, longest first
+        where they overlap) and each match is looked up in a table of the drawn ones; the
+        scan stops once every drawn pattern has been replaced. Replacements take the case
+        of the text they replace.
+        """
         if pattern_type not in self.semantic_patterns:
             return content
 
         patterns = self.semantic_patterns[pattern_type]
-        varied_content = content
 
         # Apply random subset of patterns (30-50% of available patterns)
-        num_patterns = max(1, int(len(patterns) * random.uniform(0.3, 0.5)))
-        applied_patterns = random.sample(patterns, num_patterns)
-
-        for original, replacement in applied_patterns:
-            # Case-insensitive replacement with word boundaries
-            pattern = re.compile(r'\b' + re.escape(original) + r'\b', re.IGNORECASE)
-
+        num_patterns = max(1, int(len(patterns) * rng.uniform(0.3, 0.5)))
+        applied_patterns = rng.sample(patterns, num_patterns)
+
+        replacements = {original.lower(): replacement for original, replacement in applied_patterns}
+        regex = self._substitution_regexes.get(pattern_type)
+        if regex is None:
+            # Pattern set added after construction
+            regex = self._compile_substitution_regex(replacements)
+
+        # Matching the lowercased text case-sensitively is much faster than IGNORECASE;
+        # positions carry over unless lowercasing changed the length (rare non-ASCII text)
+        lowered = content.lower()
+        if len(lowered) != len(content):
+            lowered = content
+            regex = re.compile(regex.pattern, re.IGNORECASE)
+
+        pieces = []
+        position = 0
+        for match in regex.finditer(lowered):
+            start, end = match.span()
             # Only replace first occurrence to maintain some original terminology
-            varied_content = pattern.sub(replacement, varied_content, count=1)
+            replacement = replacements.pop(match.group(0).lower(), None)
+            if replacement is None:
+                continue
+            pieces.append(content[position:start])
+            pieces.append(_match_case(content[start:end], replacement))
+            position = end
+            if not replacements:
+                break
+        pieces.append(content[position:])
 
-        return varied_content
+        return ''.join(pieces)
 
-    def _vary_prompt_structure(self, prompt: str) -> str:
+    @staticmethod
+    def _compile_substitution_regex(originals: Iterable[str]) -> Pattern:
+        """Whole-word alternation of lowercased patterns, longest first (matched against lowercased text)."""
+        alternation = '|'.join(re.escape(original.lower())
+                               for original in sorted(originals, key=len, reverse=True))
+        return re.compile(r'\b(?:' + alternation + r')\b')
+
+    def _vary_prompt_structure(self, prompt: str, rng=random) -> str:
         """Add subtle variations to prompt structure."""
         # Alternate prompt introductions
         introductions = [
@@ -346,7 +605,7 @@ class SecurityDataAugmentor:
         # Replace first line if it matches known pattern
         lines = prompt.split('\n')
         if lines and any(intro in lines[0] for intro in ["Fix the following", "Address this"]):
-            lines[0] = random.choice(introductions)
+            lines[0] = rng.choice(introductions)
 
         return '\n'.join(lines)
 
@@ -358,6 +617,11 @@ class SecurityDataAugmentor:
                 return msg.get('content', '')
         return None
 
+    def _blend_index(self, examples: List[Dict[str, Any]]) -> '_BlendIndex':
+        """Index of the examples context blending can pair: those with a user prompt, by category."""
+        blendable = [example for example in examples if self._extract_user_message(example)]
+        return _BlendIndex(self._group_by_category(blendable))
+
     def _group_by_category(self, examples: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
         """Group examples by security category or tool."""
         grouped = {}
@@ -375,47 +639,156 @@ class SecurityDataAugmentor:
 
         return grouped
 
-    def _ensure_quality_and_diversity(
-        self,
-        augmented: List[Dict[str, Any]],
-        originals: List[Dict[str, Any]]
-    ) -> List[Dict[str, Any]]:
-        """Ensure quality and remove near-duplicates."""
-        # Combine for deduplication check
-        all_examples = originals + augmented
-
-        # Remove duplicates based on content similarity
-        unique_augmented = []
-        seen_hashes = set()
-
-        # First, add all original hashes to seen set
-        for example in originals:
-            content_hash = self._create_content_hash(example)
-            seen_hashes.add(content_hash)
-
-        # Then filter augmented examples
-        for example in augmented:
-            content_hash = self._create_content_hash(example)
-
-            if content_hash not in seen_hashes:
-                seen_hashes.add(content_hash)
-                unique_augmented.append(example)
-
-        removed = len(augmented) - len(unique_augmented)
-        if removed > 0:
-            self.logger.info(f"   🧹 Quality filtering: removed {removed} duplicates")
 
-        return unique_augmented
+class _AliasSampler:
+    """
+    Weighted index sampling in O(1) per draw (Vose's alias method).
 
-    def _create_content_hash(self, example: Dict[str, Any]) -> int:
-        """Create simple hash of example content for deduplication."""
-        messages = example.get('messages', [])
-        content_parts = []
+    Each of the n slots holds its own index with probability prob[slot] and its
+    alias otherwise; a draw picks a slot uniformly, then one of its two indices.
+    """
 
-        for msg in messages:
-            role = msg.get('role', '')
-            # Use first 150 chars for hash (captures key differences)
-            content = msg.get('content', '')[:150]
-            content_parts.append(f"{role}:{content}")
+    def __init__(self, weights: List[float]):
+        """
+        Args:
+            weights: Positive weight of each index
+        """
+        if not weights or any(weight <= 0 for weight in weights):
+            raise ValueError(f"Alias sampling needs positive weights, got {weights}")
+
+        n = len(weights)
+        total = sum(weights)
+        scaled = [weight * n / total for weight in weights]
+        self.prob = [1.0] * n
+        self.alias = list(range(n))
+
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.prob[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+        # Whatever is left has probability 1 up to rounding error
+
+    def sample(self, rng=random) -> int:
+        slot = rng.randrange(len(self.prob))
+        return slot if rng.random() < self.prob[slot] else self.alias[slot]
+
+
+class _BlendIndex:
+    """
+    Categories context blending can pair examples from, built once per example set.
+
+    Categories are drawn in proportion to their number of examples: a small
+    category drawn as often as a large one mostly yields duplicate blends.
+    """
 
-        return hash('|'.join(content_parts))
+    def __init__(self, grouped: Dict[str, List[Dict[str, Any]]]):
+        self.groups = [category_examples for category_examples in grouped.values() if len(category_examples) >= 2]
+        self.sampler = _AliasSampler([len(group) for group in self.groups]) if self.groups else None
+
+    def __bool__(self) -> bool:
+        return bool(self.groups)
+
+    def sample_pair(self, rng=random) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Two distinct examples of one category, without copying the category's list."""
+        group = self.groups[self.sampler.sample(rng)]
+        first = rng.randrange(len(group))
+        second = rng.randrange(len(group) - 1)
+        if second >= first:
+            second += 1
+        return group[first], group[second]
+
+
+def derive_seed(seed: int, phase: str, index: int) -> int:
+    """Seed of one augmentation shard (or view variant), derived from the base seed, phase and index."""
+    digest = hashlib.sha256(f"{seed}:{phase}:{index}".encode()).digest()
+    return int.from_bytes(digest[:8], 'big')
+
+
+# (phase, shard index, base seed, blending target or None)
+_ShardTask = Tuple[str, int, int, Optional[int]]
+
+# Set in each worker process by _init_augmentation_worker
+_worker_augmentor: Optional[SecurityDataAugmentor] = None
+_worker_examples: List[Dict[str, Any]] = []
+_worker_blend_index: Optional[_BlendIndex] = None
+
+
+def _run_shard(augmentor: SecurityDataAugmentor, examples: List[Dict[str, Any]],
+               task: _ShardTask, blend_index: Optional[_BlendIndex] = None) -> List[Dict[str, Any]]:
+    """Generate the examples of one shard with the shard's own random generator."""
+    phase, shard, seed, target_count = task
+    rng = random.Random(derive_seed(seed, phase, shard))
+    if phase != BLENDING:
+        # Semantic and mixup shards vary a slice of the originals; blending samples from all of them
+        examples = examples[shard * AUGMENTATION_SHARD_SIZE:(shard + 1) * AUGMENTATION_SHARD_SIZE]
+    return list(augmentor._phase_runner(examples, rng, blend_index)(phase, target_count))
+
+
+def _init_augmentation_worker(augmentor: SecurityDataAugmentor, examples: List[Dict[str, Any]]):
+    """Receive the augmentor and originals once per worker process instead of once per shard."""
+    global _worker_augmentor, _worker_examples
+    _worker_augmentor = augmentor
+    _worker_examples = examples
+
+
+def _run_worker_shard(task: _ShardTask) -> List[Dict[str, Any]]:
+    global _worker_blend_index
+    if task[0] == BLENDING and _worker_blend_index is None:
+        # Built once per worker, not once per blending shard
+        _worker_blend_index = _worker_augmentor._blend_index(_worker_examples)
+    return _run_shard(_worker_augmentor, _worker_examples, task, _worker_blend_index)
+
+
+class _ShardedAugmentation:
+    """Runs augmentation phases as seeded shards, in this process or a process pool, yielding in shard order."""
+
+    def __init__(self, augmentor: SecurityDataAugmentor, examples: List[Dict[str, Any]], workers: int, seed: int):
+        self.augmentor = augmentor
+        self.examples = examples
+        self.workers = workers
+        self.seed = seed
+        self.blend_index = None
+        self.executor = None
+        if workers > 1:
+            self.executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_augmentation_worker,
+                                                initargs=(augmentor, examples))
+
+    def _tasks(self, phase: str, target_count: Optional[int]) -> Iterator[_ShardTask]:
+        if phase == BLENDING:
+            for shard, start in enumerate(range(0, target_count, BLEND_CHUNK_SIZE)):
+                yield phase, shard, self.seed, min(BLEND_CHUNK_SIZE, target_count - start)
+        else:
+            for shard in range((len(self.examples) + AUGMENTATION_SHARD_SIZE - 1) // AUGMENTATION_SHARD_SIZE):
+                yield phase, shard, self.seed, None
+
+    def run_phase(self, phase: str, target_count: Optional[int]) -> Iterator[Dict[str, Any]]:
+        """Examples of one phase, shard by shard (at most 2 * workers shards in flight)."""
+        tasks = self._tasks(phase, target_count)
+        if self.executor is None:
+            if phase == BLENDING and self.blend_index is None:
+                self.blend_index = self.augmentor._blend_index(self.examples)
+            for task in tasks:
+                yield from _run_shard(self.augmentor, self.examples, task, self.blend_index)
+            return
+
+        pending = deque()
+        try:
+            while True:
+                for task in tasks:
+                    pending.append(self.executor.submit(_run_worker_shard, task))
+                    if len(pending) >= 2 * self.workers:
+                        break
+                if not pending:
+                    return
+                yield from pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def close(self):
+        if self.executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Deterministic hash-based train/validation/test split
+
+The stratified splits in process_artifacts shuffle each group with the global
+random state and slice it, so they need the whole dataset in memory and an
+example's split depends on every other example (and on input order).
+
+Here each example is assigned on its own, from a SHA-256 of its identity (see
+example_split_key): the group it is counted in (tool or public dataset source),
+its vulnerability/CVE id and the file, URL or package version it affects:
+
+- splitting is a single streaming pass
+- the same example lands in the same split on every run and machine, even if
+  its prompt wording changes
+- findings of the same advisory in the same place (e.g. one rule hitting several
+  lines of a file) share a split, so near-identical examples cannot leak from
+  training into test
+- adding examples never moves existing ones between splits
+
+This is not a stratified split: the ratios only hold in expectation, per group
+as overall, and small groups may get no test or validation example at all. The
+per-group counts are reported so the balance can be checked.
+
+Usage:
+    for split, example in iter_hash_split(examples, group_by='tool'):
+        writers[split].write(example)
+"""
+
+import hashlib
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+SPLIT_MODES = ('stratified', 'hash')
+
+TRAIN, VALIDATION, TEST = 'train', 'validation', 'test'
+
+# Seed for augmentation and shuffling in hash split mode (the stratified split seeds with 42 too)
+HASH_SPLIT_SEED = 42
+
+_HASH_SCALE = float(1 << 64)
+
+
+def example_split_key(example: Dict[str, Any], group: str) -> str:
+    """
+    Stable identity of an example: its group, vulnerability/CVE id and affected location.
+
+    The location is the metadata 'location' of generated examples (file path, URL or
+    package@version). Examples with neither an id nor a location (e.g. CrossVul) fall
+    back to their user prompt.
+    """
+    metadata = example.get('metadata', {})
+    identifier = metadata.get('vulnerability_id') or metadata.get('cve_id') or ''
+    location = metadata.get('location') or ''
+    if not identifier and not location:
+        location = next((message.get('content', '') for message in example.get('messages', [])
+                         if message.get('role') == 'user'), '')
+    return f"{group}\0{identifier}\0{location}"
+
+
+def hash_split_assignment(key: str, train_ratio: float = 0.8, val_ratio: float = 0.1) -> str:
+    """
+    Split for a key: the first 64 bits of its SHA-256, as a fraction of 2**64, against the ratios.
+
+    Returns:
+        TRAIN, VALIDATION or TEST
+    """
+    position = int.from_bytes(hashlib.sha256(key.encode('utf-8')).digest()[:8], 'big') / _HASH_SCALE
+    if position < train_ratio:
+        return TRAIN
+    if position < train_ratio + val_ratio:
+        return VALIDATION
+    return TEST
+
+
+def iter_hash_split(examples: Iterable[Dict[str, Any]], group_by: str,
+                    train_ratio: float = 0.8, val_ratio: float = 0.1,
+                    counts: Optional[Dict[str, Dict[str, int]]] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Assign each example to a split as it streams past.
+
+    Args:
+        examples: Training examples (consumed once)
+        group_by: Metadata field naming the example's group (e.g. 'tool' or 'source'),
+            part of its identity and the unit split sizes are counted in
+        train_ratio: Proportion for the training set (default: 0.8)
+        val_ratio: Proportion for the validation set (default: 0.1)
+        counts: Optional dict filled with per-group split sizes ({group: {split: n}})
+
+    Yields:
+        (split, example) with split one of TRAIN, VALIDATION, TEST
+    """
+    for example in examples:
+        group = str(example.get('metadata', {}).get(group_by, 'unknown'))
+        split = hash_split_assignment(example_split_key(example, group), train_ratio, val_ratio)
+        if counts is not None:
+            group_counts = counts.setdefault(group, {TRAIN: 0, VALIDATION: 0, TEST: 0})
+            group_counts[split] += 1
+        yield split, example
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Package-level coalescing of dependency findings
+
+OSV Scanner and Trivy report one finding per (advisory, package), so a single
+vulnerable library version (e.g. logback-core 1.3.5) yields one finding - and one
+near-identical upgrade fix and training example - per advisory. DependencyCoalescer
+groups the dependency findings of one report by (tool, ecosystem, package, installed
+version) and replaces every group of two or more with a single finding whose fix is
+the minimal upgrade that resolves all of the group's advisories.
+
+The OSV and Trivy parsers coalesce a report's raw findings (before any fix is
+generated or code context extracted), so fix generation runs once per package version
+rather than once per advisory. Each parser passes its own upgrade snippet formatter,
+so coalesced fixes use the same dependency syntax as the parser's per-advisory fixes.
+Fixed versions are read with extract_osv_fixed_versions, exactly as OSV fix
+generation reads them.
+
+Findings keep their order: a coalesced finding takes the place of its group's first
+member, and findings of other tools pass through unchanged. A group is only complete
+at the end of its report, so coalescing holds a report's raw findings in memory
+(instead of streaming them one at a time).
+
+Usage:
+    coalescer = DependencyCoalescer(generate_dependency_upgrade_code)
+    for finding in coalescer.coalesce(raw_findings):
+        ...
+"""
+
+import logging
+import re
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from multi_approach_fix_generator import extract_osv_fixed_versions
+
+logger = logging.getLogger(__name__)
+
+_VERSION_SEPARATORS = re.compile(r'[.\-+_]')
+
+
+def version_sort_key(version: str) -> Tuple[Tuple[int, Any], ...]:
+    """
+    Sort key for dotted package versions (numeric parts compare as numbers).
+
+    e.g. 4.1.108.Final > 4.1.99.Final and 1.5.13 > 1.3.15, unlike string comparison.
+    """
+    return tuple((0, int(part)) if part.isdigit() else (1, part.lower())
+                 for part in _VERSION_SEPARATORS.split(version.strip()) if part)
+
+
+def minimal_safe_upgrade(installed_version: str, fixed_versions_per_advisory: Iterable[List[str]]) -> Optional[str]:
+    """
+    Lowest version that fixes every advisory.
+
+    Per advisory, the lowest fixed version above the installed one is needed (the
+    advisory may list several release branches); the result is the highest of those.
+
+    Args:
+        installed_version: Currently installed version
+        fixed_versions_per_advisory: Fixed versions of each advisory (advisories without any are skipped)
+
+    Returns:
+        Upgrade target, or None if no advisory has a fixed version
+    """
+    installed_key = version_sort_key(installed_version)
+    required = []
+    for fixed_versions in fixed_versions_per_advisory:
+        if not fixed_versions:
+            continue
+        newer = [v for v in fixed_versions if version_sort_key(v) > installed_key]
+        # Fall back to the latest fix if the installed version is not comparable
+        required.append(min(newer, key=version_sort_key) if newer else max(fixed_versions, key=version_sort_key))
+    return max(required, key=version_sort_key) if required else None
+
+
+def dependency_key(finding: Dict[str, Any]) -> Optional[Tuple[str, str, str, str]]:
+    """(tool, ecosystem, package, installed version) of an OSV/Trivy finding, or None for other findings."""
+    tool = finding.get('tool', '').lower()
+    if 'osv' not in tool and 'trivy' not in tool:
+        return None
+    ecosystem = finding.get('ecosystem') or finding.get('package_ecosystem')
+    package = finding.get('package_name')
+    installed_version = finding.get('installed_version')
+    if not (ecosystem and package and installed_version):
+        return None
+    return tool, ecosystem, package, installed_version
+
+
+def advisory_fix_confidence(finding: Dict[str, Any], fixed_versions: List[str]) -> float:
+    """
+    Confidence of the fix for one advisory: that of its fix if it has one already,
+    otherwise what the parsers give a version upgrade (1.0) or an advisory without
+    a fixed release (0.0).
+    """
+    fix = finding.get('fix')
+    if isinstance(fix, dict) and 'confidence' in fix:
+        return fix['confidence']
+    return 1.0 if fixed_versions else 0.0
+
+
+class DependencyCoalescer:
+    """
+    Collapses the dependency findings of one report for the same package version into one finding.
+    """
+
+    def __init__(self, upgrade_code: Callable[[str, str, str], str]):
+        """
+        Args:
+            upgrade_code: Formats the dependency declaration of an upgrade, called with
+                (package, version, ecosystem) - the originating parser's formatter
+        """
+        self.upgrade_code = upgrade_code
+        self.coalesced_findings = 0
+        self.emitted_upgrades = 0
+
+    def coalesce(self, findings: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Coalesce a report's findings, one finding per package version where possible.
+
+        All of the findings are read before the first is returned (see the module docstring).
+
+        Returns:
+            The findings in their original order, each coalesced group in place of its first member
+        """
+        findings = list(findings)
+        groups: Dict[Tuple[str, str, str, str], List[int]] = {}
+        for position, finding in enumerate(findings):
+            key = dependency_key(finding)
+            if key is not None:
+                groups.setdefault(key, []).append(position)
+
+        coalesced_at: Dict[int, Dict[str, Any]] = {}
+        absorbed = set()
+        for key, positions in groups.items():
+            if len(positions) < 2:
+                continue
+            coalesced = self._coalesce(key, [findings[position] for position in positions])
+            if coalesced is None:
+                continue
+            self.coalesced_findings += len(positions)
+            self.emitted_upgrades += 1
+            coalesced_at[positions[0]] = coalesced
+            absorbed.update(positions[1:])
+
+        if self.emitted_upgrades:
+            logger.info(f"📦 Coalesced {self.coalesced_findings} dependency findings into "
+                        f"{self.emitted_upgrades} package upgrades")
+        return [coalesced_at.get(position, finding)
+                for position, finding in enumerate(findings) if position not in absorbed]
+
+    def _coalesce(self, key: Tuple[str, str, str, str], members: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        _, ecosystem, package, installed_version = key
+        member_fixed_versions = [extract_osv_fixed_versions(member) for member in members]
+        target_version = minimal_safe_upgrade(installed_version, member_fixed_versions)
+        if target_version is None:
+            return None
+
+        advisory_ids = list(dict.fromkeys(member.get('id', 'Unknown') for member in members))
+        unfixed = [member.get('id', 'Unknown') for member, versions in zip(members, member_fixed_versions) if not versions]
+        summaries = list(dict.fromkeys(
+            member.get('summary') or member.get('short_description') or member.get('rule_name') or member.get('id', '')
+            for member in members
+        ))
+        available_versions = sorted({v for versions in member_fixed_versions for v in versions},
+                                    key=version_sort_key, reverse=True)
+
+        # Share of the group's advisories the upgrade resolves, weighted by their own fix confidence
+        confidence = sum(advisory_fix_confidence(member, versions)
+                         for member, versions in zip(members, member_fixed_versions)) / len(members)
+
+        explanation = (f"{package} {installed_version} is affected by {len(advisory_ids)} known vulnerabilities "
+                       f"({', '.join(advisory_ids)}). Upgrading to {target_version} is the smallest upgrade "
+                       f"that includes the fixes for all of them.")
+        if unfixed:
+            explanation += f" No fixed release is available yet for {', '.join(unfixed)}."
+
+        # The first finding of the group carries the shared fields (source path, affected file)
+        coalesced = dict(members[0])
+        coalesced.update({
+            'id': ', '.join(advisory_ids),
+            'summary': '; '.join(summaries),
+            'fixed_version': target_version,
+            'coalesced_ids': advisory_ids,
+            'fix': {
+                'confidence': confidence,
+                'description': f"Upgrade {package} from {installed_version} to {target_version}",
+                'fixed_code': self.upgrade_code(package, target_version, ecosystem),
+                'explanation': explanation,
+                'alternatives': [],
+                'package': package,
+                'from_version': installed_version,
+                'to_version': target_version,
+                'ecosystem': ecosystem,
+                'available_versions': available_versions,
+            },
+        })
+        return coalesced
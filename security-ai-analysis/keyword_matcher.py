@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Keyword group matching for vulnerability classification
+
+The fix generator and the categorizer classify findings by testing keyword
+lists against lowercased finding text, each with its own inline `any(...)`
+chains. KeywordMatcher holds the ordered keyword groups, built once, and
+classifies a text - or a whole batch of texts - in one call.
+
+Matching deliberately stays a plain `keyword in text` test per keyword: for
+keyword sets of this size CPython's substring search beats both a single
+alternation regex and a pure Python Aho-Corasick automaton (which have to
+examine every character), while giving exactly the same results. Batches
+are classified once per distinct text, since findings from the same rule
+share their check id and message.
+
+Classes:
+- KeywordMatcher: Ordered keyword groups (e.g. vulnerability types) matched against text
+
+Usage:
+    matcher = KeywordMatcher({'sql_injection': ['sql', 'injection'], 'xss': ['xss', 'script']})
+    matcher.classify("possible sql injection")            # 'sql_injection'
+    matcher.classify_many(messages, default='generic')     # one label per message
+"""
+
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+class KeywordMatcher:
+    """
+    Matches the keywords of several ordered groups against text.
+
+    Matching is a case-sensitive substring test, exactly like `keyword in text`;
+    callers lowercase text and keywords as before.
+    """
+
+    def __init__(self, keyword_groups: Dict[str, Iterable[str]]):
+        """
+        Args:
+            keyword_groups: Group name -> keywords. Group order is the classification
+                priority: classify() returns the first group with a matching keyword.
+
+        Raises:
+            ValueError: If a keyword is empty (it would match every text)
+        """
+        self.groups: Dict[str, Tuple[str, ...]] = {name: tuple(dict.fromkeys(keywords))
+                                                   for name, keywords in keyword_groups.items()}
+        self._keywords = tuple(dict.fromkeys(keyword for keywords in self.groups.values() for keyword in keywords))
+        if '' in self._keywords:
+            raise ValueError("Keywords must not be empty")
+
+    def matched_keywords(self, text: str) -> Set[str]:
+        """All keywords occurring in text."""
+        return {keyword for keyword in self._keywords if keyword in text}
+
+    def count(self, text: str, group: str) -> int:
+        """Number of distinct keywords of a group occurring in text."""
+        return sum(1 for keyword in self.groups[group] if keyword in text)
+
+    def classify(self, text: str, default: Optional[str] = None) -> Optional[str]:
+        """First group (in priority order) with a keyword occurring in text, or default."""
+        for name, keywords in self.groups.items():
+            for keyword in keywords:
+                if keyword in text:
+                    return name
+        return default
+
+    def classify_many(self, texts: Iterable[str], default: Optional[str] = None) -> List[Optional[str]]:
+        """classify() for each text, in order; repeated texts are only matched once."""
+        labels: Dict[str, Optional[str]] = {}
+        result = []
+        for text in texts:
+            if text not in labels:
+                labels[text] = self.classify(text, default)
+            result.append(labels[text])
+        return result
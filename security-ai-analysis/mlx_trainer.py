@@ -15,6 +15,8 @@ from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 import os
 
+from augmentation_view import iter_augmented_examples, iter_dataset_examples
+
 # Configure tokenizer parallelism
 os.environ["TOKENIZERS_PARALLELISM"] = "false"
 
@@ -84,16 +86,13 @@ class MLXTrainer:
         examples = []
         quality_counts = {"high": 0, "medium": 0, "low": 0, "unknown": 0}
 
-        # Load all examples
-        with open(train_dataset, 'r') as f:
-            for line in f:
-                if line.strip():
-                    example = json.loads(line)
-                    examples.append(example)
+        # Load all examples (regenerating augmented ones from an augmentation view)
+        for example in iter_dataset_examples(train_dataset):
+            examples.append(example)
 
-                    # Track quality distribution
-                    quality = example.get('metadata', {}).get('quality', 'unknown')
-                    quality_counts[quality] = quality_counts.get(quality, 0) + 1
+            # Track quality distribution
+            quality = example.get('metadata', {}).get('quality', 'unknown')
+            quality_counts[quality] = quality_counts.get(quality, 0) + 1
 
         logger.info(f"   Loaded {len(examples)} examples")
         logger.info(f"   Quality distribution: {quality_counts}")
@@ -164,7 +163,7 @@ class MLXTrainer:
         weighted_train = mlx_data_dir / "train.jsonl"
         sampling_stats = self.apply_quality_weighted_sampling(train_dataset, weighted_train)
 
-        # Copy validation data as-is (no weighting)
+        # Copy validation data as-is (no weighting), plus examples regenerated from its augmentation view
         logger.info("📋 Copying validation dataset...")
         with open(validation_dataset, 'r') as fin, open(mlx_data_dir / "valid.jsonl", 'w') as fout:
             validation_count = 0
@@ -172,6 +171,9 @@ class MLXTrainer:
                 if line.strip():
                     fout.write(line)
                     validation_count += 1
+            for example in iter_augmented_examples(validation_dataset):
+                fout.write(json.dumps(example) + '\n')
+                validation_count += 1
 
         logger.info(f"   ✅ Validation dataset: {validation_count} examples")
         logger.info(f"   ✅ MLX data prepared: {mlx_data_dir}")
@@ -11,18 +11,88 @@ Classes:
 - MultiApproachFixGenerator: Main class for generating varied security fixes
 - FixGenerationResult: Result of fix generation with metadata
 
+Fix generation is deterministic, so results are memoized in an LRU cache keyed by
+a fingerprint of exactly the finding fields (and code context) the tool-specific
+generator reads - e.g. the same CVE in several lockfiles, or the same Semgrep rule
+hitting the same line, is generated once. With cache_file the cache persists
+across runs; it is invalidated whenever this module or a module it calls (see
+FIX_GENERATOR_SOURCES) changes. Parser changes need no invalidation: they can
+only change the findings, and with them the cache keys.
+
 Usage:
     generator = MultiApproachFixGenerator()
     fixes = generator.generate_fixes(vulnerability, code_context)
 """
 
+import hashlib
+import json
+import os
 import re
+import tempfile
 from enum import Enum
 from pathlib import Path
-from typing import Dict, List, Optional, Any, NamedTuple
-from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Any, NamedTuple
+from dataclasses import asdict, dataclass, field
+
+from keyword_matcher import KeywordMatcher
+from parse_cache import source_fingerprint
+from vulnerable_code_extractor import BoundedLRUCache, CodeContext, VulnerableCodeExtractor
+
+# Default number of memoized fix generation results
+DEFAULT_FIX_CACHE_SIZE = 4096
+
+# Bump when the persisted fix cache layout changes
+FIX_CACHE_FORMAT_VERSION = 1
+
+_MODULE_DIR = Path(__file__).parent
+
+# Sources whose behaviour determines generated fixes: this module, its keyword
+# matching and the CodeContext it reads code from
+FIX_GENERATOR_SOURCES = [
+    _MODULE_DIR / "multi_approach_fix_generator.py",
+    _MODULE_DIR / "keyword_matcher.py",
+    _MODULE_DIR / "vulnerable_code_extractor.py",
+]
+
+# Finding fields each tool-specific generator reads (see _fix_cache_key)
+OSV_FIX_FIELDS = ('id', 'summary', 'package_name', 'installed_version', 'ecosystem', 'fixed_version', 'affected')
+ZAP_FIX_FIELDS = ('alert', 'solution', 'uri')
+CHECKOV_FIX_FIELDS = ('id', 'check_id', 'rule_name', 'message', 'file_path')
+
+
+def extract_osv_fixed_versions(vuln: Dict) -> List[str]:
+    """
+    Extract fixed versions from OSV vulnerability data.
+
+    OSV format can have fixed versions in multiple places:
+    1. Direct 'fixed_version' field (from our parser)
+    2. 'affected' array with ranges/events (full OSV JSON)
+    """
+    fixed_versions = []
+
+    # Check for direct fixed_version field (from simplified parser output)
+    if 'fixed_version' in vuln:
+        fixed_version = vuln['fixed_version']
+        if fixed_version and fixed_version != 'Unknown':
+            # Could be comma-separated list
+            if ',' in fixed_version:
+                fixed_versions = [v.strip() for v in fixed_version.split(',')]
+            else:
+                fixed_versions = [fixed_version]
 
-from vulnerable_code_extractor import CodeContext, VulnerableCodeExtractor
+    # Check for full OSV format with 'affected' array
+    if 'affected' in vuln:
+        for affected_item in vuln['affected']:
+            for range_obj in affected_item.get('ranges', []):
+                for event in range_obj.get('events', []):
+                    if 'fixed' in event:
+                        fixed_versions.append(event['fixed'])
+
+    # Remove duplicates and empty strings, sort by version (latest first)
+    fixed_versions = [v for v in set(fixed_versions) if v and v.strip()]
+
+    # Simple version sorting (latest first) - this is basic, could be improved with packaging.version
+    return sorted(fixed_versions, reverse=True)
 
 
 class FixApproach(Enum):
@@ -87,6 +157,18 @@ class FixGenerationResult:
     error_message: Optional[str] = None
     generation_metadata: Dict[str, Any] = field(default_factory=dict)
 
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form (fix approaches by value)."""
+        result = asdict(self)
+        for fix in result['fixes']:
+            fix['approach'] = fix['approach'].value
+        return result
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'FixGenerationResult':
+        fixes = [SecurityFix(**{**fix, 'approach': FixApproach(fix['approach'])}) for fix in data['fixes']]
+        return cls(**{**data, 'fixes': fixes})
+
 
 class MultiApproachFixGenerator:
     """
@@ -96,11 +178,25 @@ class MultiApproachFixGenerator:
     fix strategies with specific code examples for training data.
     """
     
-    def __init__(self):
-        """Initialize the fix generator."""
+    def __init__(self, cache_size: int = DEFAULT_FIX_CACHE_SIZE, cache_file: Optional[Path] = None):
+        """
+        Initialize the fix generator.
+
+        Args:
+            cache_size: Maximum number of memoized fix generation results
+            cache_file: JSON file to load memoized results from and save them to
+                (save_fix_cache). None keeps the cache in memory only.
+        """
         import logging
         self.logger = logging.getLogger(__name__)
 
+        # Memoized results are shared between findings: callers must not modify them
+        self.fix_cache = BoundedLRUCache(cache_size)
+        self.cache_file = Path(cache_file) if cache_file else None
+        self._generator_fingerprint = source_fingerprint(FIX_GENERATOR_SOURCES)
+        if self.cache_file:
+            self._load_fix_cache()
+
         # Common vulnerability patterns and their fix strategies
         self.vulnerability_patterns = {
             'sql_injection': [
@@ -135,6 +231,16 @@ class MultiApproachFixGenerator:
             ]
         }
         
+        # Vulnerability type keywords (matched against check id and message), in priority order
+        self.classification_matcher = KeywordMatcher({
+            'sql_injection': ['sql', 'injection', 'query'],
+            'xss': ['xss', 'cross-site', 'script'],
+            'command_injection': ['command', 'exec', 'shell'],
+            'authentication_bypass': ['auth', 'credential', 'bypass'],
+            'information_disclosure': ['disclosure', 'leak', 'expose'],
+            'insecure_configuration': ['config', 'setting', 'default'],
+        })
+
         # Language-specific fix templates
         self.language_templates = {
             'python': self._get_python_templates(),
@@ -156,12 +262,24 @@ class MultiApproachFixGenerator:
             code_context: Extracted code context around vulnerability (None for infrastructure vulnerabilities)
 
         Returns:
-            FixGenerationResult with generated fixes
+            FixGenerationResult with generated fixes. Results are memoized and may be
+            shared between findings, so treat them as read-only.
         """
+        tool = vulnerability.get('tool', '').lower()
+        cache_key = self._fix_cache_key(tool, vulnerability, code_context)
+        if cache_key is not None:
+            cached = self.fix_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        result = self._generate_fixes_uncached(tool, vulnerability, code_context)
+        if cache_key is not None:
+            self.fix_cache.put(cache_key, result)
+        return result
+
+    def _generate_fixes_uncached(self, tool: str, vulnerability: Dict[str, Any],
+                                 code_context: Optional[CodeContext]) -> FixGenerationResult:
         try:
-            # Check for tool-specific fix generation
-            tool = vulnerability.get('tool', '').lower()
-
             # Delegate to tool-specific methods
             if 'osv' in tool:
                 return self._generate_osv_fix(vulnerability, code_context)
@@ -207,33 +325,101 @@ class MultiApproachFixGenerator:
         except Exception as e:
             self.logger.error(f"Fix generation failed: {e}")
             raise
+
+    def _fix_cache_key(self, tool: str, vulnerability: Dict[str, Any],
+                       code_context: Optional[CodeContext]) -> Optional[str]:
+        """
+        Memoization key for a finding: a hash of the inputs its tool-specific generator reads.
+
+        Mirrors the dispatch in _generate_fixes_uncached. Returns None for findings that
+        are not memoized (the generic fallback, and Trivy messages without dependency info).
+        """
+        context = [code_context.vulnerable_code, code_context.language] if code_context else None
+        if 'osv' in tool:
+            fingerprint = ['osv', {name: vulnerability[name] for name in OSV_FIX_FIELDS if name in vulnerability},
+                           context]
+        elif 'trivy' in tool:
+            # The fix depends only on the package, installed and fixed version in the message
+            dependency_info = self._parse_dependency_info(vulnerability)
+            if not dependency_info:
+                return None
+            fingerprint = ['trivy', dependency_info]
+        elif 'semgrep' in tool:
+            if not code_context:
+                return None
+            fingerprint = ['semgrep', self._classify_vulnerability(vulnerability), context,
+                           bool(code_context.function_name), bool(code_context.class_name)]
+        elif 'zap' in tool:
+            fingerprint = ['zap', {name: vulnerability[name] for name in ZAP_FIX_FIELDS if name in vulnerability}]
+        elif 'checkov' in tool:
+            fingerprint = ['checkov', {name: vulnerability[name] for name in CHECKOV_FIX_FIELDS if name in vulnerability},
+                           context]
+        else:
+            return None
+        return hashlib.sha256(json.dumps(fingerprint, sort_keys=True, default=str).encode()).hexdigest()
+
+    def _load_fix_cache(self):
+        """Seed the cache from cache_file, unless it is missing, unreadable or from other generator code."""
+        try:
+            with open(self.cache_file, 'r') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, json.JSONDecodeError) as e:
+            # A damaged cache file is only a lost optimization
+            self.logger.warning(f"⚠️ Ignoring unreadable fix cache {self.cache_file}: {e}")
+            return
+        if (data.get('format_version') != FIX_CACHE_FORMAT_VERSION
+                or data.get('generator_fingerprint') != self._generator_fingerprint):
+            self.logger.info(f"Fix cache {self.cache_file} is from a different fix generator version, ignoring it")
+            return
+        for key, result in data.get('entries', []):
+            self.fix_cache.put(key, FixGenerationResult.from_dict(result))
+        self.logger.info(f"📦 Loaded {len(self.fix_cache)} memoized fix results from {self.cache_file}")
+
+    def save_fix_cache(self):
+        """Write the memoized results to cache_file (atomically), if persistence is enabled."""
+        if not self.cache_file:
+            return
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            'format_version': FIX_CACHE_FORMAT_VERSION,
+            'generator_fingerprint': self._generator_fingerprint,
+            # Least recently used first, so reloading preserves the eviction order
+            'entries': [[key, result.to_dict()] for key, result in self.fix_cache.items()],
+        }
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_file.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f)
+            os.replace(temp_path, self.cache_file)
+        except BaseException:
+            Path(temp_path).unlink(missing_ok=True)
+            raise
+
+    def get_fix_cache_stats(self) -> Dict[str, Any]:
+        """Size, hit/miss and eviction counts of the fix cache."""
+        return self.fix_cache.stats()
     
     def _classify_vulnerability(self, vulnerability: Dict[str, Any]) -> str:
         """Classify vulnerability type from vulnerability data."""
-        check_id = vulnerability.get('check_id', '').lower()
-        message = vulnerability.get('extra', {}).get('message', '').lower()
-        
-        # Check for common vulnerability patterns
-        if any(term in check_id or term in message for term in ['sql', 'injection', 'query']):
-            return 'sql_injection'
-        
-        if any(term in check_id or term in message for term in ['xss', 'cross-site', 'script']):
-            return 'xss'
-        
-        if any(term in check_id or term in message for term in ['command', 'exec', 'shell']):
-            return 'command_injection'
-        
-        if any(term in check_id or term in message for term in ['auth', 'credential', 'bypass']):
-            return 'authentication_bypass'
-        
-        if any(term in check_id or term in message for term in ['disclosure', 'leak', 'expose']):
-            return 'information_disclosure'
-        
-        if any(term in check_id or term in message for term in ['config', 'setting', 'default']):
-            return 'insecure_configuration'
-        
-        return 'generic_security_issue'
-    
+        return self.classification_matcher.classify(self._classification_text(vulnerability),
+                                                    default='generic_security_issue')
+
+    def classify_vulnerabilities(self, vulnerabilities: Iterable[Dict[str, Any]]) -> List[str]:
+        """Classify the type of each vulnerability (see _classify_vulnerability), in order."""
+        return self.classification_matcher.classify_many(
+            (self._classification_text(vuln) for vuln in vulnerabilities),
+            default='generic_security_issue'
+        )
+
+    @staticmethod
+    def _classification_text(vulnerability: Dict[str, Any]) -> str:
+        # Keywords never contain a newline, so none can match across the two fields
+        check_id = vulnerability.get('check_id', '')
+        message = vulnerability.get('extra', {}).get('message', '')
+        return f"{check_id}\n{message}".lower()
+
     def _get_fix_approaches(self, vuln_type: str, code_context: Optional[CodeContext]) -> List[FixApproach]:
         """Get applicable fix approaches for vulnerability type."""
         # For infrastructure vulnerabilities (no code context), use infrastructure-specific approaches
@@ -806,7 +992,7 @@ class MultiApproachFixGenerator:
         """
         # Extract fixed versions from OSV data
         # OSV format has 'vulnerabilities' array with 'affected' field
-        fixed_versions = self._extract_osv_fixed_versions(vuln)
+        fixed_versions = extract_osv_fixed_versions(vuln)
 
         if not fixed_versions:
             return FixGenerationResult(
@@ -832,7 +1018,7 @@ class MultiApproachFixGenerator:
             title=f"Upgrade {package_name} to fix {vuln.get('id', 'vulnerability')}",
             description=f"Upgrade {package_name} from {current_version} to {primary_version}",
             vulnerable_code=code_context.vulnerable_code if code_context else f'{package_name}:{current_version}',
-            fixed_code=self._generate_dependency_upgrade_code(
+            fixed_code=self.generate_dependency_upgrade_code(
                 package_name,
                 primary_version,
                 ecosystem
@@ -865,7 +1051,7 @@ class MultiApproachFixGenerator:
                 title=f"Alternative: Upgrade to {alt_version}",
                 description=f"Upgrade {package_name} from {current_version} to {alt_version}",
                 vulnerable_code=code_context.vulnerable_code if code_context else f'{package_name}:{current_version}',
-                fixed_code=self._generate_dependency_upgrade_code(
+                fixed_code=self.generate_dependency_upgrade_code(
                     package_name,
                     alt_version,
                     ecosystem
@@ -1122,42 +1308,8 @@ intercept(ApplicationCallPipeline.Call) {
             }
         )
 
-    def _extract_osv_fixed_versions(self, vuln: Dict) -> List[str]:
-        """
-        Extract fixed versions from OSV vulnerability data.
-
-        OSV format can have fixed versions in multiple places:
-        1. Direct 'fixed_version' field (from our parser)
-        2. 'affected' array with ranges/events (full OSV JSON)
-        """
-        fixed_versions = []
-
-        # Check for direct fixed_version field (from simplified parser output)
-        if 'fixed_version' in vuln:
-            fixed_version = vuln['fixed_version']
-            if fixed_version and fixed_version != 'Unknown':
-                # Could be comma-separated list
-                if ',' in fixed_version:
-                    fixed_versions = [v.strip() for v in fixed_version.split(',')]
-                else:
-                    fixed_versions = [fixed_version]
-
-        # Check for full OSV format with 'affected' array
-        if 'affected' in vuln:
-            for affected_item in vuln['affected']:
-                for range_obj in affected_item.get('ranges', []):
-                    for event in range_obj.get('events', []):
-                        if 'fixed' in event:
-                            fixed_versions.append(event['fixed'])
-
-        # Remove duplicates and empty strings, sort by version (latest first)
-        fixed_versions = [v for v in set(fixed_versions) if v and v.strip()]
-
-        # Simple version sorting (latest first) - this is basic, could be improved with packaging.version
-        return sorted(fixed_versions, reverse=True)
-
-    def _generate_dependency_upgrade_code(self, package: str, version: str, ecosystem: str) -> str:
-        """Generate ecosystem-specific dependency upgrade code."""
+    def generate_dependency_upgrade_code(self, package: str, version: str, ecosystem: str) -> str:
+        """Generate ecosystem-specific dependency upgrade code (OSV ecosystem names, e.g. Maven, PyPI)."""
         if ecosystem == 'Maven' or ecosystem == 'maven':
             # Gradle Kotlin DSL format
             return f'implementation("{package}:{version}")'
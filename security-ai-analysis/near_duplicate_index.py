@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate detection for training examples (MinHash + LSH)
+
+Examples are compared by the Jaccard similarity of their word shingles (runs of
+SHINGLE_SIZE words of the user and assistant messages; the system prompt is
+shared by every example and left out). Each example gets a MinHash signature
+that estimates that similarity, and signatures are indexed by locality-
+sensitive hashing: a signature is split into bands, and only examples sharing
+a whole band are compared. Finding the near-duplicates of n examples therefore
+takes near-linear time instead of n² comparisons.
+
+Signatures use one-permutation hashing: each shingle is hashed once (CRC-32,
+so signatures are the same in every process and run) and the hash picks one of
+SIGNATURE_BINS bins, which keeps its smallest value; empty bins borrow from the
+next non-empty bin. This costs one hash per shingle rather than one per shingle
+and permutation.
+
+Uses:
+- augmentation deduplication (SecurityDataAugmentor)
+- train/test leakage checks after splitting (dataset_index, find_near_duplicates)
+
+Usage:
+    index = NearDuplicateIndex(threshold=0.9)
+    for example in examples:
+        signature = example_signature(example)
+        if index.find(signature) is None:
+            index.add(signature)
+"""
+
+import operator
+import re
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+SHINGLE_SIZE = 5                  # Words per shingle
+SIGNATURE_BINS = 128              # MinHash signature length (a power of two)
+LSH_RECALL = 0.99                 # Chance that a pair exactly at the threshold is compared
+
+# Train/test pairs at least this similar are reported as leakage
+LEAKAGE_SIMILARITY_THRESHOLD = 0.8
+
+_BIN_BITS = (SIGNATURE_BINS - 1).bit_length()
+_VALUE_BITS = 64 - _BIN_BITS
+_VALUE_MASK = (1 << _VALUE_BITS) - 1
+
+_WORD_PATTERN = re.compile(r'\w+')
+
+Signature = Tuple[int, ...]
+
+_MASK_64 = (1 << 64) - 1
+_GOLDEN_64 = 0x9E3779B97F4A7C15
+
+
+def _shingle_hash(shingle: str) -> int:
+    """Stable 64-bit shingle hash: CRC-32, spread over 64 bits by a multiply and xor-shift."""
+    mixed = (zlib.crc32(shingle.encode('utf-8')) * _GOLDEN_64) & _MASK_64
+    return mixed ^ (mixed >> 32)
+
+
+def example_shingles(example: Dict[str, Any]) -> Set[str]:
+    """Word shingles of an example's user and assistant messages (lowercased)."""
+    shingles = set()
+    for message in example.get('messages', []):
+        if message.get('role') == 'system':
+            continue
+        words = _WORD_PATTERN.findall(message.get('content', '').lower())
+        if len(words) <= SHINGLE_SIZE:
+            if words:
+                shingles.add(' '.join(words))
+            continue
+        shingles.update(map(' '.join, zip(*(words[offset:] for offset in range(SHINGLE_SIZE)))))
+    return shingles
+
+
+def minhash_signature(shingles: Iterable[str]) -> Signature:
+    """
+    One-permutation MinHash signature of a set of shingles.
+
+    Returns:
+        SIGNATURE_BINS values; all equal to the empty-set value when there are no shingles
+    """
+    hashes = sorted(map(_shingle_hash, shingles), reverse=True)
+    # The top bits of a hash pick its bin; assigned in descending order, each bin ends with its smallest
+    smallest = {hashed >> _VALUE_BITS: hashed & _VALUE_MASK for hashed in hashes}
+    bins = [smallest.get(slot, _VALUE_MASK + 1) for slot in range(SIGNATURE_BINS)]
+
+    # Densify: an empty bin takes the value of the next non-empty bin (circularly),
+    # offset by the distance so borrowed values only match bins borrowed the same way
+    if any(value > _VALUE_MASK for value in bins) and not all(value > _VALUE_MASK for value in bins):
+        filled = list(bins)
+        source, distance = None, 0
+        # Walk backwards twice around the bins, tracking the next non-empty bin
+        for step in range(2 * SIGNATURE_BINS - 1, -1, -1):
+            slot = step % SIGNATURE_BINS
+            distance += 1
+            if bins[slot] <= _VALUE_MASK:
+                source, distance = bins[slot], 0
+            elif source is not None and step < SIGNATURE_BINS:
+                filled[slot] = source + (distance << _VALUE_BITS)
+        bins = filled
+    return tuple(bins)
+
+
+def example_signature(example: Dict[str, Any]) -> Signature:
+    """MinHash signature of an example (see example_shingles)."""
+    return minhash_signature(example_shingles(example))
+
+
+def estimated_similarity(first: Signature, second: Signature) -> float:
+    """Jaccard similarity estimated from two signatures: the fraction of equal bins."""
+    return sum(map(operator.eq, first, second)) / SIGNATURE_BINS
+
+
+def lsh_bands(threshold: float, recall: float = LSH_RECALL) -> int:
+    """
+    Fewest LSH bands that make a pair with similarity threshold a candidate with probability recall.
+
+    With b bands of r = SIGNATURE_BINS / b bins, a pair of similarity s shares a band
+    with probability 1 - (1 - s**r)**b. Fewer, longer bands compare fewer dissimilar pairs.
+    """
+    bands = 1
+    while bands < SIGNATURE_BINS:
+        rows = SIGNATURE_BINS // bands
+        if 1 - (1 - threshold ** rows) ** bands >= recall:
+            break
+        bands *= 2
+    return bands
+
+
+class NearDuplicateIndex:
+    """
+    LSH index of MinHash signatures answering "is anything indexed at least this similar?".
+
+    Candidates are the indexed signatures sharing at least one band; each candidate's
+    similarity is then estimated from the full signatures.
+    """
+
+    def __init__(self, threshold: float, bands: Optional[int] = None):
+        """
+        Args:
+            threshold: Estimated Jaccard similarity at or above which examples are near-duplicates
+            bands: Number of LSH bands (must divide SIGNATURE_BINS). Defaults to
+                lsh_bands(threshold); more bands find less similar candidates, at the
+                cost of more comparisons.
+        """
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError(f"Near-duplicate threshold must be in (0, 1], got {threshold}")
+        if bands is None:
+            bands = lsh_bands(threshold)
+        if SIGNATURE_BINS % bands:
+            raise ValueError(f"LSH bands must divide the signature length {SIGNATURE_BINS}, got {bands}")
+
+        self.threshold = threshold
+        self.rows = SIGNATURE_BINS // bands
+        self.signatures: List[Signature] = []
+        self._buckets: List[Dict[Signature, List[int]]] = [{} for _ in range(bands)]
+
+    def __len__(self) -> int:
+        return len(self.signatures)
+
+    def _bands(self, signature: Signature) -> Iterable[Tuple[Dict[Signature, List[int]], Signature]]:
+        for band, buckets in enumerate(self._buckets):
+            yield buckets, signature[band * self.rows:(band + 1) * self.rows]
+
+    def add(self, signature: Signature) -> int:
+        """
+        Index a signature.
+
+        Returns:
+            Its position in the index (the order of add() calls)
+        """
+        position = len(self.signatures)
+        self.signatures.append(signature)
+        for buckets, key in self._bands(signature):
+            buckets.setdefault(key, []).append(position)
+        return position
+
+    def find(self, signature: Signature) -> Optional[Tuple[int, float]]:
+        """
+        Most similar indexed signature at or above the threshold.
+
+        Returns:
+            (position, estimated similarity), or None if there is no near-duplicate
+        """
+        best = None
+        checked = set()
+        for buckets, key in self._bands(signature):
+            for position in buckets.get(key, ()):
+                if position in checked:
+                    continue
+                checked.add(position)
+                similarity = estimated_similarity(signature, self.signatures[position])
+                if similarity >= self.threshold and (best is None or similarity > best[1]):
+                    best = (position, similarity)
+                    if similarity == 1.0:
+                        return best
+        return best
+
+
+def dataset_index(dataset_file: Path, threshold: float = LEAKAGE_SIMILARITY_THRESHOLD) -> NearDuplicateIndex:
+    """
+    Index every example of a dataset (with the augmented examples of its augmentation view, if any).
+
+    Positions in the index are example indices in the dataset.
+    """
+    # Imported here: augmentation_view depends on dataset_augmentor, which uses this module
+    from augmentation_view import iter_dataset_examples
+
+    index = NearDuplicateIndex(threshold)
+    for example in iter_dataset_examples(dataset_file):
+        index.add(example_signature(example))
+    return index
+
+
+def find_near_duplicates(dataset_file: Path, index: NearDuplicateIndex) -> List[Tuple[int, int, float]]:
+    """
+    Examples of a dataset that are near-duplicates of indexed examples.
+
+    Args:
+        dataset_file: Dataset JSONL, streamed (with its augmentation view, if any)
+        index: Index to check against, e.g. dataset_index(test_file)
+
+    Returns:
+        (dataset example index, index position, estimated similarity) per near-duplicate,
+        in dataset order
+    """
+    from augmentation_view import iter_dataset_examples
+
+    matches = []
+    for position, example in enumerate(iter_dataset_examples(dataset_file)):
+        match = index.find(example_signature(example))
+        if match:
+            matches.append((position, match[0], match[1]))
+    return matches
+
+
+def find_split_leakage(train_file: Path, test_file: Path,
+                       threshold: float = LEAKAGE_SIMILARITY_THRESHOLD) -> List[Tuple[int, int, float]]:
+    """
+    Training examples that are near-duplicates of test examples.
+
+    The test set is indexed and the training set (with the augmented examples of
+    its augmentation view, if any) is streamed against it. To check several
+    datasets, build dataset_index(test_file) once and call find_near_duplicates.
+
+    Args:
+        train_file: Training (or validation) dataset JSONL
+        test_file: Test dataset JSONL
+        threshold: Estimated Jaccard similarity at or above which a pair is reported
+
+    Returns:
+        (train example index, test example index, estimated similarity) per leaking
+        training example, in training set order
+    """
+    return find_near_duplicates(train_file, dataset_index(test_file, threshold))
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Content-addressed cache for parsed security scan files
+
+Most scan reports are byte-identical between CI runs (e.g. Checkov on unchanged
+infrastructure), yet every daemon cycle used to re-parse them and regenerate every
+fix. ParseCache stores the parsed and enriched findings of each report under a key
+derived from:
+
+- the SHA-256 of the report file itself
+- the scan type (which parser produced the findings) and whether dependency
+  findings are coalesced
+- a fingerprint of the parser, code extraction and fix generation sources
+- the project code version (git HEAD plus any uncommitted changes and the
+  path, size and mtime of untracked files), since code context is extracted
+  from the project sources
+
+so a hit is only possible when re-parsing would produce the same findings.
+
+Classes:
+- ParseCache: On-disk findings cache used by the ParseVulnerabilities phase
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Bump when the cache entry layout changes
+CACHE_FORMAT_VERSION = 1
+
+# Contexts (code version + parser fingerprint) kept on disk; older ones are pruned
+MAX_CACHED_CONTEXTS = 3
+
+_MODULE_DIR = Path(__file__).parent
+
+# Sources whose behaviour determines parsed findings
+PARSER_SOURCES = sorted(_MODULE_DIR.glob("parsers/*.py")) + [
+    _MODULE_DIR / "vulnerable_code_extractor.py",
+    _MODULE_DIR / "multi_approach_fix_generator.py",
+    _MODULE_DIR / "vulnerability_categorizer.py",
+    _MODULE_DIR / "dependency_coalescer.py",
+]
+
+
+def file_sha256(path: Path, block_size: int = 1024 * 1024) -> str:
+    """SHA-256 of a file's contents, read in blocks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def source_fingerprint(paths: Iterable[Path]) -> str:
+    """Fingerprint of a set of source files: changes whenever any of their contents change."""
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(path.name.encode())
+        digest.update(file_sha256(path).encode())
+    return digest.hexdigest()
+
+
+def project_code_version(project_root: Path) -> Optional[str]:
+    """
+    Identify the project source tree: git HEAD, plus a hash of uncommitted changes if any.
+
+    Uncommitted changes include untracked (but not ignored) files. Those are hashed by
+    path, size and modification time along with the diff of tracked files - never read,
+    so a large scratch file or log in the checkout does not slow down startup.
+
+    Returns:
+        Version string, or None if the project is not a git checkout (or git is unavailable)
+    """
+    try:
+        head = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=project_root,
+            capture_output=True, text=True, check=True, timeout=30
+        ).stdout.strip()
+        diff = subprocess.run(
+            ["git", "diff", "HEAD", "--no-ext-diff", "--binary"], cwd=project_root,
+            capture_output=True, check=True, timeout=120
+        ).stdout
+        untracked = subprocess.run(
+            ["git", "ls-files", "--others", "--exclude-standard", "-z"], cwd=project_root,
+            capture_output=True, check=True, timeout=120
+        ).stdout
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.warning(f"⚠️ Could not determine project code version: {e}")
+        return None
+    if not diff and not untracked:
+        return head
+
+    digest = hashlib.sha256(diff)
+    for relative_path in sorted(filter(None, untracked.split(b"\0"))):
+        digest.update(b"\0untracked\0" + relative_path + b"\0")
+        try:
+            stat = (Path(project_root) / os.fsdecode(relative_path)).stat()
+            digest.update(f"{stat.st_size}:{stat.st_mtime_ns}".encode())
+        except OSError:
+            # Removed or unreadable since listing; its path still changes the version
+            continue
+    return f"{head}+{digest.hexdigest()[:16]}"
+
+
+class ParseCache:
+    """
+    On-disk cache of parsed findings, one JSON entry per (report contents, scan type).
+
+    Entries live in a directory per context (code version + parser fingerprint);
+    only the most recently used MAX_CACHED_CONTEXTS contexts are kept.
+    """
+
+    def __init__(self, cache_dir: Path, project_root: Optional[Path] = None):
+        """
+        Args:
+            cache_dir: Root directory for cache entries
+            project_root: Project whose sources code context is extracted from.
+                Defaults to the repository containing this module.
+        """
+        self.cache_dir = Path(cache_dir)
+        self.hits = 0
+        self.misses = 0
+
+        project_root = project_root or _MODULE_DIR.parent
+        code_version = project_code_version(project_root)
+        self.enabled = code_version is not None
+        if not self.enabled:
+            logger.warning("⚠️ Parse cache disabled: project code version is unknown")
+            return
+
+        context = hashlib.sha256(
+            f"{CACHE_FORMAT_VERSION}:{code_version}:{source_fingerprint(PARSER_SOURCES)}".encode()
+        ).hexdigest()[:32]
+        self.context_dir = self.cache_dir / context
+        self.context_dir.mkdir(parents=True, exist_ok=True)
+        # Mark this context as most recently used before pruning
+        os.utime(self.context_dir)
+        self._prune_contexts()
+
+    def _prune_contexts(self):
+        contexts = sorted(
+            (d for d in self.cache_dir.iterdir() if d.is_dir()),
+            key=lambda d: d.stat().st_mtime, reverse=True
+        )
+        for stale in contexts[MAX_CACHED_CONTEXTS:]:
+            logger.debug(f"Pruning stale parse cache context: {stale.name}")
+            shutil.rmtree(stale, ignore_errors=True)
+
+    def key_for(self, scan_type: str, file_path: str, coalesce_dependencies: bool = False) -> str:
+        """Cache key for a scan report: its content hash, the parser used and whether findings are coalesced."""
+        key = f"{scan_type}-{file_sha256(Path(file_path))}"
+        return f"{key}-coalesced" if coalesce_dependencies else key
+
+    def _entry_path(self, key: str) -> Path:
+        return self.context_dir / f"{key}.json"
+
+    def contains(self, key: str) -> bool:
+        """Whether an entry exists for a key (without loading it)."""
+        return self.enabled and self._entry_path(key).exists()
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """Return cached findings for a key, or None on a miss."""
+        if not self.enabled:
+            return None
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, 'r') as f:
+                findings = json.load(f)['findings']
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (json.JSONDecodeError, KeyError) as e:
+            # A damaged entry is only a lost optimization - re-parse and overwrite it
+            logger.warning(f"⚠️ Ignoring unreadable parse cache entry {entry_path}: {e}")
+            self.misses += 1
+            return None
+        self.hits += 1
+        return findings
+
+    def put(self, key: str, findings: List[Dict[str, Any]]):
+        """Store findings for a key (atomically, so readers never see partial entries)."""
+        if not self.enabled:
+            return
+        fd, temp_path = tempfile.mkstemp(dir=self.context_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump({'findings': findings}, f)
+            os.replace(temp_path, self._entry_path(key))
+        except BaseException:
+            Path(temp_path).unlink(missing_ok=True)
+            raise
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Reading and writing the ParseVulnerabilities phase output
+
+Two formats are supported:
+- parsed_vulnerabilities.json  - a single indented JSON array (the original format)
+- parsed_vulnerabilities.jsonl - one compact finding per line
+
+Both are written incrementally as findings are produced and read lazily, so
+neither phase has to hold every finding (and its code_context) in memory.
+JSONL is several times smaller because it drops the indentation.
+
+With dedupe_code_context, the bulky code_context members (surrounding lines,
+function and class bodies) are stored once per distinct value in a
+content-addressed blob table, parsed_vulnerabilities.blobs.json, and findings
+reference them by hash under code_context['blob_refs']. Findings in the same
+function no longer repeat its body. iter_parsed_vulnerabilities rehydrates
+references transparently, sharing one copy of each text between findings.
+
+Usage:
+    with ParsedVulnerabilitiesWriter(output_dir, output_format='jsonl', dedupe_code_context=True) as writer:
+        writer.write_many(findings)
+
+    for vuln in iter_parsed_vulnerabilities(writer.path):
+        ...
+"""
+
+import copy
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+from parsers.streaming_json import iter_json_items
+
+PARSED_OUTPUT_FORMATS = ('json', 'jsonl')
+
+# code_context members moved to the blob table when deduplicating
+DEDUPED_CONTEXT_FIELDS = ('before_lines', 'after_lines', 'function_context', 'class_context')
+
+BLOB_TABLE_FORMAT_VERSION = 1
+
+
+def blob_table_path(parsed_vulns_file: Path) -> Path:
+    """Blob table accompanying a parsed vulnerabilities file (for either format)."""
+    parsed_vulns_file = Path(parsed_vulns_file)
+    return parsed_vulns_file.with_name(f"{parsed_vulns_file.stem}.blobs.json")
+
+
+class CodeContextBlobStore:
+    """
+    Content-addressed store of code_context values.
+
+    Each distinct value is kept once, keyed by the SHA-256 of its JSON encoding.
+    """
+
+    def __init__(self, blobs: Optional[Dict[str, Any]] = None):
+        self.blobs: Dict[str, Any] = blobs if blobs is not None else {}
+
+    def add(self, value: Any) -> str:
+        """Store a value (if new) and return its hash."""
+        digest = hashlib.sha256(json.dumps(value, sort_keys=True).encode()).hexdigest()
+        self.blobs.setdefault(digest, value)
+        return digest
+
+    def dedupe(self, finding: Dict[str, Any]) -> Dict[str, Any]:
+        """Return the finding with its code_context members replaced by blob references."""
+        code_context = finding.get('code_context')
+        if not isinstance(code_context, dict):
+            return finding
+        refs = {name: self.add(code_context[name]) for name in DEDUPED_CONTEXT_FIELDS
+                if code_context.get(name)}
+        if not refs:
+            return finding
+        code_context = {name: value for name, value in code_context.items() if name not in refs}
+        code_context['blob_refs'] = refs
+        return {**finding, 'code_context': code_context}
+
+    def rehydrate(self, finding: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Resolve blob references in a finding (in place).
+
+        Raises:
+            KeyError: If a referenced blob is missing from the table
+        """
+        code_context = finding.get('code_context')
+        if not isinstance(code_context, dict) or 'blob_refs' not in code_context:
+            return finding
+        for name, digest in code_context.pop('blob_refs').items():
+            if digest not in self.blobs:
+                raise KeyError(f"code_context blob {digest} ({name}) not found in the blob table")
+            value = self.blobs[digest]
+            # Strings are shared between findings; lists and dicts get their own copy
+            if isinstance(value, list):
+                value = list(value)
+            elif isinstance(value, dict):
+                value = copy.deepcopy(value)
+            code_context[name] = value
+        return finding
+
+    def save(self, path: Path):
+        with open(path, 'w') as f:
+            json.dump({'format_version': BLOB_TABLE_FORMAT_VERSION, 'blobs': self.blobs}, f)
+
+    @classmethod
+    def load(cls, path: Path) -> 'CodeContextBlobStore':
+        """
+        Raises:
+            ValueError: If the blob table has an unsupported format version
+        """
+        with open(path, 'r') as f:
+            table = json.load(f)
+        if table.get('format_version') != BLOB_TABLE_FORMAT_VERSION:
+            raise ValueError(f"Unsupported blob table format in {path}: {table.get('format_version')}")
+        return cls(table['blobs'])
+
+
+class ParsedVulnerabilitiesWriter:
+    """
+    Incremental writer for parsed vulnerabilities.
+
+    The 'json' format produces exactly the same bytes as json.dump(findings, f, indent=2).
+    """
+
+    def __init__(self, output_dir: Path, output_format: str = 'json', dedupe_code_context: bool = False):
+        """
+        Args:
+            output_dir: Directory to write parsed_vulnerabilities.<format> to
+            output_format: 'json' or 'jsonl'
+            dedupe_code_context: Store code_context members in a blob table
+                (parsed_vulnerabilities.blobs.json) instead of inline
+        """
+        if output_format not in PARSED_OUTPUT_FORMATS:
+            raise ValueError(f"Unsupported parsed vulnerabilities format: {output_format} "
+                             f"(expected one of {', '.join(PARSED_OUTPUT_FORMATS)})")
+        self.output_format = output_format
+        self.path = Path(output_dir) / f"parsed_vulnerabilities.{output_format}"
+        self.blob_path = blob_table_path(self.path)
+        self.blob_store = CodeContextBlobStore() if dedupe_code_context else None
+        self.count = 0
+        # A table left by an earlier deduplicated run must not be paired with this output
+        self.blob_path.unlink(missing_ok=True)
+        self._file = open(self.path, 'w')
+
+    def write_many(self, findings: Iterable[Dict[str, Any]]):
+        """Append findings to the output file."""
+        for finding in findings:
+            self.write(finding)
+
+    def write(self, finding: Dict[str, Any]):
+        """Append one finding to the output file."""
+        if self.blob_store is not None:
+            finding = self.blob_store.dedupe(finding)
+        if self.output_format == 'jsonl':
+            self._file.write(json.dumps(finding) + '\n')
+        else:
+            # Indent the item one level, as json.dump(..., indent=2) does for array members
+            item = json.dumps(finding, indent=2).replace('\n', '\n  ')
+            self._file.write(('[\n  ' if self.count == 0 else ',\n  ') + item)
+        self.count += 1
+
+    def close(self):
+        if self._file.closed:
+            return
+        if self.output_format == 'json':
+            self._file.write('\n]' if self.count else '[]')
+        self._file.close()
+        if self.blob_store is not None:
+            self.blob_store.save(self.blob_path)
+
+    def discard(self):
+        """Close the writer and delete everything written so far."""
+        if not self._file.closed:
+            self._file.close()
+        self.path.unlink(missing_ok=True)
+        self.blob_path.unlink(missing_ok=True)
+
+    def __enter__(self) -> 'ParsedVulnerabilitiesWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def iter_parsed_vulnerabilities(parsed_vulns_file: Path) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily read parsed vulnerabilities from a .jsonl or .json phase output file.
+
+    Code context stored in an accompanying blob table is rehydrated, so findings
+    look the same whether or not the file was written with dedupe_code_context.
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        json.JSONDecodeError: If the file is malformed
+        KeyError: If a finding references a blob missing from the blob table
+    """
+    parsed_vulns_file = Path(parsed_vulns_file)
+    table_path = blob_table_path(parsed_vulns_file)
+    blob_store = CodeContextBlobStore.load(table_path) if table_path.exists() else CodeContextBlobStore()
+
+    if parsed_vulns_file.suffix == '.jsonl':
+        with open(parsed_vulns_file, 'r') as f:
+            for line in f:
+                if line.strip():
+                    yield blob_store.rehydrate(json.loads(line))
+    else:
+        for finding in iter_json_items(str(parsed_vulns_file), 'item'):
+            yield blob_store.rehydrate(finding)
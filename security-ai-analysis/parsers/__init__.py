@@ -1,6 +1,7 @@
 
-from .sarif_trivy_parser import parse_trivy_sarif
-from .osv_parser import parse_osv_json_enhanced
-from .semgrep_parser import parse_semgrep_json
-from .zap_parser import parse_zap_json
-from .sarif_checkov_parser import parse_checkov_sarif
+from .parse_session import ParseSession
+from .sarif_trivy_parser import parse_trivy_sarif, iter_trivy_sarif
+from .osv_parser import parse_osv_json_enhanced, iter_osv_json_enhanced
+from .semgrep_parser import parse_semgrep_json, iter_semgrep_json
+from .zap_parser import parse_zap_json, iter_zap_json
+from .sarif_checkov_parser import parse_checkov_sarif, iter_checkov_sarif
@@ -2,16 +2,23 @@
 Parse OSV Scanner dependency scan outputs
 OSV Scanner format documented at: https://github.com/google/osv-scanner
 """
-import json
 import logging
+from itertools import islice
 from pathlib import Path
-from typing import List, Dict
+from typing import Iterator, List, Dict, Optional
+
+from dependency_coalescer import DependencyCoalescer
+from .parse_session import ParseSession
+from .streaming_json import iter_json_items
 
 logger = logging.getLogger(__name__)
 
-def _parse_osv_json(filepath: str) -> List[Dict]:
+# Findings categorized per categorize_batch call (bounds memory while streaming)
+CATEGORIZE_BATCH_SIZE = 256
+
+def _iter_osv_json(filepath: str) -> Iterator[Dict]:
     """
-    Parse OSV Scanner JSON output
+    Stream vulnerabilities from OSV Scanner JSON output, one scan result at a time
 
     Expected structure from OSV Scanner:
     {
@@ -45,15 +52,11 @@ def _parse_osv_json(filepath: str) -> List[Dict]:
     if not Path(filepath).exists():
         logger.info(f"ℹ️ OSV Scanner file not found: {filepath}")
         logger.info("This is acceptable - OSV dependency scanning may not have been run")
-        return []
+        return
 
     # Fail fast on corrupted existing files
     try:
-        with open(filepath, 'r') as f:
-            data = json.load(f)
-        
-        vulnerabilities = []
-        for result in data.get('results', []):
+        for result in iter_json_items(filepath, 'results.item'):
             source_path = result.get('source', {}).get('path', 'Unknown')
             source_type = result.get('source', {}).get('type', 'Unknown')
             
@@ -109,9 +112,7 @@ def _parse_osv_json(filepath: str) -> List[Dict]:
                                 seen.add(v)
                         vuln_dict['fixed_version'] = ', '.join(unique_versions)
 
-                    vulnerabilities.append(vuln_dict)
-        
-        return vulnerabilities
+                    yield vuln_dict
     except Exception as e:
         logger.error(f"❌ CRITICAL: Corrupted OSV Scanner data in {filepath}: {e}")
         logger.error("🔍 File exists but is corrupted - indicates OSV Scanner tool malfunction requiring investigation")
@@ -181,7 +182,7 @@ def _convert_fix_result_to_format(fix_result) -> Dict:
 
     # Add fixed_versions if available
     if 'fixed_versions' in fix_result.generation_metadata:
-        fix_data['available_versions'] = fix_result.generation_metadata['fixed_versions']
+        fix_data['available_versions'] = list(fix_result.generation_metadata['fixed_versions'])
 
     # Add alternatives
     for alt_fix in fix_result.fixes[1:]:
@@ -193,7 +194,24 @@ def _convert_fix_result_to_format(fix_result) -> Dict:
 
     return fix_data
 
-def parse_osv_json_enhanced(filepath: str) -> List[Dict]:
+def _iter_categorized(vulns: Iterator[Dict], categorizer) -> Iterator[tuple]:
+    """Yield (vuln, category, confidence), categorizing CATEGORIZE_BATCH_SIZE findings per call."""
+    while True:
+        batch = list(islice(vulns, CATEGORIZE_BATCH_SIZE))
+        if not batch:
+            return
+        categories, confidences = categorizer.categorize_batch(batch)
+        yield from zip(batch, categories, confidences)
+
+
+def parse_osv_json_enhanced(filepath: str, session: Optional[ParseSession] = None) -> List[Dict]:
+    """
+    Parse OSV Scanner JSON into a list of enriched vulnerabilities (see iter_osv_json_enhanced).
+    """
+    return list(iter_osv_json_enhanced(filepath, session))
+
+
+def iter_osv_json_enhanced(filepath: str, session: Optional[ParseSession] = None) -> Iterator[Dict]:
     """
     Parse OSV Scanner JSON with enhanced fix generation and code context.
 
@@ -207,30 +225,29 @@ def parse_osv_json_enhanced(filepath: str) -> List[Dict]:
     - security_category and category_confidence
     - code_context (if available)
     - fix with confidence, description, fixed_code, explanation, alternatives
-    """
-    # Import here to avoid circular dependencies
-    from multi_approach_fix_generator import MultiApproachFixGenerator
-    from vulnerable_code_extractor import VulnerableCodeExtractor
-    from vulnerability_categorizer import VulnerabilityCategorizor
 
-    # Parse base vulnerabilities
-    vulnerabilities = _parse_osv_json(filepath)
-
-    if not vulnerabilities:
-        return []
+    Vulnerabilities are streamed from the report and enriched one at a time.
+    Helpers come from the shared ParseSession; a new one is created if session is None.
+    With session.coalesce_dependencies, the report's vulnerabilities are first coalesced
+    per package version (see dependency_coalescer); a coalesced vulnerability already
+    carries its upgrade fix, so no fix is generated for it.
+    """
+    # Shared helpers
+    session = session or ParseSession()
+    fix_generator = session.fix_generator
+    code_extractor = session.code_extractor
+    categorizer = session.categorizer
 
-    # Initialize helpers
-    fix_generator = MultiApproachFixGenerator()
-    code_extractor = VulnerableCodeExtractor()
-    categorizer = VulnerabilityCategorizor()
+    logger.info(f"🔧 Enhanced OSV parsing: Processing vulnerabilities from {filepath}")
 
-    logger.info(f"🔧 Enhanced OSV parsing: Processing {len(vulnerabilities)} vulnerabilities")
+    vulns = _iter_osv_json(filepath)
+    if session.coalesce_dependencies:
+        vulns = iter(DependencyCoalescer(fix_generator.generate_dependency_upgrade_code).coalesce(vulns))
 
-    enriched_vulns = []
-    for vuln in vulnerabilities:
+    enriched_count = 0
+    for vuln, category, confidence in _iter_categorized(vulns, categorizer):
         try:
-            # Step 1: Categorization
-            category, confidence = categorizer.categorize_vulnerability(vuln)
+            # Step 1: Categorization (done in batches by _iter_categorized)
             vuln['security_category'] = category
             vuln['category_confidence'] = confidence
 
@@ -249,29 +266,29 @@ def parse_osv_json_enhanced(filepath: str) -> List[Dict]:
                     'extraction_success': False
                 }
 
-            # Step 3: Fix generation
-            fix_result = fix_generator.generate_fixes(vuln, extraction_result.code_context if extraction_result.success else None)
-
-            if fix_result.success and fix_result.fixes:
-                vuln['fix'] = _convert_fix_result_to_format(fix_result)
-            else:
-                logger.warning(f"⚠️ Fix generation failed for {vuln.get('id', 'Unknown')}: {fix_result.error_message}")
-                # Include error in output for debugging
-                vuln['fix'] = {
-                    'confidence': 0.0,
-                    'description': f"Fix generation failed: {fix_result.error_message}",
-                    'fixed_code': '',
-                    'explanation': '',
-                    'alternatives': []
-                }
-
-            enriched_vulns.append(vuln)
+            # Step 3: Fix generation (coalesced vulnerabilities carry their upgrade already)
+            if 'fix' not in vuln:
+                fix_result = fix_generator.generate_fixes(vuln, extraction_result.code_context if extraction_result.success else None)
+
+                if fix_result.success and fix_result.fixes:
+                    vuln['fix'] = _convert_fix_result_to_format(fix_result)
+                else:
+                    logger.warning(f"⚠️ Fix generation failed for {vuln.get('id', 'Unknown')}: {fix_result.error_message}")
+                    # Include error in output for debugging
+                    vuln['fix'] = {
+                        'confidence': 0.0,
+                        'description': f"Fix generation failed: {fix_result.error_message}",
+                        'fixed_code': '',
+                        'explanation': '',
+                        'alternatives': []
+                    }
 
         except Exception as e:
             logger.error(f"❌ Error processing vulnerability {vuln.get('id', 'Unknown')}: {e}")
             # Include the vulnerability anyway with error marker
             vuln['processing_error'] = str(e)
-            enriched_vulns.append(vuln)
 
-    logger.info(f"✅ Enhanced OSV parsing complete: {len(enriched_vulns)} vulnerabilities enriched")
-    return enriched_vulns
\ No newline at end of file
+        enriched_count += 1
+        yield vuln
+
+    logger.info(f"✅ Enhanced OSV parsing complete: {enriched_count} vulnerabilities enriched")
\ No newline at end of file
@@ -0,0 +1,38 @@
+"""
+Shared parsing context for a single ParseVulnerabilities run.
+
+Parsers used to build their own VulnerableCodeExtractor, MultiApproachFixGenerator
+and VulnerabilityCategorizor for every report file. A ParseSession owns one of each,
+so their setup cost (language templates, pattern tables, project file index lookups)
+is paid once and their caches (resolved scan paths, file contents, memoized fixes)
+carry over from one report file to the next.
+"""
+from pathlib import Path
+from typing import Optional
+
+from vulnerable_code_extractor import VulnerableCodeExtractor
+from multi_approach_fix_generator import MultiApproachFixGenerator
+from vulnerability_categorizer import VulnerabilityCategorizor
+
+
+class ParseSession:
+    """
+    Helpers shared by all parsers during one parse_vulnerabilities_phase invocation.
+
+    Not thread-safe; parallel parsing gives each worker process its own session.
+    """
+
+    def __init__(self, project_root: Optional[Path] = None, fix_cache_file: Optional[Path] = None,
+                 coalesce_dependencies: bool = False):
+        """
+        Args:
+            project_root: Project root for code extraction. If None, the extractor auto-detects it.
+            fix_cache_file: File persisting memoized fix generation results across runs
+                (None keeps them in memory only)
+            coalesce_dependencies: Have the OSV and Trivy parsers emit one finding per
+                vulnerable package version of a report (see dependency_coalescer)
+        """
+        self.coalesce_dependencies = coalesce_dependencies
+        self.code_extractor = VulnerableCodeExtractor(project_root)
+        self.fix_generator = MultiApproachFixGenerator(cache_file=fix_cache_file)
+        self.categorizer = VulnerabilityCategorizor()
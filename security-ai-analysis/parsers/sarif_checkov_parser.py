@@ -4,10 +4,10 @@ Checkov is an Infrastructure-as-Code (IaC) security scanner
 """
 import json
 import logging
-from typing import List, Dict
+from typing import Iterator, List, Dict, Optional
 
-from vulnerable_code_extractor import VulnerableCodeExtractor
-from multi_approach_fix_generator import MultiApproachFixGenerator
+from .parse_session import ParseSession
+from .streaming_json import iter_indexed_json_items, load_json_skeleton
 
 logger = logging.getLogger(__name__)
 
@@ -80,35 +80,52 @@ def _infer_config_type(file_path: str) -> str:
         return 'config'
 
 
-def parse_checkov_sarif(filepath: str) -> List[Dict]:
+def parse_checkov_sarif(filepath: str, session: Optional[ParseSession] = None) -> List[Dict]:
     """
     Parse Checkov SARIF output and extract configuration security findings.
 
     Args:
         filepath: Path to the Checkov SARIF file
+        session: Shared parse session; a new one is created if None
 
     Returns:
         List of vulnerability dictionaries in unified format
     """
+    return list(iter_checkov_sarif(filepath, session))
+
+
+def iter_checkov_sarif(filepath: str, session: Optional[ParseSession] = None) -> Iterator[Dict]:
+    """
+    Stream Checkov findings one SARIF result at a time.
+
+    Only the run metadata (tool driver and rules) is held in memory; results are
+    read incrementally from the file.
+
+    Args:
+        filepath: Path to the Checkov SARIF file
+        session: Shared parse session; a new one is created if None
+
+    Yields:
+        Vulnerability dictionaries in unified format
+    """
     try:
-        with open(filepath) as f:
-            data = json.load(f)
+        data = load_json_skeleton(filepath, skip=['runs.item.results'])
     except FileNotFoundError:
         logger.error(f"File not found: {filepath}")
-        return []
+        return
     except json.JSONDecodeError:
         logger.error(f"Invalid JSON in file: {filepath}")
-        return []
+        return
 
-    findings = []
-    code_extractor = VulnerableCodeExtractor()
-    fix_generator = MultiApproachFixGenerator()
+    session = session or ParseSession()
+    code_extractor = session.code_extractor
+    fix_generator = session.fix_generator
 
     # Extract tool information
     runs = data.get('runs', [])
     if not runs:
         logger.warning(f"No runs found in Checkov SARIF file: {filepath}")
-        return []
+        return
 
     run = runs[0]
     tool_info = run.get('tool', {}).get('driver', {})
@@ -118,16 +135,16 @@ def parse_checkov_sarif(filepath: str) -> List[Dict]:
     # Validate it's Checkov output
     if tool_name != 'Checkov':
         logger.warning(f"Expected Checkov output, got {tool_name}")
-        return []
+        return
 
     # Build rule lookup for metadata
     rules = tool_info.get('rules', [])
     rule_lookup = _build_rule_lookup(rules)
 
-    # Process results
-    results = run.get('results', [])
-
-    for result in results:
+    # Process results of the first run
+    for (run_index, _), result in iter_indexed_json_items(filepath, 'runs.item.results.item'):
+        if run_index != 0:
+            break
         rule_id = result.get('ruleId', 'Unknown')
         level = result.get('level', 'warning')
         message = result.get('message', {}).get('text', 'No message provided')
@@ -242,6 +259,4 @@ def parse_checkov_sarif(filepath: str) -> List[Dict]:
             'config_type': config_type,
             'fix_complexity': 'low',  # Config changes are typically straightforward
         }
-        findings.append(finding)
-
-    return findings
+        yield finding
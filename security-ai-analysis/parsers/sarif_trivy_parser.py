@@ -2,74 +2,107 @@
 import json
 import logging
 import re
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional
+
+from dependency_coalescer import DependencyCoalescer
+from .parse_session import ParseSession
+from .streaming_json import iter_indexed_json_items, load_json_skeleton
 
 logger = logging.getLogger(__name__)
 
-def parse_trivy_sarif(filepath: str) -> List[Dict]:
+def parse_trivy_sarif(filepath: str, session: Optional[ParseSession] = None) -> List[Dict]:
     """
     Parse Trivy SARIF files and extract dependency vulnerability findings
     with structured package upgrade information.
+
+    Trivy fixes are built from the SARIF message alone; the session only decides
+    whether findings for the same package version are coalesced.
     """
+    return list(iter_trivy_sarif(filepath, session))
+
+def iter_trivy_sarif(filepath: str, session: Optional[ParseSession] = None) -> Iterator[Dict]:
+    """
+    Stream Trivy findings one SARIF result at a time.
+
+    Run metadata (tool driver and rules) is loaded up front; results are read
+    incrementally from the file. With session.coalesce_dependencies, the report's
+    raw advisories are collected and coalesced per package version first (see
+    dependency_coalescer), so one fix is built per package version.
+    """
+    findings = _iter_trivy_findings(filepath)
+    if session and session.coalesce_dependencies:
+        findings = DependencyCoalescer(generate_dependency_upgrade_code).coalesce(findings)
+    for finding in findings:
+        # Coalesced findings carry their upgrade already
+        if finding['fix'] is None:
+            finding['fix'] = _generate_fix_object(finding, finding['package_ecosystem'])
+        yield finding
+
+def _iter_trivy_findings(filepath: str) -> Iterator[Dict]:
+    """Trivy findings of a SARIF file, in result order, without fixes (see iter_trivy_sarif)."""
     try:
-        with open(filepath) as f:
-            data = json.load(f)
+        data = load_json_skeleton(filepath, skip=['runs.item.results'])
     except FileNotFoundError:
         logger.error(f"File not found: {filepath}")
-        return []
+        return
     except json.JSONDecodeError:
         logger.error(f"Invalid JSON in file: {filepath}")
-        return []
+        return
 
-    findings = []
-    for run in data.get('runs', []):
+    runs = data.get('runs', [])
+    # Rule lookup per Trivy run index, None for runs produced by other tools
+    run_rules = {}
+    for run_index, run in enumerate(runs):
         if run.get('tool', {}).get('driver', {}).get('name', '').lower() != 'trivy':
+            run_rules[run_index] = None
+        else:
+            run_rules[run_index] = {rule['id']: rule for rule in run.get('tool', {}).get('driver', {}).get('rules', [])}
+
+    for (run_index, _), result in iter_indexed_json_items(filepath, 'runs.item.results.item'):
+        rules = run_rules[run_index]
+        if rules is None:
+            continue
+        run = runs[run_index]
+
+        rule_id = result.get('ruleId')
+        rule = rules.get(rule_id, {})
+        
+        parsed_message = _parse_trivy_message(result.get('message', {}).get('text', ''))
+        if not _should_include_vulnerability(parsed_message):
             continue
 
-        rules = {rule['id']: rule for rule in run.get('tool', {}).get('driver', {}).get('rules', [])}
-
-        for result in run.get('results', []):
-            rule_id = result.get('ruleId')
-            rule = rules.get(rule_id, {})
-            
-            parsed_message = _parse_trivy_message(result.get('message', {}).get('text', ''))
-            if not _should_include_vulnerability(parsed_message):
-                continue
-
-            location = result.get('locations', [{}])[0]
-            artifact_uri = location.get('physicalLocation', {}).get('artifactLocation', {}).get('uri', '')
-            
-            finding = {
-                'tool': 'trivy',
-                'id': rule_id,
-                'rule_name': rule.get('name'),
-                'severity': _map_severity(result.get('level'), rule.get('properties', {}).get('security-severity')),
-                'security_severity': rule.get('properties', {}).get('security-severity'),
-                'level': result.get('level'),
-                'package_name': parsed_message.get('package_name'),
-                'installed_version': parsed_message.get('installed_version'),
-                'fixed_version': parsed_message.get('fixed_version'),
-                'package_ecosystem': _classify_package_ecosystem(parsed_message.get('package_name', ''), artifact_uri),
-                'file_path': artifact_uri,
-                'path': artifact_uri,
-                'artifact': artifact_uri,
-                'start': {'line': 1},
-                'message': result.get('message', {}).get('text', ''),
-                'short_description': rule.get('shortDescription', {}).get('text'),
-                'full_description': rule.get('fullDescription', {}).get('text'),
-                'fix': _generate_fix_object(parsed_message, _classify_package_ecosystem(parsed_message.get('package_name', ''), artifact_uri)),
-                'help_uri': rule.get('helpUri'),
-                'cve_link': parsed_message.get('link'),
-                'tool_name': 'Trivy',
-                'tool_version': run.get('tool', {}).get('driver', {}).get('version'),
-                'security_category': 'dependency_security',
-                'category_confidence': 1.0,
-                'fix_complexity': 'low',
-                'tags': rule.get('properties', {}).get('tags', []),
-            }
-            findings.append(finding)
-            
-    return findings
+        location = result.get('locations', [{}])[0]
+        artifact_uri = location.get('physicalLocation', {}).get('artifactLocation', {}).get('uri', '')
+        
+        finding = {
+            'tool': 'trivy',
+            'id': rule_id,
+            'rule_name': rule.get('name'),
+            'severity': _map_severity(result.get('level'), rule.get('properties', {}).get('security-severity')),
+            'security_severity': rule.get('properties', {}).get('security-severity'),
+            'level': result.get('level'),
+            'package_name': parsed_message.get('package_name'),
+            'installed_version': parsed_message.get('installed_version'),
+            'fixed_version': parsed_message.get('fixed_version'),
+            'package_ecosystem': _classify_package_ecosystem(parsed_message.get('package_name', ''), artifact_uri),
+            'file_path': artifact_uri,
+            'path': artifact_uri,
+            'artifact': artifact_uri,
+            'start': {'line': 1},
+            'message': result.get('message', {}).get('text', ''),
+            'short_description': rule.get('shortDescription', {}).get('text'),
+            'full_description': rule.get('fullDescription', {}).get('text'),
+            'fix': None,  # Generated after coalescing
+            'help_uri': rule.get('helpUri'),
+            'cve_link': parsed_message.get('link'),
+            'tool_name': 'Trivy',
+            'tool_version': run.get('tool', {}).get('driver', {}).get('version'),
+            'security_category': 'dependency_security',
+            'category_confidence': 1.0,
+            'fix_complexity': 'low',
+            'tags': rule.get('properties', {}).get('tags', []),
+        }
+        yield finding
 
 def _parse_trivy_message(message_text: str) -> Dict[str, str]:
     fields = {}
@@ -124,7 +157,7 @@ def _generate_fix_object(fields: Dict, ecosystem: str) -> Dict:
         return None
 
     description = f"Upgrade {package} from {installed} to {primary_fixed_version} to fix security vulnerability"
-    fixed_code = _generate_dependency_upgrade_code(package, primary_fixed_version, ecosystem)
+    fixed_code = generate_dependency_upgrade_code(package, primary_fixed_version, ecosystem)
     explanation = f"The currently installed version {installed} of {package} is vulnerable. Upgrading to version {primary_fixed_version} will resolve the issue."
     
     alternatives = []
@@ -133,7 +166,7 @@ def _generate_fix_object(fields: Dict, ecosystem: str) -> Dict:
             alt_version = alt_version.strip()
             alternatives.append({
                 "description": f"Upgrade to {alt_version} if on a different release branch",
-                "fixed_code": _generate_dependency_upgrade_code(package, alt_version, ecosystem),
+                "fixed_code": generate_dependency_upgrade_code(package, alt_version, ecosystem),
                 "explanation": f"For projects on a different release branch, upgrade to {alt_version} which also includes the security fix."
             })
 
@@ -149,7 +182,8 @@ def _generate_fix_object(fields: Dict, ecosystem: str) -> Dict:
         "alternatives": alternatives
     }
 
-def _generate_dependency_upgrade_code(package: str, version: str, ecosystem: str) -> str:
+def generate_dependency_upgrade_code(package: str, version: str, ecosystem: str) -> str:
+    """Dependency declaration for an upgrade, by Trivy package ecosystem (see _classify_package_ecosystem)."""
     if ecosystem == 'maven':
         return f'implementation("{package}:{version}")'
     elif ecosystem == 'npm':
@@ -1,32 +1,46 @@
 
 import json
 import logging
-from typing import List, Dict
+from typing import Iterator, List, Dict, Optional
 
-from vulnerable_code_extractor import VulnerableCodeExtractor
-from multi_approach_fix_generator import MultiApproachFixGenerator
+from .parse_session import ParseSession
+from .streaming_json import iter_json_items, load_json_skeleton
 
 logger = logging.getLogger(__name__)
 
-def parse_semgrep_json(filepath: str) -> List[Dict]:
+def parse_semgrep_json(filepath: str, session: Optional[ParseSession] = None) -> List[Dict]:
     """
     Parse Semgrep JSON output files.
+
+    Args:
+        filepath: Path to the Semgrep JSON file
+        session: Shared parse session; a new one is created if None
+    """
+    return list(iter_semgrep_json(filepath, session))
+
+def iter_semgrep_json(filepath: str, session: Optional[ParseSession] = None) -> Iterator[Dict]:
+    """
+    Stream findings from a Semgrep JSON file one result at a time.
+
+    Args:
+        filepath: Path to the Semgrep JSON file
+        session: Shared parse session; a new one is created if None
     """
     try:
-        with open(filepath) as f:
-            data = json.load(f)
+        # Everything except the findings, e.g. the Semgrep version
+        data = load_json_skeleton(filepath, skip=['results'])
     except FileNotFoundError:
         logger.error(f"File not found: {filepath}")
-        return []
+        return
     except json.JSONDecodeError:
         logger.error(f"Invalid JSON in file: {filepath}")
-        return []
+        return
 
-    findings = []
-    code_extractor = VulnerableCodeExtractor()
-    fix_generator = MultiApproachFixGenerator()
+    session = session or ParseSession()
+    code_extractor = session.code_extractor
+    fix_generator = session.fix_generator
 
-    for result in data.get('results', []):
+    for result in iter_json_items(filepath, 'results.item'):
         # Extract vulnerability info and add tool field for proper routing
         # VulnerableCodeExtractor will handle path resolution intelligently
         extraction_result = code_extractor.extract_vulnerability_context(vulnerability={
@@ -110,6 +124,4 @@ def parse_semgrep_json(filepath: str) -> List[Dict]:
             'category_confidence': 0.7,
             'fix_complexity': 'high',
         }
-        findings.append(finding)
-
-    return findings
+        yield finding
@@ -0,0 +1,260 @@
+"""
+Incremental JSON reader for large security scan reports
+
+json.load materializes a whole report before the first finding can be processed.
+This reader walks the document in fixed-size chunks and only decodes the values a
+parser asks for, so memory is bounded by the largest single finding rather than the
+report size.
+
+Paths use dotted prefixes where 'item' stands for "every element of an array":
+    'results.item'                - Semgrep / OSV Scanner findings
+    'runs.item.results.item'      - SARIF results (Trivy, Checkov)
+    'site.item.alerts.item'       - ZAP alerts
+
+Values are decoded with the standard json decoder, so they are identical to the
+corresponding parts of json.load output.
+"""
+import json
+import re
+from typing import Any, Iterable, Iterator, List, Tuple
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+# Characters that may still belong to a number cut off at the end of the buffer
+_NUMBER_TAIL = re.compile(r'[0-9eE+\-.]*')
+
+
+def _split_prefix(prefix: str) -> Tuple[str, ...]:
+    return tuple(prefix.split('.')) if prefix else ()
+
+
+class _JSONStreamScanner:
+    """Pull-based scanner over a text stream that keeps only an unconsumed window in memory."""
+
+    def __init__(self, fp, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self._fp = fp
+        self._chunk_size = chunk_size
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self, read_size: int = 0) -> bool:
+        """Drop the consumed part of the buffer and append the next chunk. Returns False at EOF."""
+        if self._eof:
+            return False
+        chunk = self._fp.read(max(read_size, self._chunk_size))
+        if not chunk:
+            self._eof = True
+            return False
+        if self._pos:
+            self._buf = self._buf[self._pos:]
+            self._pos = 0
+        self._buf += chunk
+        return True
+
+    def _error(self, message: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(message, self._buf, self._pos)
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character ('' at end of input)."""
+        while True:
+            self._pos = _WHITESPACE.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ''
+
+    def _expect(self, char: str):
+        if self.peek() != char:
+            raise self._error(f"Expecting '{char}'")
+        self._pos += 1
+
+    def decode_value(self) -> Any:
+        """Decode the next complete value, reading more input until it fits in the buffer."""
+        self.peek()
+        read_size = self._chunk_size
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if self._fill(read_size):
+                    read_size *= 2
+                    continue
+                raise
+            # A number cut off at the buffer end (e.g. "1.5e" of "1.5e+300") decodes
+            # as a shorter prefix, so retry with more input before trusting it
+            if _NUMBER_TAIL.fullmatch(self._buf, end) and self._fill(read_size):
+                read_size *= 2
+                continue
+            self._pos = end
+            return value
+
+    def _read_key(self) -> str:
+        read_size = self._chunk_size
+        while True:
+            try:
+                key, end = json.decoder.scanstring(self._buf, self._pos + 1)
+            except json.JSONDecodeError:
+                if self._fill(read_size):
+                    read_size *= 2
+                    continue
+                raise
+            self._pos = end
+            return key
+
+    def skip_value(self):
+        """
+        Skip the next value.
+
+        Containers are entered and their members decoded (by the C decoder) and
+        discarded one at a time, so only one member is ever held in memory.
+        """
+        char = self.peek()
+        if char == '[':
+            for _ in self.iter_array():
+                self.decode_value()
+        elif char == '{':
+            for _ in self.iter_object():
+                self.decode_value()
+        else:
+            self.decode_value()
+
+    def iter_array(self) -> Iterator[int]:
+        """Enter an array and yield each element index; the caller must consume the element."""
+        self._expect('[')
+        if self.peek() == ']':
+            self._pos += 1
+            return
+        index = 0
+        while True:
+            yield index
+            index += 1
+            char = self.peek()
+            self._pos += 1
+            if char == ']':
+                return
+            if char != ',':
+                self._pos -= 1
+                raise self._error("Expecting ',' delimiter")
+
+    def iter_object(self) -> Iterator[str]:
+        """Enter an object and yield each key; the caller must consume the value."""
+        self._expect('{')
+        if self.peek() == '}':
+            self._pos += 1
+            return
+        while True:
+            if self.peek() != '"':
+                raise self._error("Expecting property name enclosed in double quotes")
+            key = self._read_key()
+            self._expect(':')
+            yield key
+            char = self.peek()
+            self._pos += 1
+            if char == '}':
+                return
+            if char != ',':
+                self._pos -= 1
+                raise self._error("Expecting ',' delimiter")
+
+    def walk(self, parts: Tuple[str, ...], depth: int = 0,
+             indices: Tuple[int, ...] = ()) -> Iterator[Tuple[Tuple[int, ...], Any]]:
+        """Yield (array indices, value) for every value under the prefix parts[depth:]."""
+        if depth == len(parts):
+            yield indices, self.decode_value()
+            return
+        part = parts[depth]
+        char = self.peek()
+        if part == 'item':
+            if char != '[':
+                self.skip_value()
+                return
+            for index in self.iter_array():
+                yield from self.walk(parts, depth + 1, indices + (index,))
+        else:
+            if char != '{':
+                self.skip_value()
+                return
+            for key in self.iter_object():
+                if key == part:
+                    yield from self.walk(parts, depth + 1, indices)
+                else:
+                    self.skip_value()
+
+    def build(self, path: Tuple[str, ...], skip: List[Tuple[str, ...]]) -> Any:
+        """Decode the next value, leaving out members whose path is in skip."""
+        if not any(len(s) > len(path) and s[:len(path)] == path for s in skip):
+            return self.decode_value()
+        char = self.peek()
+        if char == '{':
+            obj = {}
+            for key in self.iter_object():
+                child = path + (key,)
+                if child in skip:
+                    self.skip_value()
+                else:
+                    obj[key] = self.build(child, skip)
+            return obj
+        if char == '[':
+            return [self.build(path + ('item',), skip) for _ in self.iter_array()]
+        return self.decode_value()
+
+    def expect_end(self):
+        if self.peek():
+            raise self._error("Extra data")
+
+
+def iter_indexed_json_items(filepath: str, prefix: str,
+                            chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Tuple[Tuple[int, ...], Any]]:
+    """
+    Stream the values found under a dotted prefix, together with their array indices.
+
+    Args:
+        filepath: Path to the JSON file
+        prefix: Dotted path such as 'runs.item.results.item'
+        chunk_size: Number of characters read per chunk
+
+    Yields:
+        (indices, value) where indices holds the position in every 'item' level of
+        the prefix, e.g. (run_index, result_index) for 'runs.item.results.item'
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        json.JSONDecodeError: If the document is malformed
+    """
+    with open(filepath, 'r', encoding='utf-8') as f:
+        scanner = _JSONStreamScanner(f, chunk_size)
+        yield from scanner.walk(_split_prefix(prefix))
+        scanner.expect_end()
+
+
+def iter_json_items(filepath: str, prefix: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Any]:
+    """Stream the values found under a dotted prefix (see iter_indexed_json_items)."""
+    for _, value in iter_indexed_json_items(filepath, prefix, chunk_size):
+        yield value
+
+
+def load_json_skeleton(filepath: str, skip: Iterable[str], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Any:
+    """
+    Load a JSON document without the (large) members named in skip.
+
+    Used to read report metadata (tool versions, SARIF rules, ZAP site details)
+    while the findings themselves are streamed with iter_json_items. Skipped
+    members are still decoded (and discarded), so a malformed document is rejected.
+
+    Args:
+        filepath: Path to the JSON file
+        skip: Dotted paths of members to leave out, e.g. ['runs.item.results']
+        chunk_size: Number of characters read per chunk
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        json.JSONDecodeError: If the document is malformed
+    """
+    with open(filepath, 'r', encoding='utf-8') as f:
+        scanner = _JSONStreamScanner(f, chunk_size)
+        skeleton = scanner.build((), [_split_prefix(path) for path in skip])
+        scanner.expect_end()
+        return skeleton
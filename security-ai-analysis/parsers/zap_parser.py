@@ -2,13 +2,13 @@
 Parse OWASP ZAP scan outputs
 ZAP JSON format documented at: https://www.zaproxy.org/docs/desktop/ui/reports/
 """
-import json
 import logging
 import re
 from pathlib import Path
-from typing import List, Dict
+from typing import Iterator, List, Dict, Optional
 
-from multi_approach_fix_generator import MultiApproachFixGenerator
+from .parse_session import ParseSession
+from .streaming_json import iter_indexed_json_items, load_json_skeleton
 
 logger = logging.getLogger(__name__)
 
@@ -36,9 +36,9 @@ def _strip_html_tags(html_text: str) -> str:
     return clean
 
 
-def parse_zap_json(filepath: str) -> List[Dict]:
+def parse_zap_json(filepath: str, session: Optional[ParseSession] = None) -> List[Dict]:
     """
-    Parse OWASP ZAP JSON report output
+    Parse OWASP ZAP JSON report output. A new ParseSession is created if session is None.
 
     Expected ZAP JSON structure:
     {
@@ -64,20 +64,28 @@ def parse_zap_json(filepath: str) -> List[Dict]:
         ]
     }
     """
+    return list(iter_zap_json(filepath, session))
+
+
+def iter_zap_json(filepath: str, session: Optional[ParseSession] = None) -> Iterator[Dict]:
+    """
+    Stream ZAP findings one alert at a time.
+
+    Site metadata is loaded up front; alerts are read incrementally from the file.
+    Corrupted files raise RuntimeError, as with parse_zap_json.
+    """
     # Graceful handling for optional tool execution
     if not Path(filepath).exists():
         logger.info(f"ℹ️ ZAP scan file not found: {filepath}")
         logger.info("This is acceptable - ZAP web application scanning may not have been run")
-        return []
+        return
 
     # Fail fast on corrupted existing files
     try:
-        with open(filepath, 'r') as f:
-            data = json.load(f)
+        data = load_json_skeleton(filepath, skip=['site.item.alerts'])
 
-        findings = []
         zap_version = data.get('@version', 'Unknown')
-        fix_generator = MultiApproachFixGenerator()
+        fix_generator = (session or ParseSession()).fix_generator
 
         # Risk mapping
         risk_map = {
@@ -87,115 +95,114 @@ def parse_zap_json(filepath: str) -> List[Dict]:
             '3': 'HIGH'
         }
 
-        for site in data.get('site', []):
+        sites = data.get('site', [])
+        for (site_index, _), alert in iter_indexed_json_items(filepath, 'site.item.alerts.item'):
+            site = sites[site_index]
             site_name = site.get('@name', 'Unknown')
             site_host = site.get('@host', 'Unknown')
             site_port = site.get('@port', 'Unknown')
 
-            for alert in site.get('alerts', []):
-                risk_code = str(alert.get('riskcode', '0'))
-                severity = risk_map.get(risk_code, 'UNKNOWN')
-
-                # Count instances
-                instances = alert.get('instances', [])
-                instance_count = len(instances)
-
-                # Extract first instance details if available
-                first_instance = instances[0] if instances else {}
-                uri = first_instance.get('uri', site_name)
-                method = first_instance.get('method', 'Unknown')
-
-                # Strip HTML from description and solution
-                clean_description = _strip_html_tags(alert.get('desc', 'No description'))
-                clean_solution = _strip_html_tags(alert.get('solution', 'No solution provided'))
-                clean_reference = _strip_html_tags(alert.get('reference', ''))
-
-                # Build vulnerability dict with tool field for routing
-                vulnerability = {
-                    'tool': 'zap',
-                    'id': alert.get('pluginid', 'Unknown'),
-                    'alert_ref': alert.get('alertRef', 'Unknown'),
-                    'alert': alert.get('alert', 'Unknown'),
-                    'name': alert.get('alert', 'Unknown'),
-                    'severity': severity,
-                    'risk_code': risk_code,
-                    'confidence': alert.get('confidence', 'Unknown'),
-                    'risk_desc': alert.get('riskdesc', 'Unknown'),
-                    'description': clean_description,
-                    'message': clean_description,  # Alias for compatibility
-                    'solution': clean_solution,
-                    'reference': clean_reference,
-                    'cwe': alert.get('cweid', ''),
-                    'wasc': alert.get('wascid', ''),
-                    'site_host': site_host,
-                    'site_port': site_port,
-                    'uri': uri,
-                    'url': uri,
-                    'method': method,
-                    'instances': instances,
-                    'instance_count': instance_count,
-                    'path': uri,  # For compatibility
-                    'start': {'line': 1},  # Minimal start field
-                }
-
-                # Generate fix using MultiApproachFixGenerator
-                # Note: ZAP findings are HTTP-level, so no code context available
-                fix_result = fix_generator.generate_fixes(vulnerability, code_context=None)
-
-                fix_object = None
-                if fix_result.success and fix_result.fixes:
-                    primary_fix = fix_result.fixes[0]
-                    fix_object = {
-                        "confidence": fix_result.generation_metadata.get('confidence', 0.9),
-                        "description": primary_fix.description,
-                        "fixed_code": primary_fix.fixed_code,
-                        "explanation": primary_fix.explanation,
-                        "alternatives": [
-                            {
-                                "description": alt_fix.description,
-                                "fixed_code": alt_fix.fixed_code,
-                                "explanation": alt_fix.explanation
-                            }
-                            for alt_fix in fix_result.fixes[1:]
-                        ]
-                    }
+            risk_code = str(alert.get('riskcode', '0'))
+            severity = risk_map.get(risk_code, 'UNKNOWN')
+
+            # Count instances
+            instances = alert.get('instances', [])
+            instance_count = len(instances)
+
+            # Extract first instance details if available
+            first_instance = instances[0] if instances else {}
+            uri = first_instance.get('uri', site_name)
+            method = first_instance.get('method', 'Unknown')
+
+            # Strip HTML from description and solution
+            clean_description = _strip_html_tags(alert.get('desc', 'No description'))
+            clean_solution = _strip_html_tags(alert.get('solution', 'No solution provided'))
+            clean_reference = _strip_html_tags(alert.get('reference', ''))
+
+            # Build vulnerability dict with tool field for routing
+            vulnerability = {
+                'tool': 'zap',
+                'id': alert.get('pluginid', 'Unknown'),
+                'alert_ref': alert.get('alertRef', 'Unknown'),
+                'alert': alert.get('alert', 'Unknown'),
+                'name': alert.get('alert', 'Unknown'),
+                'severity': severity,
+                'risk_code': risk_code,
+                'confidence': alert.get('confidence', 'Unknown'),
+                'risk_desc': alert.get('riskdesc', 'Unknown'),
+                'description': clean_description,
+                'message': clean_description,  # Alias for compatibility
+                'solution': clean_solution,
+                'reference': clean_reference,
+                'cwe': alert.get('cweid', ''),
+                'wasc': alert.get('wascid', ''),
+                'site_host': site_host,
+                'site_port': site_port,
+                'uri': uri,
+                'url': uri,
+                'method': method,
+                'instances': instances,
+                'instance_count': instance_count,
+                'path': uri,  # For compatibility
+                'start': {'line': 1},  # Minimal start field
+            }
 
-                finding = {
-                    'tool': 'zap',
-                    'id': alert.get('pluginid', 'Unknown'),
-                    'alert_ref': alert.get('alertRef', 'Unknown'),
-                    'alert': alert.get('alert', 'Unknown'),
-                    'name': alert.get('alert', 'Unknown'),
-                    'severity': severity,
-                    'risk_code': risk_code,
-                    'confidence': alert.get('confidence', 'Unknown'),
-                    'risk_desc': alert.get('riskdesc', 'Unknown'),
-                    'message': clean_description,
-                    'description': clean_description,
-                    'solution': clean_solution,
-                    'reference': clean_reference,
-                    'cwe': alert.get('cweid', ''),
-                    'wasc': alert.get('wascid', ''),
-                    'site_host': site_host,
-                    'site_port': site_port,
-                    'uri': uri,
-                    'url': uri,
-                    'method': method,
-                    'instances': instances,
-                    'instance_count': instance_count,
-                    'path': uri,
-                    'start': {'line': 1},
-                    'code_context': None,  # ZAP is HTTP-level, no source code context
-                    'fix': fix_object,
-                    'tool_name': 'ZAP',
-                    'tool_version': zap_version,
-                    'security_category': 'web_security',
-                    'category_confidence': 0.9,
-                    'fix_complexity': 'low',  # HTTP header configuration is typically simple
+            # Generate fix using MultiApproachFixGenerator
+            # Note: ZAP findings are HTTP-level, so no code context available
+            fix_result = fix_generator.generate_fixes(vulnerability, code_context=None)
+
+            fix_object = None
+            if fix_result.success and fix_result.fixes:
+                primary_fix = fix_result.fixes[0]
+                fix_object = {
+                    "confidence": fix_result.generation_metadata.get('confidence', 0.9),
+                    "description": primary_fix.description,
+                    "fixed_code": primary_fix.fixed_code,
+                    "explanation": primary_fix.explanation,
+                    "alternatives": [
+                        {
+                            "description": alt_fix.description,
+                            "fixed_code": alt_fix.fixed_code,
+                            "explanation": alt_fix.explanation
+                        }
+                        for alt_fix in fix_result.fixes[1:]
+                    ]
                 }
-                findings.append(finding)
 
-        return findings
+            finding = {
+                'tool': 'zap',
+                'id': alert.get('pluginid', 'Unknown'),
+                'alert_ref': alert.get('alertRef', 'Unknown'),
+                'alert': alert.get('alert', 'Unknown'),
+                'name': alert.get('alert', 'Unknown'),
+                'severity': severity,
+                'risk_code': risk_code,
+                'confidence': alert.get('confidence', 'Unknown'),
+                'risk_desc': alert.get('riskdesc', 'Unknown'),
+                'message': clean_description,
+                'description': clean_description,
+                'solution': clean_solution,
+                'reference': clean_reference,
+                'cwe': alert.get('cweid', ''),
+                'wasc': alert.get('wascid', ''),
+                'site_host': site_host,
+                'site_port': site_port,
+                'uri': uri,
+                'url': uri,
+                'method': method,
+                'instances': instances,
+                'instance_count': instance_count,
+                'path': uri,
+                'start': {'line': 1},
+                'code_context': None,  # ZAP is HTTP-level, no source code context
+                'fix': fix_object,
+                'tool_name': 'ZAP',
+                'tool_version': zap_version,
+                'security_category': 'web_security',
+                'category_confidence': 0.9,
+                'fix_complexity': 'low',  # HTTP header configuration is typically simple
+            }
+            yield finding
     except Exception as e:
         logger.error(f"❌ CRITICAL: Corrupted ZAP scan data in {filepath}: {e}")
         logger.error("🔍 File exists but is corrupted - indicates ZAP tool malfunction requiring investigation")
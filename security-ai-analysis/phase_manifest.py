@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Phase-level memoization for the process_artifacts pipeline
+
+Every run used to redo parsing, fix generation and augmentation from scratch,
+even when re-running only because the upload failed. PhaseManifest records,
+for each completed phase, a key derived from:
+
+- the SHA-256 of every input file
+- the project code version (git HEAD plus any uncommitted changes and untracked
+  files) and a fingerprint of this package's sources
+- the phase options that change its output
+
+together with the SHA-256 of every output file and the phase result. A phase
+whose key is unchanged and whose outputs are still on disk, unmodified, is
+skipped and its recorded result reused. --force re-runs every phase.
+
+The manifest is a JSON file in the output directory, written atomically after
+each phase succeeds; a failed phase never records anything.
+
+The code version costs a few git commands, so a run computes it once
+(pipeline_code_version) and passes it to the manifest of every phase.
+
+Classes:
+- PhaseManifest: Recorded phase keys, outputs and results for one output directory
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from parse_cache import file_sha256, project_code_version, source_fingerprint
+
+logger = logging.getLogger(__name__)
+
+PHASE_MANIFEST_FILE = "phase_manifest.json"
+
+# Bump when the manifest layout changes
+MANIFEST_FORMAT_VERSION = 1
+
+_MODULE_DIR = Path(__file__).parent
+
+# Sources whose behaviour determines phase outputs
+PIPELINE_SOURCES = sorted(_MODULE_DIR.glob("*.py")) + sorted(_MODULE_DIR.glob("parsers/*.py"))
+
+
+def pipeline_code_version(project_root: Optional[Path] = None) -> Optional[str]:
+    """
+    Version of the code phase outputs depend on: the project code version and PIPELINE_SOURCES.
+
+    Args:
+        project_root: Project whose sources code context is extracted from.
+            Defaults to the repository containing this module.
+
+    Returns:
+        Version string, or None if the project code version is unknown
+    """
+    code_version = project_code_version(project_root or _MODULE_DIR.parent)
+    if code_version is None:
+        return None
+    return f"{code_version}:{source_fingerprint(PIPELINE_SOURCES)}"
+
+
+class PhaseManifest:
+    """
+    Phase keys, output hashes and results recorded in <output_dir>/phase_manifest.json.
+
+    Memoization is disabled (every phase runs) when the project code version is
+    unknown, since outputs could then silently go stale.
+    """
+
+    def __init__(self, output_dir: Path, code_version: Optional[str] = None):
+        """
+        Args:
+            output_dir: Directory holding the phase outputs and the manifest
+            code_version: Version from pipeline_code_version(), computed here if None
+        """
+        self.path = Path(output_dir) / PHASE_MANIFEST_FILE
+        self.phases: Dict[str, Dict[str, Any]] = {}
+
+        self._code_version = code_version or pipeline_code_version()
+        self.enabled = self._code_version is not None
+        if not self.enabled:
+            logger.warning("⚠️ Phase memoization disabled: project code version is unknown")
+            return
+
+        try:
+            with open(self.path, 'r') as f:
+                manifest = json.load(f)
+            if manifest.get('format_version') == MANIFEST_FORMAT_VERSION:
+                self.phases = manifest['phases']
+        except FileNotFoundError:
+            pass
+        except (json.JSONDecodeError, KeyError) as e:
+            # A damaged manifest is only a lost optimization - phases re-run and rewrite it
+            logger.warning(f"⚠️ Ignoring unreadable phase manifest {self.path}: {e}")
+
+    def phase_key(self, phase: str, inputs: Iterable[Path], options: Dict[str, Any]) -> Optional[str]:
+        """
+        Key identifying a phase run: its input contents, the code version and its options.
+
+        Args:
+            phase: Phase name
+            inputs: Input files (paths are part of the key as well as contents)
+            options: JSON-serializable phase options that affect the outputs
+
+        Returns:
+            Hex key, or None if memoization is disabled
+        """
+        if not self.enabled:
+            return None
+        digest = hashlib.sha256()
+        digest.update(f"{MANIFEST_FORMAT_VERSION}:{phase}:{self._code_version}\0".encode())
+        for path in inputs:
+            digest.update(f"{path}\0{file_sha256(Path(path))}\0".encode())
+        digest.update(json.dumps(options, sort_keys=True, default=str).encode())
+        return digest.hexdigest()
+
+    def reusable_result(self, phase: str, key: Optional[str]) -> Optional[Dict[str, Any]]:
+        """
+        Recorded result of a phase if it ran with this key and its outputs are unchanged.
+
+        Returns:
+            The result passed to record(), or None if the phase has to run
+        """
+        entry = self.phases.get(phase)
+        if key is None or not entry or entry.get('key') != key:
+            return None
+        for output, sha256 in entry['outputs'].items():
+            output_path = Path(output)
+            if not output_path.is_file() or file_sha256(output_path) != sha256:
+                logger.info(f"Phase '{phase}' output changed since it was recorded: {output}")
+                return None
+        return entry['result']
+
+    def record(self, phase: str, key: Optional[str], outputs: Iterable[Path], result: Dict[str, Any]):
+        """
+        Record a successful phase run and save the manifest (atomically).
+
+        Args:
+            phase: Phase name
+            key: Key from phase_key() (nothing is recorded when None)
+            outputs: Output files to verify before the result is reused
+            result: JSON-serializable phase result returned on reuse
+        """
+        if key is None:
+            return
+        self.phases[phase] = {
+            'key': key,
+            'outputs': {str(path): file_sha256(Path(path)) for path in outputs},
+            'result': result,
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump({'format_version': MANIFEST_FORMAT_VERSION, 'phases': self.phases}, f, indent=2)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            Path(temp_path).unlink(missing_ok=True)
+            raise
@@ -4,20 +4,35 @@ from pathlib import Path
 import argparse
 import logging
 import subprocess
-from typing import Any, Dict, List, Optional
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 from datetime import datetime
 
+from augmentation_view import (augmentation_record_count, augmentation_view_path, iter_augmented_examples,
+                               iter_dataset_examples, write_augmentation_view)
 from config_manager import OLMoSecurityConfig
+from dataset_split import HASH_SPLIT_SEED, SPLIT_MODES, TEST, TRAIN, VALIDATION, iter_hash_split
+from near_duplicate_index import LEAKAGE_SIMILARITY_THRESHOLD, dataset_index, find_near_duplicates
+from parse_cache import ParseCache
+from phase_manifest import PhaseManifest, pipeline_code_version
+from parsed_vulnerabilities_io import (PARSED_OUTPUT_FORMATS, ParsedVulnerabilitiesWriter, blob_table_path,
+                                       iter_parsed_vulnerabilities)
+from training_dataset_io import ShuffledJsonlWriter
+from training_pair_renderer import render_training_pairs
 from parsers.sarif_trivy_parser import parse_trivy_sarif
 from parsers.sarif_checkov_parser import parse_checkov_sarif
 from parsers.semgrep_parser import parse_semgrep_json
 from parsers.osv_parser import parse_osv_json_enhanced
 from parsers.zap_parser import parse_zap_json
+from parsers.parse_session import ParseSession
 import random
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Data augmentation settings (read by the Construct Datasets phase)
+AUGMENTATION_CONFIG_FILE = Path(__file__).parent.parent / "config" / "olmo-security-config.yaml"
+
 # Phase constants to avoid string repetition and typos
 class Phases:
     PARSING = "parsing"
@@ -71,11 +86,61 @@ def find_security_files(directory: str) -> dict:
             logger.info(f"  - {scan_type}: {len(files)} file(s)")
     return scan_files
 
-def parse_vulnerabilities_phase(artifacts_dir: str, output_dir: Path) -> Path:
+# Parser for each scan type returned by find_security_files
+PARSER_MAP = {
+    'trivy': parse_trivy_sarif,
+    'checkov': parse_checkov_sarif,
+    'semgrep': parse_semgrep_json,
+    'osv': parse_osv_json_enhanced,
+    'zap': parse_zap_json,
+}
+
+# ParseSession of the current worker process (set by _init_parse_worker)
+_worker_parse_session: Optional[ParseSession] = None
+
+def _init_parse_worker(fix_cache_file: Optional[Path] = None, coalesce_dependencies: bool = False):
+    """Process pool initializer: one ParseSession per worker, reused for every file it parses."""
+    global _worker_parse_session
+    _worker_parse_session = ParseSession(fix_cache_file=fix_cache_file, coalesce_dependencies=coalesce_dependencies)
+
+def _parse_security_file(scan_type: str, file_path: str,
+                         session: Optional[ParseSession] = None) -> List[Dict[str, Any]]:
+    """
+    Parse a single security scan file with the parser for its scan type.
+
+    Module-level so it can be dispatched to worker processes, which fall back
+    to their own worker session when none is passed.
+    """
+    return PARSER_MAP[scan_type](file_path, session=session or _worker_parse_session)
+
+def parse_vulnerabilities_phase(artifacts_dir: str, output_dir: Path, parse_workers: int = 1,
+                                use_parse_cache: bool = True, output_format: str = 'json',
+                                dedupe_code_context: bool = False, coalesce_dependencies: bool = False,
+                                force: bool = False, code_version: Optional[str] = None) -> Path:
     """
     PHASE 1:
     - Parses various security scan files to extract vulnerabilities.
-    - Saves the list to a single JSON file.
+    - Saves them to a single JSON (or JSONL) file, written incrementally.
+
+    Args:
+        artifacts_dir: Directory containing security scan artifacts
+        output_dir: Directory to save the parsed vulnerabilities file
+        parse_workers: Number of worker processes used to parse files (1 = serial).
+            Results are always merged in the same order as a serial run.
+        use_parse_cache: Reuse findings of previously parsed, byte-identical scan files
+            (see parse_cache.ParseCache) and store newly parsed ones. Also persists
+            memoized fix generation results across runs.
+        output_format: 'json' (parsed_vulnerabilities.json, indented array) or
+            'jsonl' (parsed_vulnerabilities.jsonl, one finding per line)
+        dedupe_code_context: Store each distinct code context text once in
+            parsed_vulnerabilities.blobs.json, referenced from the findings
+        coalesce_dependencies: Replace the OSV/Trivy findings of a report for the same package
+            version with one finding carrying the minimal upgrade that fixes all of them (see
+            dependency_coalescer), before fix generation. Findings keep their order.
+        force: Parse even if the phase manifest shows the same scan files, code and
+            options already produced the existing output (see phase_manifest)
+        code_version: Pipeline code version for the phase manifest (see
+            phase_manifest.pipeline_code_version), computed if None
     """
     logger.info("🚀 Starting Phase 1: Parse Vulnerabilities")
 
@@ -88,42 +153,98 @@ def parse_vulnerabilities_phase(artifacts_dir: str, output_dir: Path) -> Path:
 
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    all_vulnerabilities = []
-    parser_map = {
-        'trivy': parse_trivy_sarif,
-        'checkov': parse_checkov_sarif,
-        'semgrep': parse_semgrep_json,
-        'osv': parse_osv_json_enhanced,
-        'zap': parse_zap_json,
-    }
-
-    # Step 1: Parse vulnerabilities from all files
+    # Step 1: Collect parse jobs in deterministic (scan type, file) order
+    parse_jobs = []
     for scan_type, files in scan_files.items():
         if not files:
             continue
         logger.info(f"Determing parser for scan type: {scan_type}")
-        parser_func = parser_map.get(scan_type)
-        if not parser_func:
+        if scan_type not in PARSER_MAP:
             continue
         logger.info(f"Parsing {len(files)} files for scan type: {scan_type}")
-        for file_path in files:
-            try:
-                vulns = parser_func(file_path)
-                if vulns:
-                    all_vulnerabilities.extend(vulns)
-            except Exception as e:
-                raise RuntimeError(f"Error parsing {file_path} with {scan_type} parser: {e}")
-
-    logger.info(f"Parsed a total of {len(all_vulnerabilities)} vulnerabilities.")
-
-    output_file = output_dir / "parsed_vulnerabilities.json"
-    with open(output_file, 'w') as f:
-        json.dump(all_vulnerabilities, f, indent=2)
-
-    logger.info(f"✅ Parse vulnerabilities phase complete. Output saved to: {output_file}")
-    return output_file
-
-def construct_datasets_phase(parsed_vulns_file: Path, output_dir: Path) -> tuple[Path, Path, Path]:
+        parse_jobs.extend((scan_type, file_path) for file_path in files)
+
+    # Reuse the previous output if nothing it depends on changed
+    manifest = PhaseManifest(output_dir, code_version)
+    phase_key = manifest.phase_key(Phases.PARSING, [file_path for _, file_path in parse_jobs], {
+        'scan_types': [scan_type for scan_type, _ in parse_jobs],
+        'output_format': output_format,
+        'dedupe_code_context': dedupe_code_context,
+        'coalesce_dependencies': coalesce_dependencies,
+    })
+    previous = None if force else manifest.reusable_result(Phases.PARSING, phase_key)
+    if previous:
+        logger.info(f"♻️ Scan files, code and options unchanged - reusing {previous['parsed_vulnerabilities_file']}")
+        return Path(previous['parsed_vulnerabilities_file'])
+
+    # Step 2: Find files whose findings can be reused from the parse cache
+    cache_keys: List[Optional[str]] = [None] * len(parse_jobs)
+    config = OLMoSecurityConfig()
+    parse_cache = ParseCache(config.parse_cache_dir) if use_parse_cache else None
+    # Workers load persisted fix results but only the serial session saves them
+    fix_cache_file = config.fix_cache_file if use_parse_cache else None
+    if parse_cache and parse_cache.enabled:
+        cache_keys = [parse_cache.key_for(scan_type, file_path, coalesce_dependencies)
+                      for scan_type, file_path in parse_jobs]
+    pending = {index for index, key in enumerate(cache_keys) if not (key and parse_cache.contains(key))}
+    logger.info(f"Parse cache: {len(parse_jobs) - len(pending)} of {len(parse_jobs)} files unchanged")
+
+    # Step 3: Parse the remaining files (optionally in worker processes) and write
+    # findings in (scan type, file) order as soon as each file is done
+    executor = None
+    futures = {}
+    if parse_workers > 1 and len(pending) > 1:
+        workers = min(parse_workers, len(pending))
+        logger.info(f"Parsing {len(pending)} files with {workers} worker processes")
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_parse_worker,
+                                       initargs=(fix_cache_file, coalesce_dependencies))
+        futures = {index: executor.submit(_parse_security_file, *parse_jobs[index]) for index in sorted(pending)}
+
+    session = None
+    writer = ParsedVulnerabilitiesWriter(output_dir, output_format, dedupe_code_context=dedupe_code_context)
+    try:
+        with writer:
+            for index, (scan_type, file_path) in enumerate(parse_jobs):
+                vulns = parse_cache.get(cache_keys[index]) if index not in pending else None
+                if vulns is None:
+                    try:
+                        if index in futures:
+                            vulns = futures[index].result()
+                        else:
+                            # One session for the whole run so helper caches carry across files
+                            session = session or ParseSession(fix_cache_file=fix_cache_file,
+                                                              coalesce_dependencies=coalesce_dependencies)
+                            vulns = _parse_security_file(scan_type, file_path, session=session)
+                    except Exception as e:
+                        raise RuntimeError(f"Error parsing {file_path} with {scan_type} parser: {e}") from e
+                    if cache_keys[index]:
+                        parse_cache.put(cache_keys[index], vulns)
+                writer.write_many(vulns)
+    except BaseException:
+        # FAIL FAST - never leave a partial output behind for the next phase
+        writer.discard()
+        raise
+    finally:
+        if executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    if session:
+        fix_cache_stats = session.fix_generator.get_fix_cache_stats()
+        logger.info(f"Fix cache: {fix_cache_stats['hits']} hits, {fix_cache_stats['misses']} misses "
+                    f"({fix_cache_stats['hit_rate']:.0%} hit rate)")
+        session.fix_generator.save_fix_cache()
+
+    outputs = [writer.path, writer.blob_path] if dedupe_code_context else [writer.path]
+    manifest.record(Phases.PARSING, phase_key, outputs, {'parsed_vulnerabilities_file': str(writer.path)})
+
+    logger.info(f"Parsed a total of {writer.count} vulnerabilities.")
+    logger.info(f"✅ Parse vulnerabilities phase complete. Output saved to: {writer.path}")
+    return writer.path
+
+def construct_datasets_phase(parsed_vulns_file: Path, output_dir: Path,
+                             split_mode: str = 'stratified', render_workers: int = 1,
+                             augmentation_workers: Optional[int] = None, augmentation_view: bool = False,
+                             force: bool = False, code_version: Optional[str] = None) -> tuple[Path, Path, Path]:
     """
     PHASE: Construct Datasets
     - Loads public datasets (CVEfixes)
@@ -131,17 +252,70 @@ def construct_datasets_phase(parsed_vulns_file: Path, output_dir: Path) -> tuple
     - Applies data augmentation (semantic variations, self-mixup, context blending)
     - Processes narratives into training pairs
     - Combines and splits into train/validation/test sets (80/10/10)
+
+    Stages are chained as generators (read → prompt render → split → augment → write).
+    Only the original examples are held in memory, for the stratified split and as
+    the augmentation source; augmented examples are spilled to disk as they are
+    generated and shuffled there (see training_dataset_io.ShuffledJsonlWriter).
+
+    Args:
+        parsed_vulns_file: Parsed vulnerabilities (.json or .jsonl)
+        output_dir: Directory for the train/validation/test JSONL files
+        split_mode: 'stratified' (shuffle and slice per tool) or 'hash' (assign each
+            example by a stable hash in one streaming pass, see dataset_split; test
+            examples are written as they arrive)
+        render_workers: Number of worker processes rendering prompts for the specific
+            fixes (1 = serial; output is identical either way)
+        augmentation_workers: None to augment serially from the global random state, or the
+            number of worker processes for sharded, per-shard seeded augmentation (output is
+            identical for any worker count, see dataset_augmentor)
+        augmentation_view: Write only the original train/validation examples, plus an
+            augmentation view per file (one small record per augmented example, see
+            augmentation_view) from which the augmented examples are regenerated when
+            the datasets are streamed to Stage 2 mixing, the trainer or the uploader
+        force: Rebuild even if the phase manifest shows the same parsed vulnerabilities,
+            augmentation config, code and options already produced the existing datasets.
+            A reused run also restores the global random state the phase left behind, so
+            later Stage 2 sampling is unaffected by the skip.
+        code_version: Pipeline code version for the phase manifest (see
+            phase_manifest.pipeline_code_version), computed if None
     """
     logger.info("🚀 Starting Phase: Construct Datasets")
 
+    if split_mode not in SPLIT_MODES:
+        raise ValueError(f"Unsupported split mode: {split_mode} (expected one of {', '.join(SPLIT_MODES)})")
+
+    if augmentation_view and augmentation_workers is not None:
+        raise ValueError("Augmentation views are generated serially; they cannot be combined with augmentation workers")
+
     if not parsed_vulns_file.exists():
         raise FileNotFoundError(f"Parsed vulnerabilities file not found: {parsed_vulns_file}")
 
-    # Load parsed vulnerabilities
-    with open(parsed_vulns_file, 'r') as f:
-        parsed_vulns = json.load(f)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    train_file = output_dir / "train_dataset.jsonl"
+    val_file = output_dir / "validation_dataset.jsonl"
+    test_file = output_dir / "test_dataset.jsonl"
 
-    logger.info(f"Loaded {len(parsed_vulns)} parsed vulnerabilities")
+    # Reuse the previous datasets if nothing they depend on changed
+    manifest = PhaseManifest(output_dir, code_version)
+    phase_inputs = [parsed_vulns_file, AUGMENTATION_CONFIG_FILE]
+    if blob_table_path(parsed_vulns_file).exists():
+        phase_inputs.append(blob_table_path(parsed_vulns_file))
+    phase_key = manifest.phase_key(Phases.DATASETS, phase_inputs, {
+        'split_mode': split_mode,
+        'sharded_augmentation': augmentation_workers is not None,
+        'augmentation_view': augmentation_view,
+    })
+    previous = None if force else manifest.reusable_result(Phases.DATASETS, phase_key)
+    if previous:
+        logger.info(f"♻️ Parsed vulnerabilities, code and options unchanged - reusing datasets in {output_dir}")
+        version, internal_state, gauss_next = previous['random_state']
+        random.setstate((version, tuple(internal_state), gauss_next))
+        return train_file, val_file, test_file
+
+    # Parsed vulnerabilities (.json or .jsonl) are read lazily while generating fixes
+    logger.info(f"Reading parsed vulnerabilities from {parsed_vulns_file}")
+    parsed_vulns = iter_parsed_vulnerabilities(parsed_vulns_file)
 
     all_training_pairs = []
 
@@ -154,54 +328,77 @@ def construct_datasets_phase(parsed_vulns_file: Path, output_dir: Path) -> tuple
 
     # SOURCE 2: Generate Specific Fixes
     logger.info("🔧 Source 2: Generating specific fixes...")
-    specific_fixes = _generate_specific_fixes(parsed_vulns)
-    logger.info(f"   Generated {len(specific_fixes)} specific fix examples")
+    # Only the hash split keys examples on their location; stratified datasets keep their schema
+    specific_fixes = render_training_pairs(parsed_vulns, workers=render_workers,
+                                           include_location=split_mode == 'hash')
 
     # CRITICAL: Split BEFORE augmentation to keep test set pure (ground truth)
     # Test set must contain only original examples for valid evaluation
-    # Using stratified split to ensure consistent test set across runs
-    logger.info("📊 Splitting original examples with stratified sampling by tool...")
-    original_train, original_val, test_pairs = _stratified_split_by_tool(specific_fixes)
+    if split_mode == 'hash':
+        logger.info("📊 Splitting original examples by stable hash (not stratified; counted per tool)...")
+        original_train, original_val, test_count = _hash_split_to_test_file(specific_fixes, test_file, 'tool')
+        # Augmentation and shuffling draw from the global random state
+        random.seed(HASH_SPLIT_SEED)
+    else:
+        # Using stratified split to ensure consistent test set across runs
+        specific_fixes = list(specific_fixes)
+        logger.info(f"   Generated {len(specific_fixes)} specific fix examples")
+        logger.info("📊 Splitting original examples with stratified sampling by tool...")
+        original_train, original_val, test_pairs = _stratified_split_by_tool(specific_fixes)
+        del specific_fixes
+        _save_jsonl(test_pairs, test_file)
+        test_count = len(test_pairs)
 
-    logger.info(f"   Final split: {len(original_train)} train / {len(original_val)} val / {len(test_pairs)} test")
+    logger.info(f"   Final split: {len(original_train)} train / {len(original_val)} val / {test_count} test")
 
     # SOURCE 3: Data Augmentation (ONLY for train/val sets)
     # Test set remains pure original examples for valid evaluation
     logger.info("🎨 Source 3: Applying data augmentation to train/val sets...")
-    augmented_train = _augment_training_pairs(original_train)
-    augmented_val = _augment_training_pairs(original_val)
-    logger.info(f"   Augmented: +{len(augmented_train)} train examples, +{len(augmented_val)} val examples")
-
-    # Combine original + augmented for train/val
-    train_pairs = original_train + augmented_train
-    val_pairs = original_val + augmented_val
-
-    # Shuffle each set independently
-    random.shuffle(train_pairs)
-    random.shuffle(val_pairs)
-
+    # A view left by an earlier run must not be paired with these datasets
+    for dataset_file in (train_file, val_file):
+        augmentation_view_path(dataset_file).unlink(missing_ok=True)
+
+    if augmentation_view:
+        # Train/val = shuffled originals; augmented examples are recorded in their views
+        augmentor = _create_augmentor()
+        for originals, dataset_file in ((original_train, train_file), (original_val, val_file)):
+            random.shuffle(originals)
+            _save_jsonl(originals, dataset_file)
+        augmented_train_count = write_augmentation_view(train_file, augmentor,
+                                                        augmentor.iter_augmentation_records(original_train))
+        augmented_val_count = write_augmentation_view(val_file, augmentor,
+                                                      augmentor.iter_augmentation_records(original_val))
+        logger.info(f"   Augmented (view): +{augmented_train_count} train examples, +{augmented_val_count} val examples")
+    else:
+        # Train/val = original + augmented, each shuffled independently when its writer closes
+        with ShuffledJsonlWriter(train_file) as train_writer, ShuffledJsonlWriter(val_file) as val_writer:
+            train_writer.write_many(original_train)
+            train_writer.write_many(_iter_augmented_training_pairs(original_train, augmentation_workers))
+            val_writer.write_many(original_val)
+            val_writer.write_many(_iter_augmented_training_pairs(original_val, augmentation_workers))
+
+            augmented_train_count = train_writer.count - len(original_train)
+            augmented_val_count = val_writer.count - len(original_val)
+            logger.info(f"   Augmented: +{augmented_train_count} train examples, +{augmented_val_count} val examples")
+
+            # Shuffle train before val (writers shuffle on close)
+            train_writer.close()
+            val_writer.close()
+
+    train_count = len(original_train) + augmented_train_count
+    val_count = len(original_val) + augmented_val_count
     logger.info(f"📊 Final dataset sizes:")
-    logger.info(f"   Train set: {len(train_pairs)} examples ({len(original_train)} original + {len(augmented_train)} augmented)")
-    logger.info(f"   Validation set: {len(val_pairs)} examples ({len(original_val)} original + {len(augmented_val)} augmented)")
-    logger.info(f"   Test set: {len(test_pairs)} examples (100% original, no augmentation)")
-
-    # Save as JSONL
-    output_dir.mkdir(parents=True, exist_ok=True)
-    train_file = output_dir / "train_dataset.jsonl"
-    val_file = output_dir / "validation_dataset.jsonl"
-    test_file = output_dir / "test_dataset.jsonl"
+    logger.info(f"   Train set: {train_count} examples ({len(original_train)} original + {augmented_train_count} augmented)")
+    logger.info(f"   Validation set: {val_count} examples ({len(original_val)} original + {augmented_val_count} augmented)")
+    logger.info(f"   Test set: {test_count} examples (100% original, no augmentation)")
 
-    with open(train_file, 'w') as f:
-        for pair in train_pairs:
-            f.write(json.dumps(pair) + '\n')
+    logger.info("🔍 Checking train/validation sets for near-duplicates of test examples...")
+    _check_split_leakage(test_file, train_file, val_file)
 
-    with open(val_file, 'w') as f:
-        for pair in val_pairs:
-            f.write(json.dumps(pair) + '\n')
-
-    with open(test_file, 'w') as f:
-        for pair in test_pairs:
-            f.write(json.dumps(pair) + '\n')
+    outputs = [train_file, val_file, test_file]
+    if augmentation_view:
+        outputs += [augmentation_view_path(train_file), augmentation_view_path(val_file)]
+    manifest.record(Phases.DATASETS, phase_key, outputs, {'random_state': random.getstate()})
 
     logger.info(f"✅ Phase complete.")
     logger.info(f"   Train dataset: {train_file}")
@@ -285,358 +482,105 @@ def _stratified_split_by_tool(training_pairs: List[Dict[str, Any]], random_seed:
     return train_pairs, val_pairs, test_pairs
 
 
-def _create_system_prompt(category: str) -> str:
+def _hash_split_to_test_file(training_pairs: Iterable[Dict[str, Any]], test_file: Path,
+                             group_by: str) -> tuple[List[Dict], List[Dict], int]:
     """
-    Create tool-specific system prompt based on security category.
+    Split training pairs by stable hash (see dataset_split), streaming test pairs straight to test_file.
 
     Args:
-        category: Security category (dependency_vulnerabilities, code_vulnerability, etc.)
+        training_pairs: Training examples (consumed once)
+        test_file: JSONL file receiving the test examples, in input order
+        group_by: Metadata field grouping examples in the split counts ('tool' or 'source')
 
     Returns:
-        Specialized system prompt optimized for the category
+        Tuple of (train_pairs, val_pairs, test_count)
     """
-    if category in ['dependency_vulnerabilities', 'dependency_security']:
-        return """You are a dependency security specialist.
-
-EXPERTISE: Version constraints, semver, Gradle/Maven/npm dependency management
-
-TASK: Provide precise dependency upgrade instructions
-- Specify exact versions (no ranges)
-- Use correct build syntax (Gradle Kotlin DSL, package.json)
-- Include security rationale
-
-OUTPUT: implementation("group:artifact:VERSION")"""
-
-    elif category == 'code_vulnerability':
-        return """You are a secure code specialist.
-
-EXPERTISE: OWASP patterns, Kotlin/Java security APIs, WebAuthn
-
-TASK: Provide minimal code fixes that eliminate vulnerabilities
-- Preserve functionality
-- Use appropriate security libraries
-- Include security comments
-
-OUTPUT: Fixed code block with brief explanation"""
-
-    elif category == 'web_security':
-        return """You are a web security specialist.
-
-EXPERTISE: HTTP security headers, CORS, session security, KTor framework
-
-TASK: Provide framework-native security configurations
-- Use KTor install() syntax
-- Follow strict security policies
-
-OUTPUT: KTor configuration code"""
-
-    elif category == 'configuration_security':
-        return """You are a DevOps security specialist.
-
-EXPERTISE: GitHub Actions, IaC security, least-privilege permissions
-
-TASK: Provide minimal security configuration fixes
-- Use platform-specific syntax (YAML, HCL)
-- Preserve functionality
-
-OUTPUT: Corrected configuration"""
-
-    else:
-        # Fallback for unknown categories
-        return """You are a cybersecurity analyst specializing in WebAuthn and FIDO2 security vulnerabilities.
-
-CRITICAL SECURITY GUIDELINES:
-- Always prioritize security in your analysis and recommendations
-- Provide actionable remediation steps for identified vulnerabilities
-- Consider the broader security implications of each finding
-- Maintain accuracy and precision in threat assessments
-- Follow responsible disclosure principles
-- Preserve safety guidelines and ethical analysis standards
-
-Your role is to analyze security vulnerabilities and provide comprehensive, actionable guidance for remediation."""
-
-
-def _create_vulnerability_prompt(vuln: Dict) -> str:
-    """
-    Create tool-specific user prompt based on vulnerability data.
-
-    Args:
-        vuln: Vulnerability dictionary with tool, security_category, and vulnerability details
-
-    Returns:
-        Formatted user prompt for the training pair
-    """
-    tool = vuln.get('tool', '')
-    category = vuln.get('security_category', 'unknown')
-
-    # Dependency vulnerabilities (OSV, Trivy)
-    if category in ['dependency_vulnerabilities', 'dependency_security']:
-        current_version = vuln.get('installed_version')
-        if not current_version:
-            raise ValueError(f"Installed version information missing in vulnerability data: ${vuln}")
-        fixed_version = vuln.get('fixed_version')
-        if not fixed_version:
-            raise ValueError(f"Fixed version information missing in vulnerability data: ${vuln}")
-        package = vuln.get('package_name', vuln.get('title', 'Unknown'))
-        return f"""Vulnerability: {vuln.get('id', 'Unknown')}
-Severity: {vuln.get('severity', 'Unknown')}
-Tool: {tool}
-Package: {package}
-Current Version: {current_version}
-Fixed Version: {fixed_version}
-Description: {vuln.get('summary', vuln.get('description', vuln.get('message', 'No description')))}
-
-STRICT CONSTRAINTS:
-- Do NOT add sections beyond what's specified above
-- Do NOT include "Alternative Approaches" or similar sections
-- Code blocks: ONLY the fix, no surrounding context
-- Explanations: EXACTLY 2-3 sentences, no more
-- Follow the markdown format exactly as shown"""
-
-    # Code vulnerabilities (Semgrep)
-    elif category == 'code_vulnerability':
-        code_context = vuln.get('code_context', {})
-        vulnerable_code = code_context.get('vulnerable_code', 'N/A')
-
-        return f"""Vulnerability: {vuln.get('id', 'Unknown')}
-Severity: {vuln.get('severity', 'Unknown')}
-Tool: {tool}
-File: {vuln.get('file_path', 'Unknown')}
-Line: {vuln.get('start', {}).get('line', 'Unknown')}
-Message: {vuln.get('message', 'No description')}
-
-Vulnerable Code:
-{vulnerable_code}
-
-STRICT CONSTRAINTS:
-- Do NOT add sections beyond what's specified above
-- Do NOT include "Alternative Approaches" or similar sections
-- Code blocks: ONLY the fix, no surrounding context
-- Explanations: EXACTLY 2-3 sentences, no more
-- Follow the markdown format exactly as shown"""
-
-    # Web/HTTP security (ZAP)
-    elif category == 'web_security':
-        return f"""Alert: {vuln.get('alert', 'Unknown')}
-Severity: {vuln.get('severity', 'Unknown')}
-Tool: {tool}
-URL: {vuln.get('uri', 'Unknown')}
-Description: {vuln.get('description', 'No description')}
-Solution: {vuln.get('solution', 'No solution provided')}
-
-STRICT CONSTRAINTS:
-- Do NOT add sections beyond what's specified above
-- Do NOT include "Alternative Approaches" or similar sections
-- Code blocks: ONLY the fix, no surrounding context
-- Explanations: EXACTLY 2-3 sentences, no more
-- Follow the markdown format exactly as shown"""
-
-    # Configuration security (Checkov)
-    elif category == 'configuration_security':
-        code_context = vuln.get('code_context', {})
-        vulnerable_code = code_context.get('vulnerable_code', 'N/A')
-        config_type = vuln.get('config_type', 'Unknown')
-
-        return f"""Rule: {vuln.get('rule_name', vuln.get('id', 'Unknown'))}
-Severity: {vuln.get('severity', 'Unknown')}
-Tool: {tool}
-File: {vuln.get('file_path', 'Unknown')}
-Config Type: {config_type}
-Message: {vuln.get('message', 'No description')}
-
-Current Configuration:
-{vulnerable_code}
-
-STRICT CONSTRAINTS:
-- Do NOT add sections beyond what's specified above
-- Do NOT include "Alternative Approaches" or similar sections
-- Code blocks: ONLY the fix, no surrounding context
-- Explanations: EXACTLY 2-3 sentences, no more
-- Follow the markdown format exactly as shown"""
-
-    # Fallback for unknown categories
-    else:
-        return f"""Fix the following security issue:
-
-ID: {vuln.get('id', 'Unknown')}
-Severity: {vuln.get('severity', 'Unknown')}
-Tool: {tool}
-Category: {category}
-Description: {vuln.get('message', vuln.get('description', 'No description'))}"""
-
-
-def _format_assistant_response(fix_data: Dict) -> str:
-    """
-    Format the fix data into a comprehensive assistant response.
-
-    Args:
-        fix_data: Fix dictionary with description, fixed_code, explanation, and alternatives
-
-    Returns:
-        Formatted assistant response for the training pair
-    """
-    description = fix_data.get('description', '')
-    fixed_code = fix_data.get('fixed_code', '')
-    explanation = fix_data.get('explanation', '')
-    alternatives = fix_data.get('alternatives', [])
-
-    # Build comprehensive response
-    response_parts = []
-
-    # Primary fix
-    if description:
-        response_parts.append(f"## Fix: {description}\n")
-
-    if fixed_code:
-        response_parts.append(f"```\n{fixed_code}\n```\n")
-
-    if explanation:
-        response_parts.append(f"### Explanation\n{explanation}\n")
-
-    # Alternative approaches
-    if alternatives:
-        response_parts.append("### Alternative Approaches\n")
-        for i, alt in enumerate(alternatives, 1):
-            alt_desc = alt.get('description', '')
-            alt_code = alt.get('fixed_code', '')
-            alt_exp = alt.get('explanation', '')
-
-            if alt_desc:
-                response_parts.append(f"\n**Alternative {i}: {alt_desc}**\n")
-            if alt_code:
-                response_parts.append(f"```\n{alt_code}\n```\n")
-            if alt_exp:
-                response_parts.append(f"{alt_exp}\n")
+    train_pairs = []
+    val_pairs = []
+    test_count = 0
+    counts: Dict[str, Dict[str, int]] = {}
 
-    return '\n'.join(response_parts).strip()
+    test_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(test_file, 'w') as f:
+        for split, pair in iter_hash_split(training_pairs, group_by, counts=counts):
+            if split == TRAIN:
+                train_pairs.append(pair)
+            elif split == VALIDATION:
+                val_pairs.append(pair)
+            else:
+                f.write(json.dumps(pair) + '\n')
+                test_count += 1
 
+    logger.info(f"📊 Hash split sizes per {group_by}:")
+    for group, group_counts in counts.items():
+        logger.info(f"   {group}: {sum(group_counts.values())} total → {group_counts[TRAIN]} train / "
+                    f"{group_counts[VALIDATION]} val / {group_counts[TEST]} test")
 
-def _generate_specific_fixes(parsed_vulns: List[Dict]) -> List[Dict[str, Any]]:
-    """
-    Generate training pairs from parsed vulnerabilities with pre-generated fixes.
+    return train_pairs, val_pairs, test_count
 
-    Uses the enhanced parsing architecture where all tools (OSV, Trivy, Semgrep, ZAP, Checkov)
-    generate fixes during parsing. This function creates tool-specific prompts and formats
-    the pre-generated fixes into MLX-compatible training pairs.
 
-    Args:
-        parsed_vulns: List of flat vulnerability dictionaries with 'fix' field containing:
-            - description: Fix description
-            - fixed_code: The fixed code/configuration
-            - explanation: Detailed explanation
-            - alternatives: List of alternative fixes (optional)
-
-    Returns:
-        List of training pairs in MLX-compatible chat format:
-        {
-            "messages": [
-                {"role": "system", "content": "..."},
-                {"role": "user", "content": "..."},
-                {"role": "assistant", "content": "..."}
-            ],
-            "metadata": {
-                "quality": "high",
-                "source": "generated",
-                "vulnerability_id": "...",
-                "tool": "osv|trivy|semgrep|zap|checkov",
-                "security_category": "...",
-                "confidence": 0.0-1.0,
-                ...
-            }
-        }
+def _iter_augmented_training_pairs(training_pairs: List[Dict[str, Any]],
+                                   workers: Optional[int] = None) -> Iterator[Dict[str, Any]]:
     """
-    specific_fixes = []
-
-    for vuln in parsed_vulns:
-        # Vulnerabilities are now flat objects with pre-generated fixes
-        tool = vuln.get('tool')
-        vuln_id = vuln.get('id')
-        fix_data = vuln.get('fix')
-
-        if not vuln_id:
-            logger.error(f"Missing vulnerability ID in entry: {vuln}")
-            raise ValueError("Each vulnerability must have an 'id' field")
-
-        if not tool:
-            logger.error(f"Missing tool information for vulnerability {vuln_id}")
-            raise ValueError(f"Missing tool information for vulnerability {vuln_id}")
-
-        if not fix_data:
-            logger.error(f"No fix data found for {vuln_id} from {tool}")
-            raise ValueError(f"Missing fix data for vulnerability {vuln_id} from {tool}")
-
-        try:
-            # Get security category for tool-specific prompt generation
-            security_category = vuln.get('security_category', 'unknown')
-
-            # Generate tool-specific system prompt based on category
-            system_content = _create_system_prompt(security_category)
-
-            # Generate tool-specific user prompt based on vulnerability category
-            user_content = _create_vulnerability_prompt(vuln)
-
-            # Use the pre-generated fix from parsing phase
-            # Primary fix has description, fixed_code, and explanation
-            assistant_content = _format_assistant_response(fix_data)
-
-            if assistant_content:
-                specific_fixes.append({
-                    "messages": [
-                        {"role": "system", "content": system_content},
-                        {"role": "user", "content": user_content},
-                        {"role": "assistant", "content": assistant_content}
-                    ],
-                    "metadata": {
-                        "quality": "high",
-                        "source": "generated",
-                        "vulnerability_id": vuln_id,
-                        "tool": tool,
-                        "security_category": vuln.get('security_category', 'unknown'),
-                        "confidence": fix_data.get('confidence', 0.7),
-                        "chat_template": "chatml",
-                        "security_framework": "webauthn-security-analysis"
-                    }
-                })
-        except Exception as e:
-            # FAIL FAST - don't suppress exceptions
-            logger.error(f"Could not generate training pair for {vuln_id}: {e}")
-            raise RuntimeError(f"Error generating training pair for vulnerability {vuln_id}: {e}")
-
-    return specific_fixes
-
-
-def _augment_training_pairs(training_pairs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """
-    Augment training pairs using research-backed data augmentation techniques.
+    Augment training pairs using research-backed data augmentation techniques, one example at a time.
 
     Applies semantic variations, self-mixup, and context blending to increase
     dataset diversity and improve model generalization on small datasets.
 
     Args:
         training_pairs: Original training pairs in ChatML format
+        workers: None for serial augmentation, or worker processes for sharded augmentation
 
-    Returns:
-        List of augmented training pairs (target: 3x original count)
+    Yields:
+        Augmented training pairs (target: 3x original count)
     """
+    augmentor = _create_augmentor()
+
+    # Generate augmented examples
+    yield from augmentor.iter_augmented_training_data(training_pairs, workers=workers)
+
+
+def _create_augmentor():
+    """SecurityDataAugmentor configured from the augmentation section of the YAML config."""
     from dataset_augmentor import SecurityDataAugmentor, AugmentationConfig
     import yaml
 
     # Load augmentation config from YAML
-    config = OLMoSecurityConfig()
-    config_file = Path(__file__).parent.parent / "config" / "olmo-security-config.yaml"
-
-    with open(config_file, 'r') as f:
+    with open(AUGMENTATION_CONFIG_FILE, 'r') as f:
         raw_config = yaml.safe_load(f)
 
     aug_config = AugmentationConfig.from_config(raw_config)
 
     # Initialize augmentor
-    augmentor = SecurityDataAugmentor(aug_config)
+    return SecurityDataAugmentor(aug_config)
 
-    # Generate augmented examples
-    augmented_pairs = augmentor.augment_training_data(training_pairs)
+def _check_split_leakage(test_file: Path, *dataset_files: Path) -> int:
+    """
+    Warn about training/validation examples that are near-duplicates of test examples.
+
+    Args:
+        test_file: Test dataset
+        dataset_files: Training and validation datasets to check against it
+
+    Returns:
+        Number of near-duplicate examples found
+    """
+    # The test set is indexed once and every dataset is checked against it
+    test_index = dataset_index(test_file, LEAKAGE_SIMILARITY_THRESHOLD)
+    total = 0
+    for dataset_file in dataset_files:
+        leaks = find_near_duplicates(dataset_file, test_index)
+        total += len(leaks)
+        if leaks:
+            logger.warning(f"⚠️ {len(leaks)} examples in {dataset_file.name} are near-duplicates of "
+                           f"test examples (estimated similarity >= {LEAKAGE_SIMILARITY_THRESHOLD})")
+            for position, test_position, similarity in leaks[:5]:
+                logger.warning(f"   {dataset_file.name} example {position} ~ {test_file.name} example "
+                               f"{test_position} ({similarity:.2f})")
+    if not total:
+        logger.info(f"   No near-duplicates of test examples found in {', '.join(f.name for f in dataset_files)}")
+    return total
 
-    return augmented_pairs
 
 def _analyze_datasets(train_file: Path, val_file: Path, test_file: Path) -> Dict[str, Any]:
     """
@@ -658,36 +602,43 @@ def _analyze_datasets(train_file: Path, val_file: Path, test_file: Path) -> Dict
         "source_distribution": {}
     }
 
-    # Analyze training dataset
+    def count_training_example(example: Dict[str, Any]):
+        stats["train_count"] += 1
+        metadata = example.get('metadata')
+        if not metadata:
+            raise ValueError("Missing metadata field in training example")
+
+        # Track quality
+        quality = metadata.get('quality')
+        if not quality:
+            raise ValueError("Missing quality field in metadata")
+        stats["quality_distribution"][quality] = stats["quality_distribution"].get(quality, 0) + 1
+
+        # Track source
+        source = metadata.get('source')
+        if not source:
+            raise ValueError("Missing source field in metadata")
+        stats["source_distribution"][source] = stats["source_distribution"].get(source, 0) + 1
+
+    # Analyze training dataset (including examples regenerated from its augmentation view)
     with open(train_file, 'r') as f:
         for line in f:
             if line.strip():
-                stats["train_count"] += 1
                 try:
                     example = json.loads(line)
-                    metadata = example.get('metadata')
-                    if not metadata:
-                        raise ValueError("Missing metadata field in training example")
-
-                    # Track quality
-                    quality = metadata.get('quality')
-                    if not quality:
-                        raise ValueError("Missing quality field in metadata")
-                    stats["quality_distribution"][quality] = stats["quality_distribution"].get(quality, 0) + 1
-
-                    # Track source
-                    source = metadata.get('source')
-                    if not source:
-                        raise ValueError("Missing source field in metadata")
-                    stats["source_distribution"][source] = stats["source_distribution"].get(source, 0) + 1
                 except json.JSONDecodeError:
+                    stats["train_count"] += 1
                     continue
+                count_training_example(example)
+    for example in iter_augmented_examples(train_file):
+        count_training_example(example)
 
     # Analyze validation dataset
     with open(val_file, 'r') as f:
         for line in f:
             if line.strip():
                 stats["val_count"] += 1
+    stats["val_count"] += augmentation_record_count(val_file)
 
     # Analyze test dataset if provided
     if test_file and test_file.exists():
@@ -830,7 +781,12 @@ def validate_phase_inputs(phase: str, args):
     if missing_inputs:
         raise ValueError(f"Error: --only-{phase} requires: {', '.join(missing_inputs)}")
 
-def run_sequential_pipeline(artifacts_dir: str, output_dir: Path, skip_upload: bool = False):
+def run_sequential_pipeline(artifacts_dir: str, output_dir: Path, skip_upload: bool = False,
+                            parse_workers: int = 1, use_parse_cache: bool = True,
+                            parsed_output_format: str = 'json', dedupe_code_context: bool = False,
+                            coalesce_dependencies: bool = False, split_mode: str = 'stratified',
+                            render_workers: int = 1, augmentation_workers: Optional[int] = None,
+                            augmentation_view: bool = False, force: bool = False):
     """
     Execute the 2-stage sequential fine-tuning pipeline.
 
@@ -849,6 +805,16 @@ def run_sequential_pipeline(artifacts_dir: str, output_dir: Path, skip_upload: b
         artifacts_dir: Directory containing WebAuthn security scan artifacts
         output_dir: Output directory for intermediate files
         skip_upload: If True, skip HuggingFace upload
+        parse_workers: Number of worker processes for the parsing phase
+        use_parse_cache: If False, re-parse every scan file instead of using the parse cache
+        parsed_output_format: Format of the parsed vulnerabilities file ('json' or 'jsonl')
+        dedupe_code_context: Store code context in a blob table next to the parsed vulnerabilities file
+        coalesce_dependencies: Emit one finding per vulnerable package version instead of one per advisory
+        split_mode: How both stages split train/validation/test: 'stratified' or 'hash' (see dataset_split)
+        render_workers: Number of worker processes rendering training prompts in the datasets phase
+        augmentation_workers: Worker processes for sharded augmentation in the datasets phase (None = serial)
+        augmentation_view: Store augmented Stage 2 examples as records, regenerated when streamed
+        force: Re-run the parsing and datasets phases even if their recorded outputs are current
     """
     logger.info("=" * 80)
     logger.info("🚀 SEQUENTIAL FINE-TUNING PIPELINE (2-STAGE)")
@@ -884,7 +850,10 @@ def run_sequential_pipeline(artifacts_dir: str, output_dir: Path, skip_upload: b
 
     # Split into train/validation/test (80/10/10)
     logger.info("📊 Splitting Stage 1 dataset...")
-    stage1_train, stage1_val, stage1_test = _stratified_split_by_source(stage1_examples)
+    if split_mode == 'hash':
+        stage1_train, stage1_val, stage1_test = _hash_split_by_source(stage1_examples)
+    else:
+        stage1_train, stage1_val, stage1_test = _stratified_split_by_source(stage1_examples)
 
     logger.info(f"   Train: {len(stage1_train)} examples")
     logger.info(f"   Validation: {len(stage1_val)} examples")
@@ -904,6 +873,9 @@ def run_sequential_pipeline(artifacts_dir: str, output_dir: Path, skip_upload: b
 
     logger.info(f"   Saved Stage 1 datasets to: {stage1_data_dir}")
 
+    logger.info("🔍 Checking Stage 1 train/validation sets for near-duplicates of test examples...")
+    stage1_leak_count = _check_split_leakage(stage1_test_file, stage1_train_file, stage1_val_file)
+
     # Train Stage 1
     logger.info("🎓 Training Stage 1 model...")
     trainer = MLXTrainer(config=config, output_dir=training_run.stage1_adapters_path)
@@ -929,6 +901,7 @@ def run_sequential_pipeline(artifacts_dir: str, output_dir: Path, skip_upload: b
         "train_count": len(stage1_train),
         "val_count": len(stage1_val),
         "test_count": len(stage1_test),
+        "test_near_duplicates": stage1_leak_count,
         "sources": ["crossvul", "cvefixes"]
     }
     training_run.save_manifest()
@@ -941,17 +914,27 @@ def run_sequential_pipeline(artifacts_dir: str, output_dir: Path, skip_upload: b
     logger.info("STAGE 2: WebAuthn Domain Specialization (15% Replay)")
     logger.info("=" * 80)
 
-    # Parse WebAuthn security tools
+    # Parse WebAuthn security tools (both phases share one code version for their manifests)
+    code_version = pipeline_code_version()
     logger.info("🔍 Parsing WebAuthn security tools...")
-    parsed_vulns_file = parse_vulnerabilities_phase(artifacts_dir, output_dir)
+    parsed_vulns_file = parse_vulnerabilities_phase(artifacts_dir, output_dir, parse_workers=parse_workers,
+                                                    use_parse_cache=use_parse_cache,
+                                                    output_format=parsed_output_format,
+                                                    dedupe_code_context=dedupe_code_context,
+                                                    coalesce_dependencies=coalesce_dependencies,
+                                                    force=force, code_version=code_version)
 
     # Construct WebAuthn-specific datasets
     logger.info("🛠️ Constructing WebAuthn datasets...")
-    stage2_train_base, stage2_val, stage2_test = construct_datasets_phase(parsed_vulns_file, output_dir)
+    stage2_train_base, stage2_val, stage2_test = construct_datasets_phase(parsed_vulns_file, output_dir,
+                                                                          split_mode=split_mode,
+                                                                          render_workers=render_workers,
+                                                                          augmentation_workers=augmentation_workers,
+                                                                          augmentation_view=augmentation_view,
+                                                                          force=force, code_version=code_version)
 
-    # Load Stage 2 base examples
-    with open(stage2_train_base, 'r') as f:
-        stage2_webauthn_examples = [json.loads(line) for line in f if line.strip()]
+    # Load Stage 2 base examples (regenerating augmented ones from an augmentation view)
+    stage2_webauthn_examples = list(iter_dataset_examples(stage2_train_base))
 
     logger.info(f"   WebAuthn examples: {len(stage2_webauthn_examples)}")
 
@@ -999,7 +982,7 @@ def run_sequential_pipeline(artifacts_dir: str, output_dir: Path, skip_upload: b
     # Update manifest with Stage 2 statistics
     training_run.manifest.stage2.dataset_stats = {
         "train_count": len(stage2_train_mixed),
-        "val_count": sum(1 for _ in open(stage2_val)),
+        "val_count": sum(1 for _ in open(stage2_val)) + augmentation_record_count(stage2_val),
         "test_count": sum(1 for _ in open(stage2_test)),
         "webauthn_examples": len(stage2_webauthn_examples),
         "stage1_replay_examples": len(stage1_replay),
@@ -1098,6 +1081,26 @@ def _stratified_split_by_source(examples: List[Dict[str, Any]],
     return train_examples, val_examples, test_examples
 
 
+def _hash_split_by_source(examples: Iterable[Dict[str, Any]]) -> tuple[List[Dict], List[Dict], List[Dict]]:
+    """
+    Split public dataset examples by stable hash, keyed and counted per source (see dataset_split).
+
+    Train and validation examples are shuffled with HASH_SPLIT_SEED; test keeps input order.
+
+    Returns:
+        Tuple of (train_examples, val_examples, test_examples)
+    """
+    splits = {TRAIN: [], VALIDATION: [], TEST: []}
+    for split, example in iter_hash_split(examples, 'source'):
+        splits[split].append(example)
+
+    random.seed(HASH_SPLIT_SEED)
+    random.shuffle(splits[TRAIN])
+    random.shuffle(splits[VALIDATION])
+
+    return splits[TRAIN], splits[VALIDATION], splits[TEST]
+
+
 def _save_jsonl(examples: List[Dict[str, Any]], filepath: Path) -> None:
     """Save examples to JSONL format."""
     filepath.parent.mkdir(parents=True, exist_ok=True)
@@ -1113,14 +1116,25 @@ def execute_single_phase(phase: str, args):
 
     if phase == Phases.PARSING:
         # Extract scan files from artifacts directory
-        vulnerabilities_file = parse_vulnerabilities_phase(args.artifacts_dir, output_dir)
+        vulnerabilities_file = parse_vulnerabilities_phase(args.artifacts_dir, output_dir,
+                                                           parse_workers=args.parse_workers,
+                                                           use_parse_cache=not args.no_parse_cache,
+                                                           output_format=args.parsed_output_format,
+                                                           dedupe_code_context=args.dedupe_code_context,
+                                                           coalesce_dependencies=args.coalesce_dependencies,
+                                                           force=args.force)
         print(f"✅ Parsing completed. Output files:")
         print(f"   Parsed vulnerabilities: {vulnerabilities_file}")
         return 0, {"phase": phase, "vulnerabilities_file": str(vulnerabilities_file)}
 
     elif phase == Phases.DATASETS:
         parsed_vulnerabilities_file = args.parsed_vulnerabilities_input
-        train_file, val_file, test_file = construct_datasets_phase(parsed_vulnerabilities_file, output_dir)
+        train_file, val_file, test_file = construct_datasets_phase(parsed_vulnerabilities_file, output_dir,
+                                                                   split_mode=args.split_mode,
+                                                                   render_workers=args.render_workers,
+                                                                   augmentation_workers=args.augmentation_workers,
+                                                                   augmentation_view=args.augmentation_view,
+                                                                   force=args.force)
         print(f"✅ Dataset construction completed. Output files:")
         print(f"   Train dataset: {train_file}")
         print(f"   Validation dataset: {val_file}")
@@ -1205,6 +1219,13 @@ def ensure_base_model_ready(config: OLMoSecurityConfig) -> bool:
                     logger.error(f"   {line}")
             return False
 
+def _positive_int(value: str) -> int:
+    """argparse type for options that require an integer >= 1"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be >= 1, got {value}")
+    return number
+
 def main():
     """
     Main orchestrator for the security analysis pipeline.
@@ -1224,6 +1245,44 @@ def main():
     phase_group.add_argument("--only-datasets", action="store_true", help="Execute only dataset construction phase")
     phase_group.add_argument("--only-upload", action="store_true", help="Execute only artifact upload phase")
 
+    # Performance options
+    perf_group = parser.add_argument_group('Performance Options')
+    perf_group.add_argument("--parse-workers", type=_positive_int, default=1,
+                            help="Number of worker processes for parsing security files (default: 1, serial)")
+    perf_group.add_argument("--no-parse-cache", action="store_true",
+                            help="Re-parse every security file instead of reusing cached findings of unchanged files")
+    perf_group.add_argument("--parsed-output-format", choices=PARSED_OUTPUT_FORMATS, default='json',
+                            help="Format of the parsed vulnerabilities file: indented JSON array or "
+                                 "compact JSON Lines (default: json)")
+    perf_group.add_argument("--dedupe-code-context", action="store_true",
+                            help="Store each distinct code context once in parsed_vulnerabilities.blobs.json "
+                                 "instead of repeating it in every finding")
+    perf_group.add_argument("--coalesce-dependencies", action="store_true",
+                            help="Merge the OSV/Trivy findings of each report for the same package version "
+                                 "into one finding with the minimal upgrade that fixes all of its advisories. "
+                                 "Each OSV/Trivy report's raw findings are then held in memory while it is "
+                                 "parsed, instead of being streamed")
+    perf_group.add_argument("--split-mode", choices=SPLIT_MODES, default='stratified',
+                            help="How to split train/validation/test: shuffle and slice per tool/source "
+                                 "(stratified), or assign each example by a stable hash of its tool, id and "
+                                 "location in one streaming pass, reproducible and unaffected by added examples "
+                                 "but not stratified (hash) (default: stratified)")
+    perf_group.add_argument("--render-workers", type=_positive_int, default=1,
+                            help="Number of worker processes for rendering training prompts in the datasets "
+                                 "phase (default: 1, serial)")
+    perf_group.add_argument("--augmentation-workers", type=_positive_int, default=None,
+                            help="Augment train/validation sets in seeded shards on this many worker processes. "
+                                 "Output is identical for any worker count, but differs from the default serial "
+                                 "augmentation (default: serial)")
+    perf_group.add_argument("--augmentation-view", action="store_true",
+                            help="Write only original train/validation examples plus small augmentation records, "
+                                 "regenerating augmented examples when the datasets are used (keeps the dataset "
+                                 "files at original size)")
+    perf_group.add_argument("--force", action="store_true",
+                            help="Re-run the parsing and datasets phases, even if the phase manifest in the output "
+                                 "directory shows their inputs, code and options are unchanged since their outputs "
+                                 "were produced (uploads always run)")
+
     # Upload control flags
     upload_group = parser.add_argument_group('Upload Options')
     upload_group.add_argument("--skip-upload", action="store_true", help="Skip artifact upload in full pipeline (default: False)")
@@ -1277,7 +1336,15 @@ def main():
         print(f"Summary: {summary}")
         return result
 
-    run_sequential_pipeline(str(args.artifacts_dir), args.output_dir, skip_upload=args.skip_upload)
+    run_sequential_pipeline(str(args.artifacts_dir), args.output_dir, skip_upload=args.skip_upload,
+                            parse_workers=args.parse_workers, use_parse_cache=not args.no_parse_cache,
+                            parsed_output_format=args.parsed_output_format,
+                            dedupe_code_context=args.dedupe_code_context,
+                            coalesce_dependencies=args.coalesce_dependencies,
+                            split_mode=args.split_mode, render_workers=args.render_workers,
+                            augmentation_workers=args.augmentation_workers,
+                            augmentation_view=args.augmentation_view,
+                            force=args.force)
 
 if __name__ == "__main__":
     main()
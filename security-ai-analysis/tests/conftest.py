@@ -10,6 +10,7 @@ workspace_dir = session_temp_dir / "test_workspace"
 kb_dir = session_temp_dir / "test_kb"
 models_dir = session_temp_dir / "test_models"
 upload_staging_dir = session_temp_dir / "test_upload_staging"
+parse_cache_dir = session_temp_dir / "test_parse_cache"
 
 @pytest.fixture(scope="session",autouse=True)
 def setup_temp_dir():
@@ -31,6 +32,7 @@ def setup_test_environment(monkeypatch):
         'OLMO_KNOWLEDGE_BASE_DIR': str(kb_dir),
         'OLMO_FINE_TUNED_MODELS_DIR': str(models_dir),
         'OLMO_UPLOAD_STAGING_DIR': str(upload_staging_dir),
+        'OLMO_PARSE_CACHE_DIR': str(parse_cache_dir),
     }
 
     # Set test environment variables and store originals
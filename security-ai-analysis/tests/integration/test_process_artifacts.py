@@ -222,6 +222,85 @@ class TestProcessArtifactsScript:
                     assert 'fixed_version' in vuln, f"Each vulnerability from {vuln['tool']} should have 'fixed_version'"
                     assert 'installed_version' in vuln, f"Each vulnerability from {vuln['tool']} should have 'installed_version'"
 
+    def test_parsing_only_with_parse_workers_matches_serial(self):
+        """Test parallel parsing produces the same output as serial parsing"""
+        serial_dir = self.temp_output_dir / "serial_parse"
+        parallel_dir = self.temp_output_dir / "parallel_parse"
+
+        result = self.run_process_artifacts(
+            additional_args=["--only-parsing", "--output-dir", str(serial_dir)],
+            realtime_output=True
+        )
+        assert result == 0, f"Serial parsing failed with exit code {result}"
+
+        result = self.run_process_artifacts(
+            additional_args=["--only-parsing", "--output-dir", str(parallel_dir), "--parse-workers", "4"],
+            realtime_output=True
+        )
+        assert result == 0, f"Parallel parsing failed with exit code {result}"
+
+        serial_output = (serial_dir / "parsed_vulnerabilities.json").read_text()
+        parallel_output = (parallel_dir / "parsed_vulnerabilities.json").read_text()
+        assert parallel_output == serial_output, "Parallel parsing output should match serial parsing output"
+
+    def test_parsing_only_jsonl_output_matches_json(self):
+        """Test JSONL parsed output holds the same findings as the JSON output"""
+        json_dir = self.temp_output_dir / "json_parse"
+        jsonl_dir = self.temp_output_dir / "jsonl_parse"
+
+        result = self.run_process_artifacts(
+            additional_args=["--only-parsing", "--output-dir", str(json_dir)],
+            realtime_output=True
+        )
+        assert result == 0, f"JSON parsing failed with exit code {result}"
+
+        result = self.run_process_artifacts(
+            additional_args=["--only-parsing", "--output-dir", str(jsonl_dir), "--parsed-output-format", "jsonl"],
+            realtime_output=True
+        )
+        assert result == 0, f"JSONL parsing failed with exit code {result}"
+
+        with open(json_dir / "parsed_vulnerabilities.json", 'r') as f:
+            json_findings = json.load(f)
+        with open(jsonl_dir / "parsed_vulnerabilities.jsonl", 'r') as f:
+            jsonl_findings = [json.loads(line) for line in f if line.strip()]
+        assert jsonl_findings == json_findings, "JSONL output should contain the same findings as JSON output"
+
+    def test_parsing_only_dedupe_code_context_round_trips(self):
+        """Test deduplicated code context resolves to the same findings as inline code context"""
+        inline_dir = self.temp_output_dir / "inline_context_parse"
+        dedupe_dir = self.temp_output_dir / "dedupe_context_parse"
+
+        result = self.run_process_artifacts(
+            additional_args=["--only-parsing", "--output-dir", str(inline_dir)],
+            realtime_output=True
+        )
+        assert result == 0, f"Inline parsing failed with exit code {result}"
+
+        result = self.run_process_artifacts(
+            additional_args=["--only-parsing", "--output-dir", str(dedupe_dir), "--dedupe-code-context"],
+            realtime_output=True
+        )
+        assert result == 0, f"Deduplicated parsing failed with exit code {result}"
+
+        blob_table_file = dedupe_dir / "parsed_vulnerabilities.blobs.json"
+        assert blob_table_file.exists(), f"Expected blob table not found: {blob_table_file}"
+        with open(blob_table_file, 'r') as f:
+            blobs = json.load(f)['blobs']
+
+        with open(inline_dir / "parsed_vulnerabilities.json", 'r') as f:
+            inline_findings = json.load(f)
+        with open(dedupe_dir / "parsed_vulnerabilities.json", 'r') as f:
+            deduped_findings = json.load(f)
+
+        referencing = [v for v in deduped_findings if 'blob_refs' in (v.get('code_context') or {})]
+        assert referencing, "Expected findings with code context stored in the blob table"
+        for finding in referencing:
+            code_context = finding['code_context']
+            for name, digest in code_context.pop('blob_refs').items():
+                code_context[name] = blobs[digest]
+        assert deduped_findings == inline_findings, "Resolved blob references should match inline code context"
+
 
     def test_datasets_only_fails_with_no_parsed_vulnerabilities_input(self):
         """Test dataset construction only mode fails with no parsed vulnerabilities input"""
@@ -282,6 +361,132 @@ class TestProcessArtifactsScript:
                 assert 'source' in metadata, "Metadata should have 'source'"
                 assert 'chat_template' in metadata, "Metadata should have 'chat_template'"
 
+    def test_datasets_only_with_render_workers_matches_serial(self):
+        """Test rendering training prompts in worker processes produces the same datasets as serial rendering"""
+        serial_dir = self.temp_output_dir / "serial_render"
+        parallel_dir = self.temp_output_dir / "parallel_render"
+        parsed_input = str(self.phase_inputs_dir / "parsed_vulnerabilities.json")
+
+        result = self.run_process_artifacts(
+            additional_args=["--only-datasets", "--parsed-vulnerabilities-input", parsed_input,
+                             "--output-dir", str(serial_dir)],
+            realtime_output=True
+        )
+        assert result == 0, f"Serial rendering failed with exit code {result}"
+
+        result = self.run_process_artifacts(
+            additional_args=["--only-datasets", "--parsed-vulnerabilities-input", parsed_input,
+                             "--output-dir", str(parallel_dir), "--render-workers", "3"],
+            realtime_output=True
+        )
+        assert result == 0, f"Parallel rendering failed with exit code {result}"
+
+        for dataset_name in ["train_dataset.jsonl", "validation_dataset.jsonl", "test_dataset.jsonl"]:
+            serial_output = (serial_dir / dataset_name).read_bytes()
+            parallel_output = (parallel_dir / dataset_name).read_bytes()
+            assert parallel_output == serial_output, f"{dataset_name} should match between serial and parallel rendering"
+
+    def test_datasets_only_augmentation_workers_output_is_independent_of_worker_count(self):
+        """Test sharded augmentation produces byte-identical datasets for 1 and 3 worker processes"""
+        parsed_input = str(self.phase_inputs_dir / "parsed_vulnerabilities.json")
+        outputs = {}
+
+        for workers in ["1", "3"]:
+            output_dir = self.temp_output_dir / f"augmentation_workers_{workers}"
+            result = self.run_process_artifacts(
+                additional_args=["--only-datasets", "--parsed-vulnerabilities-input", parsed_input,
+                                 "--output-dir", str(output_dir), "--augmentation-workers", workers],
+                realtime_output=True
+            )
+            assert result == 0, f"Augmentation with {workers} workers failed with exit code {result}"
+            outputs[workers] = output_dir
+
+        for dataset_name in ["train_dataset.jsonl", "validation_dataset.jsonl", "test_dataset.jsonl"]:
+            single_worker_output = (outputs["1"] / dataset_name).read_bytes()
+            multi_worker_output = (outputs["3"] / dataset_name).read_bytes()
+            assert multi_worker_output == single_worker_output, \
+                f"{dataset_name} should not depend on the number of augmentation workers"
+
+    def _phase_reused(self, result):
+        """Whether a captured run reused a memoized phase result (see phase_manifest)"""
+        assert result.returncode == 0, f"Run failed with exit code {result.returncode}:\n{result.stderr}"
+        return "unchanged - reusing" in (result.stdout + result.stderr)
+
+    def test_parsing_only_second_run_reuses_output(self):
+        """Test an unchanged re-run reuses the parsed output, and --force parses again"""
+        output_dir = self.temp_output_dir / "memoized_parse"
+        parse_args = ["--only-parsing", "--output-dir", str(output_dir)]
+
+        assert not self._phase_reused(self.run_process_artifacts(additional_args=parse_args)), \
+            "First run should parse"
+        assert (output_dir / "phase_manifest.json").exists(), "Phase manifest should be recorded"
+        first_output = (output_dir / "parsed_vulnerabilities.json").read_bytes()
+
+        assert self._phase_reused(self.run_process_artifacts(additional_args=parse_args)), \
+            "Unchanged re-run should reuse the parsed output"
+        assert (output_dir / "parsed_vulnerabilities.json").read_bytes() == first_output
+
+        assert not self._phase_reused(self.run_process_artifacts(additional_args=parse_args + ["--force"])), \
+            "--force should parse again"
+        assert (output_dir / "parsed_vulnerabilities.json").read_bytes() == first_output
+
+    def test_datasets_only_reruns_when_input_or_options_change(self):
+        """Test the datasets phase is reused only while its input and options are unchanged"""
+        output_dir = self.temp_output_dir / "memoized_datasets"
+        output_dir.mkdir(parents=True, exist_ok=True)
+        parsed_input = output_dir / "parsed_vulnerabilities.json"
+        shutil.copy(self.phase_inputs_dir / "parsed_vulnerabilities.json", parsed_input)
+        datasets_args = ["--only-datasets", "--parsed-vulnerabilities-input", str(parsed_input),
+                         "--output-dir", str(output_dir)]
+
+        assert not self._phase_reused(self.run_process_artifacts(additional_args=datasets_args)), \
+            "First run should build the datasets"
+        assert self._phase_reused(self.run_process_artifacts(additional_args=datasets_args)), \
+            "Unchanged re-run should reuse the datasets"
+
+        # Same findings, different bytes: the input hash changes
+        with open(parsed_input, 'a') as f:
+            f.write("\n")
+        assert not self._phase_reused(self.run_process_artifacts(additional_args=datasets_args)), \
+            "Changed input should rebuild the datasets"
+
+        assert not self._phase_reused(
+            self.run_process_artifacts(additional_args=datasets_args + ["--split-mode", "hash"])), \
+            "Changed options should rebuild the datasets"
+
+        # Modified outputs are never reused
+        with open(output_dir / "train_dataset.jsonl", 'a') as f:
+            f.write("\n")
+        assert not self._phase_reused(
+            self.run_process_artifacts(additional_args=datasets_args + ["--split-mode", "hash"])), \
+            "Modified outputs should be rebuilt"
+
+    def test_reused_datasets_phase_restores_random_state(self):
+        """Test a reused datasets phase leaves the global random state exactly as a full run does"""
+        output_dir = self.temp_output_dir / "memoized_random_state"
+        script = (
+            "import random, sys\n"
+            "from pathlib import Path\n"
+            "import process_artifacts\n"
+            "parsed_input, output_dir = Path(sys.argv[1]), Path(sys.argv[2])\n"
+            "draws = []\n"
+            "for _ in range(2):\n"
+            "    random.seed(7)\n"
+            "    process_artifacts.construct_datasets_phase(parsed_input, output_dir)\n"
+            "    draws.append(random.random())\n"
+            "print('DRAWS', draws[0], draws[1])\n"
+        )
+        result = subprocess.run(
+            ["python", "-c", script, str(self.phase_inputs_dir / "parsed_vulnerabilities.json"), str(output_dir)],
+            text=True,
+            capture_output=True,
+            cwd=self.script_path.parent
+        )
+
+        assert self._phase_reused(result), "Second datasets phase should be reused"
+        draws = next(line for line in result.stdout.splitlines() if line.startswith("DRAWS")).split()[1:]
+        assert draws[0] == draws[1], "Random state after a reused phase should match a full run"
+
     def test_upload_only_fails_with_no_adapters(self):
         """Test upload only mode fails with no model directory"""
         result = self.run_process_artifacts(
@@ -0,0 +1,69 @@
+import json
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import augmentation_view
+from augmentation_view import (augmentation_view_path, iter_dataset_examples, materialize_dataset,
+                               write_augmentation_view)
+from dataset_augmentor import AugmentationConfig, SecurityDataAugmentor
+from training_pair_renderer import render_training_pairs
+
+PARSED_VULNERABILITIES = Path(__file__).parent.parent / "fixtures" / "phase_inputs" / "parsed_vulnerabilities.json"
+
+
+@pytest.fixture
+def dataset_with_view(tmp_path):
+    with open(PARSED_VULNERABILITIES, 'r') as f:
+        originals = list(render_training_pairs(json.load(f)[:30], workers=1))
+    dataset_file = tmp_path / "train_dataset.jsonl"
+    with open(dataset_file, 'w') as f:
+        for example in originals:
+            f.write(json.dumps(example) + '\n')
+
+    augmentor = SecurityDataAugmentor(AugmentationConfig())
+    write_augmentation_view(dataset_file, augmentor, augmentor.iter_augmentation_records(originals))
+    return dataset_file
+
+
+class TestAugmentationView:
+    """Views are tied to the augmentor that wrote them, and materialize shuffled"""
+
+    def test_view_from_different_augmentor_sources_is_rejected(self, dataset_with_view, tmp_path, monkeypatch):
+        assert len(list(iter_dataset_examples(dataset_with_view))) > 30
+
+        changed_augmentor = tmp_path / "dataset_augmentor.py"
+        changed_augmentor.write_text("# a different augmentor\n")
+        monkeypatch.setattr(augmentation_view, 'AUGMENTOR_SOURCES', [changed_augmentor])
+
+        with pytest.raises(ValueError, match="different augmentor sources"):
+            list(iter_dataset_examples(dataset_with_view))
+
+    def test_materialize_shuffles_deterministically_without_global_random_state(self, dataset_with_view, tmp_path):
+        random.seed(7)
+        state = random.getstate()
+
+        materialize_dataset(dataset_with_view, tmp_path / "first.jsonl")
+        materialize_dataset(dataset_with_view, tmp_path / "second.jsonl")
+
+        assert random.getstate() == state
+        first = (tmp_path / "first.jsonl").read_text()
+        assert first == (tmp_path / "second.jsonl").read_text()
+
+        streamed = [json.dumps(example) for example in iter_dataset_examples(dataset_with_view)]
+        materialized = first.splitlines()
+        assert sorted(materialized) == sorted(streamed)
+        assert materialized != streamed
+
+    def test_dataset_without_view_is_copied(self, tmp_path):
+        dataset_file = tmp_path / "validation_dataset.jsonl"
+        dataset_file.write_text('{"messages": []}\n{"messages": [{"role": "user", "content": "x"}]}\n')
+
+        materialize_dataset(dataset_file, tmp_path / "valid.jsonl")
+
+        assert not augmentation_view_path(dataset_file).exists()
+        assert (tmp_path / "valid.jsonl").read_text() == dataset_file.read_text()
@@ -0,0 +1,74 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from dataset_split import TEST, TRAIN, VALIDATION, example_split_key, hash_split_assignment, iter_hash_split
+
+
+def _example(vulnerability_id, location, prompt="Fix this vulnerability", tool='semgrep'):
+    return {
+        'messages': [
+            {'role': 'system', 'content': 'You are a security engineer.'},
+            {'role': 'user', 'content': prompt},
+            {'role': 'assistant', 'content': 'Apply the fix.'},
+        ],
+        'metadata': {'tool': tool, 'vulnerability_id': vulnerability_id, 'location': location},
+    }
+
+
+def _splits(examples):
+    return [split for split, _ in iter_hash_split(examples, 'tool')]
+
+
+class TestHashSplit:
+    """Deterministic, identity-keyed hash split"""
+
+    def test_assignment_is_deterministic_and_order_independent(self):
+        examples = [_example(f"rule-{i}", f"src/file_{i}.py") for i in range(200)]
+
+        assert _splits(examples) == _splits(examples)
+        assert _splits(list(reversed(examples))) == list(reversed(_splits(examples)))
+
+    def test_key_ignores_prompt_wording(self):
+        original = _example("CVE-2024-1234", "requests@2.0.0", prompt="Upgrade requests")
+        reworded = _example("CVE-2024-1234", "requests@2.0.0", prompt="Please upgrade the requests package")
+
+        assert example_split_key(original, 'trivy') == example_split_key(reworded, 'trivy')
+
+    def test_key_distinguishes_tool_id_and_location(self):
+        base = _example("rule-1", "src/app.py")
+        keys = {
+            example_split_key(base, 'semgrep'),
+            example_split_key(base, 'checkov'),
+            example_split_key(_example("rule-2", "src/app.py"), 'semgrep'),
+            example_split_key(_example("rule-1", "src/other.py"), 'semgrep'),
+        }
+        assert len(keys) == 4
+
+    def test_examples_without_identity_fall_back_to_prompt(self):
+        first = {'messages': [{'role': 'user', 'content': 'first'}], 'metadata': {'source': 'crossvul'}}
+        second = {'messages': [{'role': 'user', 'content': 'second'}], 'metadata': {'source': 'crossvul'}}
+
+        assert example_split_key(first, 'crossvul') != example_split_key(second, 'crossvul')
+
+    def test_split_ratios_hold_in_expectation(self):
+        counts = {}
+        examples = [_example(f"CVE-{i}", f"package-{i}@1.0", tool=('trivy', 'semgrep')[i % 2])
+                    for i in range(20000)]
+
+        splits = [split for split, _ in iter_hash_split(examples, 'tool', train_ratio=0.8, val_ratio=0.1,
+                                                        counts=counts)]
+
+        for split, ratio in ((TRAIN, 0.8), (VALIDATION, 0.1), (TEST, 0.1)):
+            assert abs(splits.count(split) / len(splits) - ratio) < 0.015
+        assert sum(sum(group.values()) for group in counts.values()) == len(examples)
+        assert set(counts) == {'trivy', 'semgrep'}
+        for group in counts.values():
+            assert abs(group[TRAIN] / sum(group.values()) - 0.8) < 0.02
+
+    def test_assignment_boundaries_follow_ratios(self):
+        keys = [f"key-{i}" for i in range(1000)]
+
+        assert {hash_split_assignment(key, train_ratio=1.0, val_ratio=0.0) for key in keys} == {TRAIN}
+        assert {hash_split_assignment(key, train_ratio=0.0, val_ratio=0.0) for key in keys} == {TEST}
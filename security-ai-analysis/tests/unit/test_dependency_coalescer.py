@@ -0,0 +1,113 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import parsers.sarif_trivy_parser as sarif_trivy_parser
+from dependency_coalescer import DependencyCoalescer, minimal_safe_upgrade
+from parsers.parse_session import ParseSession
+from parsers.sarif_trivy_parser import generate_dependency_upgrade_code, parse_trivy_sarif
+
+TRIVY_REPORT = (Path(__file__).parent.parent / "fixtures" / "sample_security_artifacts" /
+                "docker-security-scan-results-trivy-action" / "docker-security-scan-results.sarif")
+
+
+def _trivy_finding(advisory_id, package, installed_version, fixed_version, ecosystem='pip'):
+    return {
+        'tool': 'trivy',
+        'id': advisory_id,
+        'package_name': package,
+        'installed_version': installed_version,
+        'fixed_version': fixed_version,
+        'package_ecosystem': ecosystem,
+    }
+
+
+class TestDependencyCoalescer:
+    """Coalescing of a report's dependency findings per package version"""
+
+    def test_minimal_safe_upgrade_fixes_every_advisory(self):
+        assert minimal_safe_upgrade("1.3.5", [["1.3.12", "1.4.12"], ["1.3.15", "1.5.13"]]) == "1.3.15"
+        assert minimal_safe_upgrade("4.1.99.Final", [["4.1.108.Final"], ["4.1.100.Final"]]) == "4.1.108.Final"
+        assert minimal_safe_upgrade("1.0", [[], []]) is None
+
+    def test_coalesced_finding_takes_first_member_position(self):
+        findings = [
+            {'tool': 'semgrep', 'id': 'rule-1'},
+            _trivy_finding('CVE-1', 'requests', '2.0.0', '2.31.0'),
+            _trivy_finding('CVE-2', 'urllib3', '1.26.0', '1.26.18'),
+            {'tool': 'semgrep', 'id': 'rule-2'},
+            _trivy_finding('CVE-3', 'requests', '2.0.0', '2.32.0'),
+        ]
+
+        coalesced = DependencyCoalescer(generate_dependency_upgrade_code).coalesce(findings)
+
+        assert [finding['id'] for finding in coalesced] == ['rule-1', 'CVE-1, CVE-3', 'CVE-2', 'rule-2']
+        assert coalesced[1]['coalesced_ids'] == ['CVE-1', 'CVE-3']
+        assert coalesced[1]['fix']['to_version'] == '2.32.0'
+
+    def test_coalesced_fix_uses_the_parser_formatter(self):
+        findings = [
+            _trivy_finding('CVE-1', 'openssl', '3.0.1', '3.0.7', ecosystem='os_apk'),
+            _trivy_finding('CVE-2', 'openssl', '3.0.1', '3.0.8', ecosystem='os_apk'),
+            _trivy_finding('CVE-3', 'jinja2', '2.0', '3.1.3'),
+            _trivy_finding('CVE-4', 'jinja2', '2.0', '3.1.4'),
+        ]
+
+        coalesced = DependencyCoalescer(generate_dependency_upgrade_code).coalesce(findings)
+
+        assert [finding['fix']['fixed_code'] for finding in coalesced] == [
+            'Upgrade openssl to version 3.0.8',
+            'jinja2==3.1.4',
+        ]
+
+    def test_findings_without_fixed_versions_are_kept(self):
+        findings = [
+            _trivy_finding('CVE-1', 'requests', '2.0.0', ''),
+            _trivy_finding('CVE-2', 'requests', '2.0.0', ''),
+        ]
+
+        assert DependencyCoalescer(generate_dependency_upgrade_code).coalesce(findings) == findings
+
+    def test_fixed_versions_are_read_like_osv_fix_generation(self):
+        osv_finding = {
+            'tool': 'osv-scanner', 'id': 'GHSA-1', 'package_name': 'ch.qos.logback:logback-core',
+            'installed_version': '1.3.5', 'ecosystem': 'Maven', 'fixed_version': '',
+            'affected': [{'ranges': [{'events': [{'introduced': '0'}, {'fixed': '1.3.12'}]}]}],
+        }
+        second = {**osv_finding, 'id': 'GHSA-2', 'affected': [], 'fixed_version': '1.3.15, 1.5.13'}
+
+        coalesced = DependencyCoalescer(generate_dependency_upgrade_code).coalesce([osv_finding, second])
+
+        assert coalesced[0]['fix']['to_version'] == '1.3.15'
+        assert coalesced[0]['fix']['available_versions'] == ['1.5.13', '1.3.15', '1.3.12']
+
+    def test_confidence_is_derived_from_the_merged_fixes(self):
+        findings = [
+            _trivy_finding('CVE-1', 'requests', '2.0.0', '2.31.0'),
+            _trivy_finding('CVE-2', 'requests', '2.0.0', ''),
+            {**_trivy_finding('CVE-3', 'requests', '2.0.0', '2.32.0'), 'fix': {'confidence': 0.5}},
+            _trivy_finding('CVE-4', 'requests', '2.0.0', '2.30.0'),
+        ]
+
+        coalesced = DependencyCoalescer(generate_dependency_upgrade_code).coalesce(findings)
+
+        assert coalesced[0]['fix']['confidence'] == (1.0 + 0.0 + 0.5 + 1.0) / 4
+
+    def test_trivy_parser_builds_one_fix_per_package_version(self, monkeypatch):
+        calls = []
+        generate_fix_object = sarif_trivy_parser._generate_fix_object
+
+        def counting_generate_fix_object(fields, ecosystem):
+            calls.append(fields['id'])
+            return generate_fix_object(fields, ecosystem)
+
+        monkeypatch.setattr(sarif_trivy_parser, '_generate_fix_object', counting_generate_fix_object)
+        per_advisory = parse_trivy_sarif(str(TRIVY_REPORT))
+        calls.clear()
+
+        coalesced = parse_trivy_sarif(str(TRIVY_REPORT), ParseSession(coalesce_dependencies=True))
+
+        assert len(coalesced) < len(per_advisory)
+        assert len(calls) == sum(1 for finding in coalesced if 'coalesced_ids' not in finding)
+        assert all(finding['fix'] for finding in coalesced)
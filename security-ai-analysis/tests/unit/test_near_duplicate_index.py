@@ -0,0 +1,135 @@
+import json
+import os
+import random
+import subprocess
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from near_duplicate_index import (LEAKAGE_SIMILARITY_THRESHOLD, LSH_RECALL, SIGNATURE_BINS, NearDuplicateIndex,
+                                  dataset_index, example_shingles, example_signature, find_near_duplicates,
+                                  find_split_leakage, lsh_bands)
+
+MODULE_DIR = Path(__file__).parent.parent.parent
+
+VOCABULARY = [f"word{i}" for i in range(5000)]
+
+
+def _example(words, system="You are a security engineer."):
+    return {
+        'messages': [
+            {'role': 'system', 'content': system},
+            {'role': 'user', 'content': ' '.join(words[:len(words) // 2])},
+            {'role': 'assistant', 'content': ' '.join(words[len(words) // 2:])},
+        ]
+    }
+
+
+def _with_replaced_words(words, count, rng):
+    """Copy of words with count of them (at random positions) replaced by unseen words."""
+    changed = list(words)
+    for position in rng.sample(range(len(words)), count):
+        changed[position] = f"replacement{rng.randrange(10 ** 9)}"
+    return changed
+
+
+def _jaccard(first, second):
+    first, second = example_shingles(first), example_shingles(second)
+    return len(first & second) / len(first | second)
+
+
+def _write_jsonl(path, examples):
+    with open(path, 'w') as f:
+        for example in examples:
+            f.write(json.dumps(example) + '\n')
+
+
+class TestNearDuplicateIndex:
+    """MinHash/LSH near-duplicate lookups"""
+
+    def test_identical_example_is_found(self):
+        rng = random.Random(1)
+        examples = [_example(rng.sample(VOCABULARY, 300)) for _ in range(20)]
+        index = NearDuplicateIndex(0.95)
+        for example in examples:
+            index.add(example_signature(example))
+
+        # The system prompt is not part of the signature
+        duplicate = _example(examples[7]['messages'][1]['content'].split() +
+                             examples[7]['messages'][2]['content'].split(), system="Another system prompt")
+
+        assert len(index) == 20
+        assert index.find(example_signature(duplicate)) == (7, 1.0)
+
+    def test_pair_below_threshold_is_not_found(self):
+        rng = random.Random(2)
+        words = rng.sample(VOCABULARY, 300)
+        original, rewritten = _example(words), _example(_with_replaced_words(words, 30, rng))
+        index = NearDuplicateIndex(LEAKAGE_SIMILARITY_THRESHOLD)
+        index.add(example_signature(original))
+
+        assert _jaccard(original, rewritten) < 0.6
+        assert index.find(example_signature(rewritten)) is None
+        assert index.find(example_signature(_example(rng.sample(VOCABULARY, 300)))) is None
+
+    def test_signatures_do_not_depend_on_hash_randomization(self):
+        example = _example(random.Random(3).sample(VOCABULARY, 100))
+        script = ("import json, sys; from near_duplicate_index import example_signature; "
+                  "print(json.dumps(example_signature(json.loads(sys.stdin.read()))))")
+
+        signatures = set()
+        for hash_seed in ('0', '1', '12345'):
+            result = subprocess.run([sys.executable, '-c', script], input=json.dumps(example),
+                                    capture_output=True, text=True, check=True, cwd=MODULE_DIR,
+                                    env={**os.environ, 'PYTHONHASHSEED': hash_seed})
+            signatures.add(tuple(json.loads(result.stdout)))
+
+        assert signatures == {example_signature(example)}
+
+    def test_lsh_bands_reach_recall_at_threshold(self):
+        for threshold in (0.5, LEAKAGE_SIMILARITY_THRESHOLD, 0.95):
+            bands = lsh_bands(threshold)
+            rows = SIGNATURE_BINS // bands
+
+            assert SIGNATURE_BINS % bands == 0
+            assert 1 - (1 - threshold ** rows) ** bands >= LSH_RECALL
+
+    def test_near_duplicates_above_threshold_are_found(self):
+        rng = random.Random(4)
+        index = NearDuplicateIndex(LEAKAGE_SIMILARITY_THRESHOLD)
+        pairs = []
+        for _ in range(200):
+            words = rng.sample(VOCABULARY, 300)
+            original, variant = _example(words), _example(_with_replaced_words(words, rng.randint(1, 3), rng))
+            pairs.append((index.add(example_signature(original)), variant))
+            assert _jaccard(original, variant) >= 0.9
+
+        found = sum(1 for position, variant in pairs
+                    if (index.find(example_signature(variant)) or (None,))[0] == position)
+
+        assert found / len(pairs) >= 0.95
+
+    def test_find_split_leakage_reports_train_and_test_indices(self, tmp_path):
+        rng = random.Random(5)
+        test_examples = [_example(rng.sample(VOCABULARY, 200)) for _ in range(3)]
+        train_examples = [_example(rng.sample(VOCABULARY, 200)) for _ in range(4)]
+        train_examples[2] = test_examples[1]
+        _write_jsonl(tmp_path / "train.jsonl", train_examples)
+        _write_jsonl(tmp_path / "test.jsonl", test_examples)
+
+        assert find_split_leakage(tmp_path / "train.jsonl", tmp_path / "test.jsonl") == [(2, 1, 1.0)]
+
+    def test_one_test_index_checks_several_datasets(self, tmp_path):
+        rng = random.Random(6)
+        test_examples = [_example(rng.sample(VOCABULARY, 200)) for _ in range(3)]
+        train_examples = [_example(rng.sample(VOCABULARY, 200)) for _ in range(3)] + [test_examples[0]]
+        val_examples = [test_examples[2], _example(rng.sample(VOCABULARY, 200))]
+        for name, examples in (("train", train_examples), ("val", val_examples), ("test", test_examples)):
+            _write_jsonl(tmp_path / f"{name}.jsonl", examples)
+
+        test_index = dataset_index(tmp_path / "test.jsonl")
+
+        assert len(test_index) == 3
+        assert find_near_duplicates(tmp_path / "train.jsonl", test_index) == [(3, 0, 1.0)]
+        assert find_near_duplicates(tmp_path / "val.jsonl", test_index) == [(0, 2, 1.0)]
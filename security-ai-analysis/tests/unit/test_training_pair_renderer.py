@@ -0,0 +1,65 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import training_pair_renderer
+from training_pair_renderer import render_training_pairs
+
+PARSED_VULNERABILITIES = Path(__file__).parent.parent / "fixtures" / "phase_inputs" / "parsed_vulnerabilities.json"
+
+
+@pytest.fixture(scope="module")
+def fixture_findings():
+    with open(PARSED_VULNERABILITIES, 'r') as f:
+        return json.load(f)
+
+
+def _render_until_error(vulns, workers):
+    """Pairs yielded before the first failure, and that failure."""
+    pairs = []
+    with pytest.raises(ValueError) as error:
+        for pair in render_training_pairs(vulns, workers=workers):
+            pairs.append(pair)
+    return pairs, str(error.value)
+
+
+class TestRenderTrainingPairs:
+    """Parallel rendering must behave exactly like serial rendering"""
+
+    def test_workers_match_serial(self, fixture_findings, monkeypatch):
+        monkeypatch.setattr(training_pair_renderer, 'RENDER_CHUNK_SIZE', 16)
+
+        serial = list(render_training_pairs(fixture_findings, workers=1))
+        parallel = list(render_training_pairs(fixture_findings, workers=3))
+
+        assert parallel == serial
+        assert len(serial) > 0
+
+    def test_first_failure_in_input_order_wins_across_chunks(self, fixture_findings, monkeypatch):
+        monkeypatch.setattr(training_pair_renderer, 'RENDER_CHUNK_SIZE', 4)
+        vulns = [dict(vuln) for vuln in fixture_findings[:40]]
+        # Broken findings in two different chunks; only the first in input order may surface
+        vulns[21] = {**vulns[21], 'id': 'first-broken', 'fix': None}
+        vulns[30] = {**vulns[30], 'id': 'second-broken', 'fix': None}
+
+        serial_pairs, serial_error = _render_until_error(vulns, workers=1)
+        parallel_pairs, parallel_error = _render_until_error(vulns, workers=3)
+
+        assert "first-broken" in serial_error
+        assert parallel_error == serial_error
+        assert parallel_pairs == serial_pairs
+        assert len(serial_pairs) == len(list(render_training_pairs(vulns[:21], workers=1)))
+
+    def test_location_is_only_recorded_on_request(self, fixture_findings):
+        default = list(render_training_pairs(fixture_findings[:20], workers=1))
+        with_location = list(render_training_pairs(fixture_findings[:20], workers=1, include_location=True))
+
+        assert all('location' not in pair['metadata'] for pair in default)
+        assert all(pair['metadata']['location'] for pair in with_location)
+        for pair in with_location:
+            del pair['metadata']['location']
+        assert with_location == default
@@ -0,0 +1,106 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from url_to_code_mapper import RouteTrie, URLToCodeMapper
+
+
+def _routes(*paths):
+    return [{'path': path, 'line_number': line} for line, path in enumerate(paths, 1)]
+
+
+def _matched_path(trie, path):
+    route = trie.match(path)
+    return route['path'] if route else None
+
+
+class TestRouteTrie:
+    """RouteTrie matching of Ktor and Express route patterns"""
+
+    def test_exact_route_wins_over_parameter(self):
+        trie = RouteTrie(_routes("/users/{id}", "/users/me"))
+        assert _matched_path(trie, "/users/me") == "/users/me"
+        assert _matched_path(trie, "/users/42") == "/users/{id}"
+
+    def test_parameter_matches_exactly_one_segment(self):
+        trie = RouteTrie(_routes("/users/:id"))
+        assert _matched_path(trie, "/users/42") == "/users/:id"
+        assert _matched_path(trie, "/users") is None
+        assert _matched_path(trie, "/users/42/posts") is None
+
+    def test_optional_parameter_matches_one_segment_or_none(self):
+        trie = RouteTrie(_routes("/files/{name?}", "/items/:id?"))
+        assert _matched_path(trie, "/files/report.txt") == "/files/{name?}"
+        assert _matched_path(trie, "/files") == "/files/{name?}"
+        assert _matched_path(trie, "/files/a/b") is None
+        assert _matched_path(trie, "/items/7") == "/items/:id?"
+        assert _matched_path(trie, "/items") == "/items/:id?"
+
+    def test_tailcard_matches_rest_of_path(self):
+        trie = RouteTrie(_routes("/static/{path...}", "/assets/*"))
+        assert _matched_path(trie, "/static/css/site.css") == "/static/{path...}"
+        assert _matched_path(trie, "/static") == "/static/{path...}"
+        assert _matched_path(trie, "/assets/img/logo.png") == "/assets/*"
+
+    def test_trailing_slash_is_significant(self):
+        trie = RouteTrie(_routes("/health", "/docs/"))
+        assert _matched_path(trie, "/health") == "/health"
+        assert _matched_path(trie, "/health/") is None
+        assert _matched_path(trie, "/docs/") == "/docs/"
+        assert _matched_path(trie, "/docs") is None
+
+    def test_parameter_does_not_match_trailing_slash(self):
+        trie = RouteTrie(_routes("/users/{id}"))
+        assert _matched_path(trie, "/users/") is None
+
+    def test_ties_keep_discovery_order(self):
+        trie = RouteTrie(_routes("/users/{id}", "/users/:userId"))
+        assert trie.match("/users/42")['line_number'] == 1
+
+
+class TestURLToCodeMapper:
+    """Route discovery and URL mapping over a small project tree"""
+
+    def test_find_route_handler_maps_urls_to_source_lines(self, tmp_path):
+        kotlin_file = tmp_path / "src" / "Routes.kt"
+        kotlin_file.parent.mkdir(parents=True)
+        kotlin_file.write_text(
+            'routing {\n'
+            '    get("/health") { call.respond("ok") }\n'
+            '    get("/users/{id?}") { call.respond(user) }\n'
+            '}\n'
+        )
+        typescript_file = tmp_path / "web" / "server.ts"
+        typescript_file.parent.mkdir(parents=True)
+        typescript_file.write_text('app.post("/login", handleLogin);\n')
+
+        mapper = URLToCodeMapper(tmp_path, use_index=False)
+
+        health = mapper.find_route_handler("http://localhost:8080/health")
+        assert health['file_path'] == str(kotlin_file)
+        assert health['line_number'] == 2
+        assert health['method'] == "GET"
+
+        users = mapper.find_route_handler("http://localhost:8080/users")
+        assert users['line_number'] == 3
+
+        login = mapper.find_route_handler("http://localhost:8082/login?next=/")
+        assert login['file_path'] == str(typescript_file)
+        assert login['handler_type'] == "typescript_express"
+
+        assert mapper.find_route_handler("http://localhost:8080/missing") is None
+
+    def test_vendored_and_build_dirs_are_not_scanned_for_routes(self, tmp_path):
+        routes_file = tmp_path / "src" / "server.ts"
+        routes_file.parent.mkdir(parents=True)
+        routes_file.write_text('app.get("/health", health);\n')
+        for ignored in ("node_modules/express/lib", "dist", "build/generated"):
+            ignored_file = tmp_path / ignored / "server.ts"
+            ignored_file.parent.mkdir(parents=True)
+            ignored_file.write_text('app.get("/vendored", handler);\n')
+
+        mapper = URLToCodeMapper(tmp_path, use_index=False)
+
+        assert [route['file_path'] for route in mapper.route_patterns] == [str(routes_file)]
+        assert mapper.find_route_handler("http://localhost:8082/vendored") is None
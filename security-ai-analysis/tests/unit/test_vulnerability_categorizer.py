@@ -0,0 +1,67 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from vulnerability_categorizer import VulnerabilityCategorizor
+
+PARSED_VULNERABILITIES = Path(__file__).parent.parent / "fixtures" / "phase_inputs" / "parsed_vulnerabilities.json"
+
+
+@pytest.fixture(scope="module")
+def fixture_findings():
+    with open(PARSED_VULNERABILITIES, 'r') as f:
+        return json.load(f)
+
+
+def _categorize_each(findings):
+    categorizer = VulnerabilityCategorizor()
+    results = [categorizer.categorize_vulnerability(finding) for finding in findings]
+    return [category for category, _ in results], [confidence for _, confidence in results]
+
+
+class TestCategorizeBatch:
+    """categorize_batch must match per-finding categorize_vulnerability exactly"""
+
+    def test_batch_matches_single_categorization_on_fixture_findings(self, fixture_findings):
+        assert VulnerabilityCategorizor().categorize_batch(fixture_findings) == _categorize_each(fixture_findings)
+
+    def test_fixture_covers_webauthn_refinement(self, fixture_findings):
+        semgrep_findings = [finding for finding in fixture_findings if finding['tool'] == 'semgrep']
+        categories, confidences = VulnerabilityCategorizor().categorize_batch(semgrep_findings)
+
+        # Strong and possible WebAuthn matches, and semgrep findings left as code vulnerabilities
+        assert {(category, confidence >= 0.8) for category, confidence in zip(categories, confidences)} == {
+            ('webauthn_security', True),
+            ('webauthn_security', False),
+            ('code_vulnerabilities', False),
+        }
+
+    def test_memoized_results_match_across_batches_and_evictions(self, fixture_findings):
+        categorizer = VulnerabilityCategorizor(cache_size=8)
+        expected = _categorize_each(fixture_findings)
+
+        assert categorizer.categorize_batch(fixture_findings) == expected
+        assert categorizer.categorize_batch(fixture_findings) == expected
+        assert categorizer.categorize_batch(list(reversed(fixture_findings))) == (
+            list(reversed(expected[0])), list(reversed(expected[1])))
+
+    def test_webauthn_refinement_reads_message_path_and_metadata(self):
+        findings = [
+            {'tool': 'semgrep', 'message': 'Hardcoded secret', 'file_path': 'src/app.py'},
+            {'tool': 'semgrep', 'message': 'Hardcoded secret', 'file_path': 'src/webauthn/app.py'},
+            {'tool': 'semgrep', 'message': 'Weak challenge', 'file_path': 'src/webauthn/app.py'},
+            {'tool': 'semgrep', 'message': 'Hardcoded secret', 'file_path': 'src/app.py',
+             'metadata': {'references': ['fido', 'passkey', 'attestation']}},
+        ]
+
+        assert VulnerabilityCategorizor().categorize_batch(findings) == _categorize_each(findings)
+
+    def test_unknown_tool_fails_like_single_categorization(self):
+        findings = [{'tool': 'semgrep', 'message': 'ok'}, {'tool': 'unknown-scanner', 'id': 'X-1'}]
+
+        with pytest.raises(ValueError, match="Unknown security tool 'unknown-scanner'"):
+            VulnerabilityCategorizor().categorize_batch(findings)
@@ -0,0 +1,122 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import vulnerable_code_extractor
+from vulnerable_code_extractor import (BUILD_OUTPUT_DIRS, DEFAULT_IGNORED_DIRS, VENDORED_DIRS,
+                                       VulnerableCodeExtractor, get_project_file_index)
+
+
+def _write(path: Path, content: str = "") -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    return path
+
+
+class TestProjectFileIndex:
+    """Shared filename index: caller-chosen ignores, rebuilt when the tree changes"""
+
+    def test_vendored_and_build_dirs_are_skipped_only_when_requested(self, tmp_path):
+        source = _write(tmp_path / "src" / "Handler.kt")
+        vendored = _write(tmp_path / "node_modules" / "lib" / "Handler.kt")
+        generated = _write(tmp_path / "build" / "generated" / "Handler.kt")
+        _write(tmp_path / ".git" / "objects" / "Handler.kt")
+
+        assert get_project_file_index(tmp_path).find("Handler.kt") == [generated, vendored, source]
+        assert get_project_file_index(tmp_path, ignored_dirs=DEFAULT_IGNORED_DIRS | VENDORED_DIRS).find(
+            "Handler.kt") == [generated, source]
+        assert get_project_file_index(
+            tmp_path, ignored_dirs=DEFAULT_IGNORED_DIRS | VENDORED_DIRS | BUILD_OUTPUT_DIRS).find(
+            "Handler.kt") == [source]
+
+    def test_extractor_skips_vendored_dirs_by_default(self, tmp_path):
+        source = _write(tmp_path / "src" / "Handler.kt")
+        _write(tmp_path / "node_modules" / "lib" / "Handler.kt")
+
+        assert VulnerableCodeExtractor(tmp_path)._get_file_index(0).find("Handler.kt") == [source]
+
+    def test_index_is_reused_until_the_tree_changes(self, tmp_path):
+        _write(tmp_path / "src" / "Old.kt")
+        first = get_project_file_index(tmp_path)
+
+        assert get_project_file_index(tmp_path) is first
+
+        created = _write(tmp_path / "src" / "New.kt")
+        second = get_project_file_index(tmp_path)
+
+        assert second is not first
+        assert second.find("New.kt") == [created]
+
+    def test_later_extractor_finds_file_created_after_first_lookup(self, tmp_path):
+        _write(tmp_path / "src" / "main" / "Old.kt")
+        assert VulnerableCodeExtractor(tmp_path)._get_file_index(0).find("New.kt") == []
+
+        created = _write(tmp_path / "src" / "main" / "New.kt")
+
+        assert VulnerableCodeExtractor(tmp_path)._get_file_index(0).find("New.kt") == [created]
+
+
+KOTLIN_HANDLER = """package app
+
+class Handler {
+    fun register(request: String): String {
+        val user = request.trim()
+        return user
+    }
+
+    fun authenticate(token: String): Boolean {
+        return token.isNotEmpty()
+    }
+}
+"""
+
+
+@pytest.fixture
+def project_with_findings(tmp_path):
+    _write(tmp_path / "src" / "Handler.kt", KOTLIN_HANDLER)
+    _write(tmp_path / "src" / "Other.kt", KOTLIN_HANDLER.replace("Handler", "Other"))
+    findings = [{'tool': 'semgrep', 'file_path': 'src/Handler.kt', 'start': {'line': line}} for line in (4, 5, 9, 10)]
+    findings.insert(2, {'tool': 'semgrep', 'file_path': 'src/Other.kt', 'start': {'line': 5}})
+    findings.append({'tool': 'semgrep', 'file_path': 'src/Missing.kt', 'start': {'line': 1}})
+    return tmp_path, findings
+
+
+class TestBatchExtraction:
+    """extract_vulnerability_contexts: grouped by file, same results as one at a time"""
+
+    def test_each_file_is_read_once_for_many_findings(self, project_with_findings, monkeypatch):
+        project_root, findings = project_with_findings
+        reads = []
+
+        class CountingSourceFile(vulnerable_code_extractor.SourceFile):
+            def __init__(self, path, *args, **kwargs):
+                reads.append(Path(path).name)
+                super().__init__(path, *args, **kwargs)
+
+        monkeypatch.setattr(vulnerable_code_extractor, 'SourceFile', CountingSourceFile)
+        VulnerableCodeExtractor(project_root).extract_vulnerability_contexts(findings)
+
+        assert sorted(reads) == ["Handler.kt", "Other.kt"]
+
+    @pytest.mark.parametrize("max_workers", [1, 3])
+    def test_batch_matches_single_extraction(self, project_with_findings, max_workers):
+        project_root, findings = project_with_findings
+        single = [VulnerableCodeExtractor(project_root).extract_vulnerability_context(finding)
+                  for finding in findings]
+
+        batch = VulnerableCodeExtractor(project_root).extract_vulnerability_contexts(findings, max_workers=max_workers)
+
+        assert batch == single
+        assert [result.code_context.function_name for result in batch[:5]] == [
+            'register', 'register', 'register', 'authenticate', 'authenticate']
+
+    def test_extract_multiple_vulnerabilities_uses_the_batch_path(self, project_with_findings, monkeypatch):
+        project_root, findings = project_with_findings
+        extractor = VulnerableCodeExtractor(project_root)
+        monkeypatch.setattr(extractor, 'extract_vulnerability_context',
+                            lambda vulnerability: pytest.fail("per-finding extraction"))
+
+        assert len(extractor.extract_multiple_vulnerabilities(findings)) == len(findings)
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Writing the Construct Datasets phase output
+
+Training and validation sets are shuffled before they are written. Holding
+every (mostly augmented) example in memory just to shuffle them made peak
+memory grow with the whole dataset. ShuffledJsonlWriter instead spills each
+example to a temporary file as a JSON line and remembers only its offset;
+on close it draws the permutation with random.shuffle - the same random
+numbers shuffling the examples themselves would consume - and copies the
+lines to the output file in that order.
+
+The output is byte-for-byte what shuffling an in-memory list and writing
+json.dumps(example) per line produces.
+
+Usage:
+    with ShuffledJsonlWriter(output_dir / "train_dataset.jsonl") as writer:
+        writer.write_many(original_train)
+        writer.write_many(augmentor.iter_augmented_training_data(original_train))
+"""
+
+import json
+import random
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+
+class ShuffledJsonlWriter:
+    """
+    Writes examples as JSON lines in random.shuffle order without keeping them in memory.
+
+    The shuffle happens in close(), so the global random state is consumed at that
+    point, exactly as a random.shuffle(examples) call placed there would consume it.
+    Pass rng to shuffle with a separate random.Random instead.
+    """
+
+    def __init__(self, path: Path, rng: Optional[random.Random] = None):
+        self.path = Path(path)
+        self._rng = rng or random
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._spill = tempfile.TemporaryFile(dir=self.path.parent, suffix='.jsonl.spill')
+        self._offsets: List[int] = []
+
+    @property
+    def count(self) -> int:
+        return len(self._offsets)
+
+    def write(self, example: Dict[str, Any]):
+        """Add one example."""
+        self._offsets.append(self._spill.tell())
+        self._spill.write((json.dumps(example) + '\n').encode('utf-8'))
+
+    def write_many(self, examples: Iterable[Dict[str, Any]]):
+        """Add examples, consuming them one at a time."""
+        for example in examples:
+            self.write(example)
+
+    def close(self):
+        """Shuffle and write the examples to the output file."""
+        if self._spill.closed:
+            return
+        order = list(range(len(self._offsets)))
+        self._rng.shuffle(order)
+        self._spill.flush()
+        with open(self.path, 'wb') as output:
+            for index in order:
+                self._spill.seek(self._offsets[index])
+                output.write(self._spill.readline())
+        self._spill.close()
+
+    def discard(self):
+        """Drop the spilled examples without writing the output file."""
+        self._spill.close()
+
+    def __enter__(self) -> 'ShuffledJsonlWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
@@ -0,0 +1,444 @@
+#!/usr/bin/env python3
+"""
+Rendering parsed vulnerabilities into ChatML training pairs
+
+Each parsed vulnerability becomes one training pair: a system prompt chosen by
+security category, a user prompt describing the finding, and an assistant
+response built from the fix generated during parsing.
+
+Prompt templates are module-level format strings, looked up by category, so
+rendering a finding is one dict lookup and one str.format call per message.
+render_training_pairs() can spread rendering over worker processes; pairs are
+still yielded in input order and the first failure (in input order) is raised,
+exactly as in a serial run.
+
+Usage:
+    for pair in render_training_pairs(iter_parsed_vulnerabilities(path), workers=4):
+        ...
+"""
+
+import logging
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Findings rendered per worker task (amortizes inter-process overhead)
+RENDER_CHUNK_SIZE = 256
+
+DEPENDENCY_CATEGORIES = ('dependency_vulnerabilities', 'dependency_security')
+
+SYSTEM_PROMPTS = {
+    'dependency': """You are a dependency security specialist.
+
+EXPERTISE: Version constraints, semver, Gradle/Maven/npm dependency management
+
+TASK: Provide precise dependency upgrade instructions
+- Specify exact versions (no ranges)
+- Use correct build syntax (Gradle Kotlin DSL, package.json)
+- Include security rationale
+
+OUTPUT: implementation("group:artifact:VERSION")""",
+
+    'code_vulnerability': """You are a secure code specialist.
+
+EXPERTISE: OWASP patterns, Kotlin/Java security APIs, WebAuthn
+
+TASK: Provide minimal code fixes that eliminate vulnerabilities
+- Preserve functionality
+- Use appropriate security libraries
+- Include security comments
+
+OUTPUT: Fixed code block with brief explanation""",
+
+    'web_security': """You are a web security specialist.
+
+EXPERTISE: HTTP security headers, CORS, session security, KTor framework
+
+TASK: Provide framework-native security configurations
+- Use KTor install() syntax
+- Follow strict security policies
+
+OUTPUT: KTor configuration code""",
+
+    'configuration_security': """You are a DevOps security specialist.
+
+EXPERTISE: GitHub Actions, IaC security, least-privilege permissions
+
+TASK: Provide minimal security configuration fixes
+- Use platform-specific syntax (YAML, HCL)
+- Preserve functionality
+
+OUTPUT: Corrected configuration""",
+}
+
+# Fallback for unknown categories
+DEFAULT_SYSTEM_PROMPT = """You are a cybersecurity analyst specializing in WebAuthn and FIDO2 security vulnerabilities.
+
+CRITICAL SECURITY GUIDELINES:
+- Always prioritize security in your analysis and recommendations
+- Provide actionable remediation steps for identified vulnerabilities
+- Consider the broader security implications of each finding
+- Maintain accuracy and precision in threat assessments
+- Follow responsible disclosure principles
+- Preserve safety guidelines and ethical analysis standards
+
+Your role is to analyze security vulnerabilities and provide comprehensive, actionable guidance for remediation."""
+
+_STRICT_CONSTRAINTS = """STRICT CONSTRAINTS:
+- Do NOT add sections beyond what's specified above
+- Do NOT include "Alternative Approaches" or similar sections
+- Code blocks: ONLY the fix, no surrounding context
+- Explanations: EXACTLY 2-3 sentences, no more
+- Follow the markdown format exactly as shown"""
+
+USER_PROMPT_TEMPLATES = {
+    # Dependency vulnerabilities (OSV, Trivy)
+    'dependency': """Vulnerability: {id}
+Severity: {severity}
+Tool: {tool}
+Package: {package}
+Current Version: {current_version}
+Fixed Version: {fixed_version}
+Description: {description}
+
+""" + _STRICT_CONSTRAINTS,
+
+    # Code vulnerabilities (Semgrep)
+    'code_vulnerability': """Vulnerability: {id}
+Severity: {severity}
+Tool: {tool}
+File: {file_path}
+Line: {line}
+Message: {message}
+
+Vulnerable Code:
+{vulnerable_code}
+
+""" + _STRICT_CONSTRAINTS,
+
+    # Web/HTTP security (ZAP)
+    'web_security': """Alert: {alert}
+Severity: {severity}
+Tool: {tool}
+URL: {uri}
+Description: {description}
+Solution: {solution}
+
+""" + _STRICT_CONSTRAINTS,
+
+    # Configuration security (Checkov)
+    'configuration_security': """Rule: {rule}
+Severity: {severity}
+Tool: {tool}
+File: {file_path}
+Config Type: {config_type}
+Message: {message}
+
+Current Configuration:
+{vulnerable_code}
+
+""" + _STRICT_CONSTRAINTS,
+}
+
+# Fallback for unknown categories
+DEFAULT_USER_PROMPT_TEMPLATE = """Fix the following security issue:
+
+ID: {id}
+Severity: {severity}
+Tool: {tool}
+Category: {category}
+Description: {description}"""
+
+
+def _template_key(category: str) -> str:
+    return 'dependency' if category in DEPENDENCY_CATEGORIES else category
+
+
+def create_system_prompt(category: str) -> str:
+    """
+    Create tool-specific system prompt based on security category.
+
+    Args:
+        category: Security category (dependency_vulnerabilities, code_vulnerability, etc.)
+
+    Returns:
+        Specialized system prompt optimized for the category
+    """
+    return SYSTEM_PROMPTS.get(_template_key(category), DEFAULT_SYSTEM_PROMPT)
+
+
+def create_vulnerability_prompt(vuln: Dict) -> str:
+    """
+    Create tool-specific user prompt based on vulnerability data.
+
+    Args:
+        vuln: Vulnerability dictionary with tool, security_category, and vulnerability details
+
+    Returns:
+        Formatted user prompt for the training pair
+
+    Raises:
+        ValueError: If a dependency vulnerability lacks its installed or fixed version
+    """
+    tool = vuln.get('tool', '')
+    category = vuln.get('security_category', 'unknown')
+    key = _template_key(category)
+
+    if key == 'dependency':
+        current_version = vuln.get('installed_version')
+        if not current_version:
+            raise ValueError(f"Installed version information missing in vulnerability data: ${vuln}")
+        fixed_version = vuln.get('fixed_version')
+        if not fixed_version:
+            raise ValueError(f"Fixed version information missing in vulnerability data: ${vuln}")
+        fields = {
+            'package': vuln.get('package_name', vuln.get('title', 'Unknown')),
+            'current_version': current_version,
+            'fixed_version': fixed_version,
+            'description': vuln.get('summary', vuln.get('description', vuln.get('message', 'No description'))),
+        }
+    elif key == 'code_vulnerability':
+        fields = {
+            'file_path': vuln.get('file_path', 'Unknown'),
+            'line': vuln.get('start', {}).get('line', 'Unknown'),
+            'message': vuln.get('message', 'No description'),
+            'vulnerable_code': vuln.get('code_context', {}).get('vulnerable_code', 'N/A'),
+        }
+    elif key == 'web_security':
+        fields = {
+            'alert': vuln.get('alert', 'Unknown'),
+            'uri': vuln.get('uri', 'Unknown'),
+            'description': vuln.get('description', 'No description'),
+            'solution': vuln.get('solution', 'No solution provided'),
+        }
+    elif key == 'configuration_security':
+        fields = {
+            'rule': vuln.get('rule_name', vuln.get('id', 'Unknown')),
+            'file_path': vuln.get('file_path', 'Unknown'),
+            'config_type': vuln.get('config_type', 'Unknown'),
+            'message': vuln.get('message', 'No description'),
+            'vulnerable_code': vuln.get('code_context', {}).get('vulnerable_code', 'N/A'),
+        }
+    else:
+        fields = {
+            'category': category,
+            'description': vuln.get('message', vuln.get('description', 'No description')),
+        }
+
+    template = USER_PROMPT_TEMPLATES.get(key, DEFAULT_USER_PROMPT_TEMPLATE)
+    return template.format(id=vuln.get('id', 'Unknown'), severity=vuln.get('severity', 'Unknown'),
+                           tool=tool, **fields)
+
+
+def format_assistant_response(fix_data: Dict) -> str:
+    """
+    Format the fix data into a comprehensive assistant response.
+
+    Args:
+        fix_data: Fix dictionary with description, fixed_code, explanation, and alternatives
+
+    Returns:
+        Formatted assistant response for the training pair
+    """
+    description = fix_data.get('description', '')
+    fixed_code = fix_data.get('fixed_code', '')
+    explanation = fix_data.get('explanation', '')
+    alternatives = fix_data.get('alternatives', [])
+
+    # Build comprehensive response
+    response_parts = []
+
+    # Primary fix
+    if description:
+        response_parts.append(f"## Fix: {description}\n")
+
+    if fixed_code:
+        response_parts.append(f"```\n{fixed_code}\n```\n")
+
+    if explanation:
+        response_parts.append(f"### Explanation\n{explanation}\n")
+
+    # Alternative approaches
+    if alternatives:
+        response_parts.append("### Alternative Approaches\n")
+        for i, alt in enumerate(alternatives, 1):
+            alt_desc = alt.get('description', '')
+            alt_code = alt.get('fixed_code', '')
+            alt_exp = alt.get('explanation', '')
+
+            if alt_desc:
+                response_parts.append(f"\n**Alternative {i}: {alt_desc}**\n")
+            if alt_code:
+                response_parts.append(f"```\n{alt_code}\n```\n")
+            if alt_exp:
+                response_parts.append(f"{alt_exp}\n")
+
+    return '\n'.join(response_parts).strip()
+
+
+def finding_location(vuln: Dict) -> str:
+    """Where a finding is: package@version for dependencies, else its file path or URL."""
+    if vuln.get('package_name'):
+        return f"{vuln['package_name']}@{vuln.get('installed_version', '')}"
+    return vuln.get('file_path') or vuln.get('path') or vuln.get('url') or ''
+
+
+def render_training_pair(vuln: Dict, include_location: bool = False) -> Optional[Dict[str, Any]]:
+    """
+    Render one parsed vulnerability (with its pre-generated fix) into a training pair.
+
+    With include_location, the metadata also records where the finding is (see
+    finding_location) - the hash split keys examples on it.
+
+    Returns:
+        Training pair in MLX-compatible chat format:
+        {
+            "messages": [
+                {"role": "system", "content": "..."},
+                {"role": "user", "content": "..."},
+                {"role": "assistant", "content": "..."}
+            ],
+            "metadata": {
+                "quality": "high",
+                "source": "generated",
+                "vulnerability_id": "...",
+                "location": "file path, URL or package@version" (only with include_location),
+                "tool": "osv|trivy|semgrep|zap|checkov",
+                "security_category": "...",
+                "confidence": 0.0-1.0,
+                ...
+            }
+        }
+        or None if the fix renders to an empty response.
+
+    Raises:
+        ValueError: If the id, tool or fix is missing
+        RuntimeError: If the prompts cannot be rendered (FAIL FAST)
+    """
+    # Vulnerabilities are now flat objects with pre-generated fixes
+    tool = vuln.get('tool')
+    vuln_id = vuln.get('id')
+    fix_data = vuln.get('fix')
+
+    if not vuln_id:
+        logger.error(f"Missing vulnerability ID in entry: {vuln}")
+        raise ValueError("Each vulnerability must have an 'id' field")
+
+    if not tool:
+        logger.error(f"Missing tool information for vulnerability {vuln_id}")
+        raise ValueError(f"Missing tool information for vulnerability {vuln_id}")
+
+    if not fix_data:
+        logger.error(f"No fix data found for {vuln_id} from {tool}")
+        raise ValueError(f"Missing fix data for vulnerability {vuln_id} from {tool}")
+
+    try:
+        # Get security category for tool-specific prompt generation
+        security_category = vuln.get('security_category', 'unknown')
+
+        # Generate tool-specific system prompt based on category
+        system_content = create_system_prompt(security_category)
+
+        # Generate tool-specific user prompt based on vulnerability category
+        user_content = create_vulnerability_prompt(vuln)
+
+        # Use the pre-generated fix from parsing phase
+        # Primary fix has description, fixed_code, and explanation
+        assistant_content = format_assistant_response(fix_data)
+    except Exception as e:
+        # FAIL FAST - don't suppress exceptions
+        logger.error(f"Could not generate training pair for {vuln_id}: {e}")
+        raise RuntimeError(f"Error generating training pair for vulnerability {vuln_id}: {e}")
+
+    if not assistant_content:
+        return None
+
+    metadata = {
+        "quality": "high",
+        "source": "generated",
+        "vulnerability_id": vuln_id,
+        "tool": tool,
+        "security_category": vuln.get('security_category', 'unknown'),
+        "confidence": fix_data.get('confidence', 0.7),
+        "chat_template": "chatml",
+        "security_framework": "webauthn-security-analysis"
+    }
+    if include_location:
+        metadata["location"] = finding_location(vuln)
+
+    return {
+        "messages": [
+            {"role": "system", "content": system_content},
+            {"role": "user", "content": user_content},
+            {"role": "assistant", "content": assistant_content}
+        ],
+        "metadata": metadata
+    }
+
+
+def _render_chunk(vulns: List[Dict], include_location: bool) -> Tuple[List[Dict[str, Any]], Optional[Exception]]:
+    """
+    Worker task: render a chunk of vulnerabilities (module-level so it can be pickled).
+
+    Returns:
+        (pairs rendered before the first failure, that failure or None), so the caller
+        yields exactly what a serial run would have yielded before raising
+    """
+    pairs = []
+    try:
+        for vuln in vulns:
+            pair = render_training_pair(vuln, include_location)
+            if pair:
+                pairs.append(pair)
+    except Exception as e:
+        return pairs, e
+    return pairs, None
+
+
+def render_training_pairs(vulns: Iterable[Dict], workers: int = 1,
+                          include_location: bool = False) -> Iterator[Dict[str, Any]]:
+    """
+    Render parsed vulnerabilities into training pairs, in input order.
+
+    Args:
+        vulns: Parsed vulnerabilities (consumed once, lazily)
+        workers: Number of worker processes (1 = render in this process). At most
+            2 * workers chunks of RENDER_CHUNK_SIZE findings are in flight at a time.
+        include_location: Record each finding's location in the pair metadata (see render_training_pair)
+
+    Yields:
+        Training pairs (findings whose fix renders to an empty response are skipped)
+
+    Raises:
+        ValueError, RuntimeError: From the first finding (in input order) that fails to render
+    """
+    if workers <= 1:
+        for vuln in vulns:
+            pair = render_training_pair(vuln, include_location)
+            if pair:
+                yield pair
+        return
+
+    vulns = iter(vulns)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        try:
+            while True:
+                while len(pending) < 2 * workers:
+                    chunk = list(islice(vulns, RENDER_CHUNK_SIZE))
+                    if not chunk:
+                        break
+                    pending.append(executor.submit(_render_chunk, chunk, include_location))
+                if not pending:
+                    return
+                pairs, error = pending.popleft().result()
+                yield from pairs
+                if error is not None:
+                    raise error
+        finally:
+            # FAIL FAST - don't render the rest after an error (or an abandoned generator)
+            for future in pending:
+                future.cancel()
@@ -8,12 +8,13 @@ Handles MLX data format requirements (train.jsonl/valid.jsonl).
 
 import json
 import logging
-import shutil
 from pathlib import Path
 from typing import Dict, Any, Optional
 from datetime import datetime
 from dataclasses import dataclass
 
+from augmentation_view import materialize_dataset
+
 logger = logging.getLogger(__name__)
 
 
@@ -213,6 +214,7 @@ class TrainingRun:
         Copy and rename datasets to MLX-required format for a specific stage.
 
         MLX LoRA expects train.jsonl and valid.jsonl in the training data directory.
+        Augmented examples stored in an augmentation view are regenerated into the copies.
 
         Args:
             stage_training_data_path: Path to stage's training data directory
@@ -232,10 +234,10 @@ class TrainingRun:
         valid_target = stage_training_data_path / "valid.jsonl"
 
         logger.info(f"   Copying {train_dataset.name} → train.jsonl")
-        shutil.copy2(train_dataset, train_target)
+        materialize_dataset(train_dataset, train_target)
 
         logger.info(f"   Copying {validation_dataset.name} → valid.jsonl")
-        shutil.copy2(validation_dataset, valid_target)
+        materialize_dataset(validation_dataset, valid_target)
 
         logger.info(f"   ✅ Training data prepared: {stage_training_data_path}")
         logger.info(f"      - train.jsonl: {train_target.stat().st_size} bytes")
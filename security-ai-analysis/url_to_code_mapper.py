@@ -10,6 +10,9 @@ This module provides the ability to:
 2. Map vulnerability URLs to actual code route handlers  
 3. Extract route handler context for enhanced training data
 
+Discovered routes are persisted per source file (keyed by mtime and size), so
+constructing a mapper only re-reads files that changed since the last run.
+
 Usage:
     from url_to_code_mapper import URLToCodeMapper
     
@@ -22,108 +25,255 @@ Usage:
 
 import re
 import json
+import os
+import tempfile
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 from urllib.parse import urlparse
 
+from config_manager import OLMoSecurityConfig
+from vulnerable_code_extractor import BUILD_OUTPUT_DIRS, DEFAULT_IGNORED_DIRS, VENDORED_DIRS, get_project_file_index
+
+# Bump when the persisted route index layout or route extraction changes
+ROUTE_INDEX_FORMAT_VERSION = 1
+
+# Ktor route patterns: get("/path"), post("/path"), etc.
+KOTLIN_ROUTE_PATTERN = re.compile(r'(get|post|put|delete|patch)\s*\(\s*"([^"]+)"\s*\)')
+
+# Express route patterns: app.get("/path"), router.post("/path"), etc.
+TYPESCRIPT_ROUTE_PATTERN = re.compile(r'(app|router)\.(get|post|put|delete|patch)\s*\(\s*["\']([^"\']+)["\']\s*,')
+
+# Directories never scanned for routes: route handlers are never vendored or generated
+ROUTE_IGNORED_DIRS = DEFAULT_IGNORED_DIRS | VENDORED_DIRS | BUILD_OUTPUT_DIRS
+
+# (file suffix, handler type, label) of every route source, in discovery order
+ROUTE_SOURCES = [
+    ('.kt', 'kotlin_ktor', 'Kotlin/Ktor'),
+    ('.ts', 'typescript_express', 'TypeScript/Express'),
+]
+
+
+def _extract_routes(source_file: Path, handler_type: str) -> List[Dict[str, Any]]:
+    """Find the route definitions in one Kotlin (Ktor) or TypeScript (Express) file."""
+    routes = []
+    try:
+        content = source_file.read_text(encoding='utf-8')
+    except (UnicodeDecodeError, OSError):
+        return routes  # Skip files that can't be read
+
+    for line_num, line in enumerate(content.split('\n'), 1):
+        if handler_type == 'kotlin_ktor':
+            matches = [(method, path) for method, path in KOTLIN_ROUTE_PATTERN.findall(line.strip())]
+        else:
+            matches = [(method, path) for _, method, path in TYPESCRIPT_ROUTE_PATTERN.findall(line.strip())]
+        for method, path in matches:
+            routes.append({
+                'method': method.upper(),
+                'path': path,
+                'line_number': line_num,
+                'route_definition': line.strip()
+            })
+    return routes
+
+
+def _split_path(path: str) -> List[str]:
+    """
+    Split a URL path into segments ('/' and '' have none).
+
+    A trailing slash becomes a final empty segment, so '/health/' and '/health'
+    stay distinct paths (matching is slash-sensitive, as in Ktor without
+    IgnoreTrailingSlash).
+    """
+    segments = [segment for segment in path.split('/') if segment]
+    if segments and path.endswith('/'):
+        segments.append('')
+    return segments
+
+
+class _RouteNode:
+    """One path segment level of a RouteTrie."""
+    __slots__ = ('static', 'param', 'tailcard', 'routes')
+
+    def __init__(self):
+        self.static: Dict[str, '_RouteNode'] = {}
+        self.param: Optional['_RouteNode'] = None      # {id} / :id - exactly one segment
+        self.tailcard: Optional['_RouteNode'] = None   # {path...} / * - the rest of the path
+        self.routes: List[Dict[str, Any]] = []         # Routes ending here, in discovery order
+
+
+class RouteTrie:
+    """
+    Segment trie over route paths, built once and matched in O(path length).
+
+    Supports Ktor ({param}, {param?}, {param...}) and Express (:param, :param?, *)
+    placeholders; an optional parameter matches one segment or none. Static
+    segments are preferred over parameters, and parameters over tailcards, at
+    every level - so an exact route always wins over a parametric one, and a
+    more specific route over a more general one. A trailing slash is significant
+    (see _split_path).
+    """
+
+    def __init__(self, routes: List[Dict[str, Any]]):
+        self._root = _RouteNode()
+        for route in routes:
+            self.add(route)
+
+    @staticmethod
+    def _segment_kind(segment: str) -> str:
+        if segment == '*' or (segment.startswith('{') and segment.endswith('...}')):
+            return 'tailcard'
+        if (segment.startswith(':') and segment.endswith('?')) or (segment.startswith('{') and segment.endswith('?}')):
+            return 'optional'
+        if segment.startswith(':') or (segment.startswith('{') and segment.endswith('}')):
+            return 'param'
+        return 'static'
+
+    def add(self, route: Dict[str, Any]):
+        """Insert a route (a dict with a 'path' key)."""
+        # An optional parameter forks the route: it ends both with and without that segment
+        nodes = [self._root]
+        for segment in _split_path(route['path']):
+            kind = self._segment_kind(segment)
+            if kind == 'static':
+                nodes = [node.static.setdefault(segment, _RouteNode()) for node in nodes]
+                continue
+            if kind == 'tailcard':
+                for node in nodes:
+                    node.tailcard = node.tailcard or _RouteNode()
+                nodes = [node.tailcard for node in nodes]
+                break  # A tailcard consumes the rest of the path
+            for node in nodes:
+                node.param = node.param or _RouteNode()
+            params = [node.param for node in nodes]
+            nodes = list(dict.fromkeys(nodes + params)) if kind == 'optional' else params
+        for node in nodes:
+            node.routes.append(route)
+
+    def match(self, path: str) -> Optional[Dict[str, Any]]:
+        """Return the most specific route matching a URL path, or None."""
+        return self._match(self._root, _split_path(path), 0)
+
+    def _match(self, node: _RouteNode, segments: List[str], depth: int) -> Optional[Dict[str, Any]]:
+        if depth == len(segments):
+            if node.routes:
+                return node.routes[0]
+            # Ktor tailcards also match an empty remainder
+            return node.tailcard.routes[0] if node.tailcard and node.tailcard.routes else None
+        child = node.static.get(segments[depth])
+        if child:
+            route = self._match(child, segments, depth + 1)
+            if route:
+                return route
+        # Parameters never match the empty trailing-slash segment
+        if node.param and segments[depth]:
+            route = self._match(node.param, segments, depth + 1)
+            if route:
+                return route
+        if node.tailcard and node.tailcard.routes:
+            return node.tailcard.routes[0]
+        return None
+
 
 class URLToCodeMapper:
     """Maps vulnerability URLs to actual source code route handlers."""
     
-    def __init__(self, project_root: Path):
+    def __init__(self, project_root: Path, index_file: Optional[Path] = None, use_index: bool = True):
         """
         Initialize URL-to-code mapper.
         
         Args:
             project_root: Root directory of the project to scan for routes
+            index_file: Persisted route index (default: OLMoSecurityConfig().route_index_file)
+            use_index: If False, scan every source file and persist nothing
         """
         self.project_root = Path(project_root)
-        self.route_cache = {}  # Cache discovered routes for performance
+        if use_index and index_file is None:
+            index_file = OLMoSecurityConfig().route_index_file
+        self.index_file = Path(index_file) if use_index else None
+        self.route_cache = {}  # URL path → matched route (or None), for repeated alert URLs
         self.route_patterns = self._discover_route_patterns()
+        self.route_trie = RouteTrie(self.route_patterns)
         
         print(f"🗺️ URL-to-Code Mapper initialized for project: {self.project_root}")
         print(f"   Discovered {len(self.route_patterns)} route patterns")
     
     def _discover_route_patterns(self) -> List[Dict[str, Any]]:
-        """Discover all route definitions in the codebase."""
-        
+        """
+        Discover all route definitions in the codebase.
+
+        Routes of files unchanged since the last run (same mtime and size) come
+        from the persisted route index; only new or changed files are read.
+        Vendored and build directories are skipped (see ROUTE_IGNORED_DIRS).
+        """
+        index = self._load_route_index()
+        file_index = get_project_file_index(self.project_root, ignored_dirs=ROUTE_IGNORED_DIRS)
+        refreshed_files = {}
+        rescanned = 0
         route_patterns = []
-        
-        # Kotlin/Ktor route patterns
-        print("🔍 Discovering Kotlin/Ktor routes...")
-        kotlin_routes = self._find_kotlin_routes()
-        route_patterns.extend(kotlin_routes)
-        print(f"   Found {len(kotlin_routes)} Kotlin routes")
-        
-        # TypeScript/Express route patterns (for web-test-client)
-        print("🔍 Discovering TypeScript/Express routes...")
-        typescript_routes = self._find_typescript_routes()
-        route_patterns.extend(typescript_routes)
-        print(f"   Found {len(typescript_routes)} TypeScript routes")
-        
+
+        for suffix, handler_type, label in ROUTE_SOURCES:
+            print(f"🔍 Discovering {label} routes...")
+            found = 0
+            for source_file in file_index.files_with_suffix(suffix):
+                relative_path = source_file.relative_to(self.project_root).as_posix()
+                try:
+                    stat = source_file.stat()
+                except OSError:
+                    continue
+                entry = index.get(relative_path)
+                if not entry or entry['mtime_ns'] != stat.st_mtime_ns or entry['size'] != stat.st_size:
+                    rescanned += 1
+                    entry = {
+                        'mtime_ns': stat.st_mtime_ns,
+                        'size': stat.st_size,
+                        'routes': _extract_routes(source_file, handler_type)
+                    }
+                refreshed_files[relative_path] = entry
+                for route in entry['routes']:
+                    route_patterns.append({**route, 'file_path': str(source_file), 'handler_type': handler_type})
+                    found += 1
+            print(f"   Found {found} {label} routes")
+
+        print(f"   Route index: {len(refreshed_files) - rescanned} of {len(refreshed_files)} files unchanged")
+        if rescanned or refreshed_files.keys() != index.keys():
+            self._save_route_index(refreshed_files)
+
         return route_patterns
-    
-    def _find_kotlin_routes(self) -> List[Dict[str, Any]]:
-        """Find Ktor route definitions in Kotlin files."""
-        
-        kotlin_routes = []
-        kotlin_files = list(self.project_root.rglob("**/*.kt"))
-        
-        # Ktor route patterns: get("/path"), post("/path"), etc.
-        route_pattern = re.compile(r'(get|post|put|delete|patch)\s*\(\s*"([^"]+)"\s*\)')
-        
-        for kotlin_file in kotlin_files:
-            try:
-                content = kotlin_file.read_text(encoding='utf-8')
-                lines = content.split('\n')
-                
-                for line_num, line in enumerate(lines, 1):
-                    matches = route_pattern.findall(line.strip())
-                    for method, path in matches:
-                        kotlin_routes.append({
-                            'method': method.upper(),
-                            'path': path,
-                            'file_path': str(kotlin_file),
-                            'line_number': line_num,
-                            'handler_type': 'kotlin_ktor',
-                            'route_definition': line.strip()
-                        })
-                        
-            except (UnicodeDecodeError, OSError):
-                continue  # Skip files that can't be read
-                
-        return kotlin_routes
-    
-    def _find_typescript_routes(self) -> List[Dict[str, Any]]:
-        """Find Express/Node.js route definitions in TypeScript files."""
-        
-        typescript_routes = []
-        ts_files = list(self.project_root.rglob("**/*.ts"))
-        
-        # Express route patterns: app.get("/path"), router.post("/path"), etc.
-        route_pattern = re.compile(r'(app|router)\.(get|post|put|delete|patch)\s*\(\s*["\']([^"\']+)["\']\s*,')
-        
-        for ts_file in ts_files:
-            try:
-                content = ts_file.read_text(encoding='utf-8')
-                lines = content.split('\n')
-                
-                for line_num, line in enumerate(lines, 1):
-                    matches = route_pattern.findall(line.strip())
-                    for router_type, method, path in matches:
-                        typescript_routes.append({
-                            'method': method.upper(),
-                            'path': path,
-                            'file_path': str(ts_file),
-                            'line_number': line_num,
-                            'handler_type': 'typescript_express',
-                            'route_definition': line.strip()
-                        })
-                        
-            except (UnicodeDecodeError, OSError):
-                continue  # Skip files that can't be read
-                
-        return typescript_routes
+
+    def _load_route_index(self) -> Dict[str, Dict[str, Any]]:
+        """Load the persisted per-file route table (empty if missing, stale or unreadable)."""
+        if not self.index_file:
+            return {}
+        try:
+            with open(self.index_file, 'r') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"⚠️ Ignoring unreadable route index {self.index_file}: {e}")
+            return {}
+        if (data.get('format_version') != ROUTE_INDEX_FORMAT_VERSION or
+                data.get('project_root') != str(self.project_root.resolve())):
+            return {}
+        return data.get('files', {})
+
+    def _save_route_index(self, files: Dict[str, Dict[str, Any]]):
+        """Persist the route table atomically, so concurrent readers never see a partial file."""
+        if not self.index_file:
+            return
+        self.index_file.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.index_file.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump({
+                    'format_version': ROUTE_INDEX_FORMAT_VERSION,
+                    'project_root': str(self.project_root.resolve()),
+                    'files': files
+                }, f)
+            os.replace(temp_path, self.index_file)
+        except BaseException:
+            Path(temp_path).unlink(missing_ok=True)
+            raise
     
     def find_route_handler(self, vulnerability_url: str) -> Optional[Dict[str, Any]]:
         """Map vulnerability URL to actual code route handler."""
@@ -135,39 +285,21 @@ class URLToCodeMapper:
         print(f"🎯 Mapping URL '{vulnerability_url}' to route handler...")
         print(f"   Extracted path: '{target_path}'")
         
-        # Find matching route patterns
-        matching_routes = []
-        for route in self.route_patterns:
-            if self._path_matches(route['path'], target_path):
-                matching_routes.append(route)
+        if target_path in self.route_cache:
+            best_match = self.route_cache[target_path]
+        else:
+            # Exact routes win over parametric ones (see RouteTrie)
+            best_match = self.route_trie.match(target_path)
+            self.route_cache[target_path] = best_match
         
-        if not matching_routes:
+        if not best_match:
             print(f"   ❌ No matching routes found for path: {target_path}")
             return None
         
-        # Prefer exact matches over pattern matches
-        exact_matches = [r for r in matching_routes if r['path'] == target_path]
-        if exact_matches:
-            best_match = exact_matches[0]
-            print(f"   ✅ Exact match found: {best_match['file_path']}:{best_match['line_number']}")
-            return best_match
-        
-        # Return best pattern match (shortest path wins for specificity)
-        best_match = min(matching_routes, key=lambda r: len(r['path']))
-        print(f"   ✅ Pattern match found: {best_match['file_path']}:{best_match['line_number']}")
+        match_type = "Exact" if best_match['path'] == target_path else "Pattern"
+        print(f"   ✅ {match_type} match found: {best_match['file_path']}:{best_match['line_number']}")
         return best_match
     
-    def _path_matches(self, route_path: str, target_path: str) -> bool:
-        """Check if route path matches target path (handles path parameters)."""
-        
-        # Exact match
-        if route_path == target_path:
-            return True
-        
-        # Handle path parameters: /user/{id} matches /user/123
-        pattern = re.escape(route_path).replace(r'\{[^}]+\}', r'[^/]+')
-        return bool(re.fullmatch(pattern, target_path))
-    
     def get_route_statistics(self) -> Dict[str, Any]:
         """Get statistics about discovered routes."""
         
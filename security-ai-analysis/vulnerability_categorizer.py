@@ -4,17 +4,33 @@ Vulnerability Categorizer - Security Domain Classification
 
 Standalone module for categorizing vulnerabilities by security domain.
 Used across multiple phases to ensure consistent categorization.
+
+categorize_batch() categorizes a list of findings in one call, resolving each
+tool once and memoizing results by the fields categorization reads, so the
+many findings of a report that share them (same advisory, rule, file) are
+only categorized once.
 """
 
 import logging
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+from keyword_matcher import KeywordMatcher
+from vulnerable_code_extractor import BoundedLRUCache
+
+# Default number of memoized categorization results
+DEFAULT_CATEGORY_CACHE_SIZE = 4096
 
 
 class VulnerabilityCategorizor:
     """Categorizes vulnerabilities by security domain for specialized training."""
 
-    def __init__(self):
+    def __init__(self, cache_size: int = DEFAULT_CATEGORY_CACHE_SIZE):
+        """
+        Args:
+            cache_size: Maximum number of memoized results used by categorize_batch
+        """
         self.logger = logging.getLogger(__name__)
+        self.category_cache = BoundedLRUCache(cache_size)
 
         # Tool-to-category mapping based on security scanner origin
         self.tool_category_map = {
@@ -49,6 +65,7 @@ class VulnerabilityCategorizor:
             'webauthn', 'fido', 'authenticator', 'credential',
             'attestation', 'assertion', 'challenge', 'passkey'
         ]
+        self.webauthn_matcher = KeywordMatcher({'webauthn_security': self.webauthn_patterns})
 
     def categorize_vulnerability(self, vulnerability: Dict[str, Any]) -> Tuple[str, float]:
         """
@@ -90,6 +107,52 @@ class VulnerabilityCategorizor:
 
         return base_category, confidence
 
+    def categorize_batch(self, vulnerabilities: Iterable[Dict[str, Any]]) -> Tuple[List[str], List[float]]:
+        """
+        Categorize many vulnerabilities at once (see categorize_vulnerability).
+
+        Args:
+            vulnerabilities: Vulnerability data with tool, description, file_path etc.
+
+        Returns:
+            Tuple of (categories, confidence_scores), parallel to the input
+
+        Raises:
+            ValueError: If any tool is missing or unknown (fail-fast behavior)
+        """
+        categories: List[str] = []
+        confidences: List[float] = []
+        for vulnerability in vulnerabilities:
+            tool = vulnerability.get('tool', '').lower()
+            if tool not in self.tool_category_map:
+                # Raises the same error as single categorization
+                self.categorize_vulnerability(vulnerability)
+
+            key = self._categorization_key(tool, vulnerability)
+            result = self.category_cache.get(key) if key is not None else None
+            if result is None:
+                result = self.categorize_vulnerability(vulnerability)
+                if key is not None:
+                    self.category_cache.put(key, result)
+            categories.append(result[0])
+            confidences.append(result[1])
+        return categories, confidences
+
+    def _categorization_key(self, tool: str, vulnerability: Dict[str, Any]) -> Optional[Tuple]:
+        """
+        Memoization key: every field categorization reads for this tool.
+
+        Returns None (not memoized) unless the text fields are plain strings.
+        """
+        severity = vulnerability.get('severity')
+        text_fields = [vulnerability.get('description', '')]
+        if self.tool_category_map[tool] == 'code_vulnerabilities':
+            text_fields += [vulnerability.get('message', ''), vulnerability.get('file_path', ''),
+                            str(vulnerability.get('metadata', {}))]
+        if not isinstance(severity, (str, type(None))) or not all(isinstance(field, str) for field in text_fields):
+            return None
+        return (tool, severity, *text_fields)
+
     def _check_webauthn_patterns(self, vulnerability: Dict[str, Any]) -> Tuple[str, float]:
         """Check if code vulnerability is WebAuthn-specific."""
         text_content = ' '.join([
@@ -99,8 +162,7 @@ class VulnerabilityCategorizor:
             str(vulnerability.get('metadata', {}))
         ]).lower()
 
-        webauthn_matches = sum(1 for pattern in self.webauthn_patterns
-                              if pattern in text_content)
+        webauthn_matches = self.webauthn_matcher.count(text_content, 'webauthn_security')
 
         if webauthn_matches >= 2:  # Strong WebAuthn indication
             return 'webauthn_security', min(0.8 + (webauthn_matches * 0.05), 1.0)
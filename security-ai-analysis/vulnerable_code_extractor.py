@@ -9,19 +9,613 @@ Classes:
 - VulnerableCodeExtractor: Main class for extracting code context from vulnerabilities
 - CodeContext: Data class representing extracted code context
 - ContextExtractionResult: Result of context extraction with metadata
+- ProjectFileIndex: One-time filename → paths index used for scan path resolution
+- FileScopeIndex: Per-file function/class scope index used for context lookups
+- SourceFile: A project file read once (memory-mapped when large) with line access
+- BoundedLRUCache: Size-bounded LRU map with hit/miss statistics
 
 Usage:
     extractor = VulnerableCodeExtractor()
     context = extractor.extract_vulnerability_context(vulnerability_data)
+
+    # Many findings: each source file is read and indexed once
+    results = extractor.extract_vulnerability_contexts(vulnerabilities)
 """
 
+import bisect
+import fnmatch
+import io
 import logging
+import mmap
 import os
 import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any, NamedTuple
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Any, NamedTuple, Union
 from dataclasses import dataclass, field
 
+# Directories never descended into when indexing project files: VCS metadata
+# and tool caches, which never hold the sources security scanners report on.
+DEFAULT_IGNORED_DIRS = frozenset({
+    '.git', '.gradle', '.idea', '.venv', 'venv', '__pycache__',
+    '.pytest_cache', '.mypy_cache', '.ruff_cache', '.tox', '.nox',
+})
+
+# Vendored dependencies and build outputs: usually the largest trees in a checkout.
+# Each caller decides whether to index them - findings can point into generated
+# sources (e.g. Gradle build/generated), but never into node_modules.
+VENDORED_DIRS = frozenset({'node_modules'})
+BUILD_OUTPUT_DIRS = frozenset({'build', 'dist', 'target'})
+
+
+def _load_gitignore_patterns(root: Path) -> List[Tuple[str, bool]]:
+    """
+    Load simple name patterns from the root .gitignore.
+
+    Only plain glob patterns are supported (no negation); this is enough to keep
+    the index out of caches and generated files.
+
+    Returns:
+        List of (pattern, anchored) tuples. Anchored patterns only match
+        entries directly under the root.
+    """
+    gitignore = root / '.gitignore'
+    patterns = []
+    try:
+        with open(gitignore, 'r', encoding='utf-8') as f:
+            for raw_line in f:
+                line = raw_line.strip()
+                if not line or line.startswith(('#', '!')):
+                    continue
+                anchored = line.startswith('/')
+                line = line.strip('/')
+                if not line or '/' in line:
+                    continue
+                patterns.append((line, anchored))
+    except OSError:
+        pass
+    return patterns
+
+
+class ProjectFileIndex:
+    """
+    Filename → paths index over a project tree.
+
+    Built once with a single os.scandir walk that honors ignore rules, so path
+    resolution is a dictionary lookup instead of a recursive glob per candidate.
+    The modification time of every walked directory is recorded, so is_current()
+    can tell whether files were added, removed or renamed since.
+    """
+
+    def __init__(self, root: Path, excluded_paths: Optional[List[Path]] = None,
+                 ignored_dirs: frozenset = DEFAULT_IGNORED_DIRS):
+        """
+        Build the index.
+
+        Args:
+            root: Directory to index
+            excluded_paths: Subtrees to skip entirely (e.g. an already indexed project)
+            ignored_dirs: Directory names that are never descended into
+        """
+        self.root = Path(root)
+        self.ignored_dirs = ignored_dirs
+        self._excluded = {os.path.normpath(str(p)) for p in (excluded_paths or [])}
+        self._ignore_patterns = _load_gitignore_patterns(self.root)
+        self._files_by_name: Dict[str, List[Path]] = {}
+        self._dir_mtimes: Dict[str, int] = {}
+        self.file_count = 0
+        self._build()
+
+    def _is_ignored(self, name: str, is_root_entry: bool) -> bool:
+        """Check an entry name against the ignore rules."""
+        for pattern, anchored in self._ignore_patterns:
+            if anchored and not is_root_entry:
+                continue
+            if fnmatch.fnmatch(name, pattern):
+                return True
+        return False
+
+    def _build(self):
+        """Walk the tree once (pre-order, sorted) and record every file by name."""
+        root_str = str(self.root)
+        stack = [root_str]
+
+        while stack:
+            current = stack.pop()
+            is_root = current == root_str
+            try:
+                # Before listing, so an entry added during the walk makes the index stale
+                self._dir_mtimes[current] = os.stat(current).st_mtime_ns
+                with os.scandir(current) as it:
+                    entries = sorted(it, key=lambda e: e.name)
+            except OSError:
+                continue
+
+            subdirs = []
+            for entry in entries:
+                if self._is_ignored(entry.name, is_root):
+                    continue
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name in self.ignored_dirs or os.path.normpath(entry.path) in self._excluded:
+                            continue
+                        subdirs.append(entry.path)
+                    elif entry.is_file():
+                        self._files_by_name.setdefault(entry.name, []).append(Path(entry.path))
+                        self.file_count += 1
+                except OSError:
+                    continue
+
+            # Push in reverse so directories are visited in sorted order
+            stack.extend(reversed(subdirs))
+
+    def is_current(self) -> bool:
+        """Check (one stat per walked directory) that no directory changed since the index was built."""
+        for directory, mtime in self._dir_mtimes.items():
+            try:
+                if os.stat(directory).st_mtime_ns != mtime:
+                    return False
+            except OSError:
+                return False
+        return True
+
+    def find(self, filename: str) -> List[Path]:
+        """Return all indexed paths with the given file name (empty list if none)."""
+        return list(self._files_by_name.get(filename, ()))
+
+    def files_with_suffix(self, suffix: str) -> List[Path]:
+        """Return all indexed paths whose name ends with suffix (e.g. '.kt'), sorted."""
+        return sorted(path for name, paths in self._files_by_name.items()
+                      if name.endswith(suffix) for path in paths)
+
+
+_file_index_registry: Dict[Tuple[str, Tuple[str, ...], frozenset], ProjectFileIndex] = {}
+_file_index_lock = threading.Lock()
+
+
+def get_project_file_index(root: Path, excluded_paths: Optional[List[Path]] = None,
+                           ignored_dirs: frozenset = DEFAULT_IGNORED_DIRS) -> ProjectFileIndex:
+    """
+    Get the shared ProjectFileIndex for a directory and ignore set, building it on first use.
+
+    Every extractor in a process (and therefore every parser in a run) shares
+    the same index, so the project tree is walked once as long as it does not
+    change. A registered index whose directories changed since it was built
+    (see ProjectFileIndex.is_current) is rebuilt. Callers keep the index they
+    get for their own lifetime instead of calling this per lookup.
+    """
+    key = (os.path.normpath(str(root)),
+           tuple(sorted(os.path.normpath(str(p)) for p in (excluded_paths or []))),
+           frozenset(ignored_dirs))
+    with _file_index_lock:
+        index = _file_index_registry.get(key)
+        if index is None or not index.is_current():
+            index = ProjectFileIndex(root, excluded_paths=excluded_paths, ignored_dirs=key[2])
+            _file_index_registry[key] = index
+        return index
+
+
+class BoundedLRUCache:
+    """
+    Thread-safe, size-bounded LRU map with hit/miss statistics.
+
+    None is a valid cached value (e.g. a scan path known not to resolve to a
+    project file); use get() with a sentinel default to tell it from a miss.
+    """
+
+    def __init__(self, max_size: int, on_evict: Optional[Callable[[Any, Any], None]] = None):
+        """
+        Args:
+            max_size: Maximum number of entries
+            on_evict: Called with (key, value) of every entry evicted to make room,
+                e.g. to release resources the value holds
+        """
+        if max_size < 1:
+            raise ValueError(f"Cache size must be positive, got {max_size}")
+        self.max_size = max_size
+        self._on_evict = on_evict
+        self._entries: 'OrderedDict[Any, Any]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        """Return the cached value for key (marking it most recently used), or default."""
+        with self._lock:
+            try:
+                value = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            if value is None:
+                self.negative_hits += 1
+            return value
+
+    def put(self, key: Any, value: Any):
+        """Cache a value, evicting the least recently used entry when full."""
+        evicted = None
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_size:
+                evicted = self._entries.popitem(last=False)
+                self.evictions += 1
+        if evicted is not None and self._on_evict is not None:
+            self._on_evict(*evicted)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def items(self) -> List[Tuple[Any, Any]]:
+        """Snapshot of the cached entries, least recently used first."""
+        with self._lock:
+            return list(self._entries.items())
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'negative_hits': self.negative_hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0,
+        }
+
+
+class _LexicalSyntax(NamedTuple):
+    """Comment and string literal delimiters of a language."""
+    line_comment: str
+    block_comment: Optional[Tuple[str, str]]
+    # (opening delimiter, closing delimiter, may span lines, backslash escapes)
+    strings: Tuple[Tuple[str, str, bool, bool], ...]
+
+
+_C_BLOCK_COMMENT = ('/*', '*/')
+_QUOTED_STRINGS = (('"', '"', False, True), ("'", "'", False, True))
+
+LEXICAL_SYNTAX = {
+    'kotlin': _LexicalSyntax('//', _C_BLOCK_COMMENT, (('"""', '"""', True, False),) + _QUOTED_STRINGS),
+    'java': _LexicalSyntax('//', _C_BLOCK_COMMENT, (('"""', '"""', True, True),) + _QUOTED_STRINGS),
+    'javascript': _LexicalSyntax('//', _C_BLOCK_COMMENT, (('`', '`', True, True),) + _QUOTED_STRINGS),
+    'typescript': _LexicalSyntax('//', _C_BLOCK_COMMENT, (('`', '`', True, True),) + _QUOTED_STRINGS),
+    'python': _LexicalSyntax('#', None, (('"""', '"""', True, True), ("'''", "'''", True, True)) + _QUOTED_STRINGS),
+}
+
+
+class _CodeLexer:
+    """
+    Line-by-line lexer that reports the braces which are code.
+
+    Braces inside string literals and comments are skipped. State carries over
+    between lines for block comments and multi-line strings.
+    """
+
+    def __init__(self, syntax: _LexicalSyntax):
+        openers = [syntax.line_comment] + [s[0] for s in syntax.strings]
+        # (closing regex, may span lines) for everything the lexer can be inside of
+        self._closers: Dict[str, Tuple[re.Pattern, bool]] = {}
+        if syntax.block_comment:
+            openers.append(syntax.block_comment[0])
+            self._closers[syntax.block_comment[0]] = (re.compile(re.escape(syntax.block_comment[1])), True)
+        for opening, closing, multiline, escapes in syntax.strings:
+            closing_pattern = (r'\\.|' if escapes else '') + re.escape(closing)
+            self._closers[opening] = (re.compile(closing_pattern), multiline)
+        # Longest delimiters first, so '"""' is not lexed as '"'
+        self._code_token = re.compile(
+            '|'.join(re.escape(o) for o in sorted(set(openers), key=len, reverse=True)) + r'|[{}]'
+        )
+        self._line_comment = syntax.line_comment
+        self.state: Optional[str] = None  # Opening delimiter of the literal/comment we are inside
+
+    @property
+    def in_code(self) -> bool:
+        return self.state is None
+
+    def braces(self, line: str) -> Iterator[str]:
+        """Yield the code braces of a line, in order, updating the lexer state."""
+        pos = 0
+        while pos < len(line):
+            if self.state is None:
+                match = self._code_token.search(line, pos)
+                if match is None:
+                    return
+                token = match.group()
+                pos = match.end()
+                if token in '{}':
+                    yield token
+                elif token == self._line_comment:
+                    return
+                else:
+                    self.state = token
+            else:
+                closing, multiline = self._closers[self.state]
+                match = closing.search(line, pos)
+                if match is None:
+                    if not multiline:
+                        self.state = None  # Unterminated single-line literal
+                    return
+                pos = match.end()
+                if not match.group().startswith('\\'):
+                    self.state = None
+        if self.state is not None and not self._closers[self.state][1]:
+            self.state = None
+
+
+def _function_name(match: re.Match) -> Optional[str]:
+    """Function name of a declaration match: the first group that is not indentation."""
+    for group in match.groups():
+        if group and group.strip() and not group.startswith((' ', '\t')):
+            return group.strip()
+    return None
+
+
+class FileScopeIndex:
+    """
+    Function and class declarations of one source file, indexed for line lookups.
+
+    Built with a single pass over the file: declarations are matched once per
+    line and function extents come from brace tracking (or indentation for
+    Python) that ignores strings and comments. "Which function/class encloses
+    line N" is then a binary search, however many findings hit the file.
+    """
+
+    def __init__(self, file_lines: List[str], language: str,
+                 function_patterns: List[re.Pattern], class_patterns: List[re.Pattern]):
+        """
+        Build the index.
+
+        Args:
+            file_lines: Lines of the file (as returned by readlines())
+            language: Language name, selects comment/string syntax and scoping rules
+            function_patterns: Compiled function declaration patterns for the language
+            class_patterns: Compiled class declaration patterns for the language
+        """
+        self.file_lines = file_lines
+        self._function_patterns = function_patterns
+        self._class_patterns = class_patterns
+
+        # Functions, sorted by start line (0-indexed, inclusive)
+        self._function_starts: List[int] = []
+        self._function_ends: List[int] = []
+        self._function_names: List[str] = []
+        # Class declarations, sorted by line
+        self._class_lines: List[int] = []
+        self._class_names: List[str] = []
+
+        lexer = _CodeLexer(LEXICAL_SYNTAX.get(language, LEXICAL_SYNTAX['java']))
+        if language == 'python':
+            self._build_indented(lexer)
+        else:
+            self._build_braced(lexer)
+        self._function_parents = self._link_parents()
+
+    def _match_declarations(self, line_idx: int) -> Optional[int]:
+        """Record declarations on a line; returns the new function's position, if any."""
+        line = self.file_lines[line_idx]
+        for pattern in self._class_patterns:
+            match = pattern.search(line)
+            if match and match.groups()[-1]:
+                self._class_lines.append(line_idx)
+                self._class_names.append(match.groups()[-1])
+                break
+        for pattern in self._function_patterns:
+            match = pattern.search(line)
+            if match:
+                name = _function_name(match)
+                if name:
+                    self._function_starts.append(line_idx)
+                    self._function_ends.append(len(self.file_lines) - 1)
+                    self._function_names.append(name)
+                    return len(self._function_starts) - 1
+        return None
+
+    def _build_braced(self, lexer: _CodeLexer):
+        """
+        Brace languages: a function extends from its declaration line to the brace
+        closing the first block opened on or after that line.
+        """
+        pending: List[int] = []       # Functions whose body has not been opened yet
+        open_blocks: List[List[int]] = []  # Per open brace: functions it closes
+        for i, line in enumerate(self.file_lines):
+            if lexer.in_code:
+                function = self._match_declarations(i)
+                if function is not None:
+                    pending.append(function)
+            for brace in lexer.braces(line):
+                if brace == '{':
+                    open_blocks.append(pending)
+                    pending = []
+                else:
+                    # A function without a body (abstract, expression-bodied) ends on its own line
+                    for function in pending:
+                        self._function_ends[function] = self._function_starts[function]
+                    pending = []
+                    if open_blocks:
+                        for function in open_blocks.pop():
+                            self._function_ends[function] = i
+        # Unclosed functions run to the end of the file (their default end)
+
+    def _build_indented(self, lexer: _CodeLexer):
+        """Python: a function extends until the next code line indented at or below its declaration."""
+        open_functions: List[Tuple[int, int]] = []  # (indentation, function)
+        for i, line in enumerate(self.file_lines):
+            starts_in_code = lexer.in_code
+            for _ in lexer.braces(line):
+                pass
+            stripped = line.strip()
+            if not starts_in_code or not stripped or stripped.startswith('#'):
+                continue
+            indent = len(line) - len(line.lstrip())
+            while open_functions and indent <= open_functions[-1][0]:
+                self._function_ends[open_functions.pop()[1]] = i - 1
+            function = self._match_declarations(i)
+            if function is not None:
+                open_functions.append((indent, function))
+
+    def _link_parents(self) -> List[int]:
+        """
+        For each function, the closest earlier-starting function that ends after it (-1 if none).
+
+        Lookups follow these links outwards from the last function starting at
+        or before a line; every function skipped over ends before the line.
+        """
+        parents = []
+        stack: List[int] = []
+        for k, end in enumerate(self._function_ends):
+            while stack and self._function_ends[stack[-1]] <= end:
+                stack.pop()
+            parents.append(stack[-1] if stack else -1)
+            stack.append(k)
+        return parents
+
+    def function_context(self, line_idx: int) -> Dict[str, Any]:
+        """
+        Innermost function containing a line (0-indexed).
+
+        Returns:
+            Dict with name, start_line, end_line (1-indexed) and code, or {} if none
+        """
+        k = bisect.bisect_right(self._function_starts, line_idx) - 1
+        while k >= 0 and self._function_ends[k] < line_idx:
+            k = self._function_parents[k]
+        if k < 0:
+            return {}
+        start, end = self._function_starts[k], self._function_ends[k]
+        return {
+            'name': self._function_names[k],
+            'start_line': start + 1,  # Convert to 1-indexed
+            'end_line': end + 1,
+            'code': ''.join(self.file_lines[start:end + 1]).rstrip()
+        }
+
+    def class_context(self, line_idx: int) -> Dict[str, Any]:
+        """
+        Nearest class declaration at or above a line (0-indexed).
+
+        Returns:
+            Dict with name, start_line (1-indexed) and the declaration line as code, or {} if none
+        """
+        k = bisect.bisect_right(self._class_lines, line_idx) - 1
+        if k < 0:
+            return {}
+        class_line = self._class_lines[k]
+        return {
+            'name': self._class_names[k],
+            'start_line': class_line + 1,  # Convert to 1-indexed
+            'code': self.file_lines[class_line].rstrip()
+        }
+
+
+# Scan path → resolved project file entries kept per extractor
+DEFAULT_PATH_CACHE_SIZE = 4096
+
+# Source files kept open (read, or memory-mapped when large) and scope indexes kept per extractor
+DEFAULT_SOURCE_CACHE_SIZE = 64
+
+# Files at least this large are memory-mapped and decoded line by line on demand
+MMAP_THRESHOLD_BYTES = 1024 * 1024
+
+_LINE_BREAK = re.compile(rb'\r\n|\r|\n')
+
+
+class SourceFile:
+    """
+    A project file read once, with random access to its lines.
+
+    Lines match open(path, encoding='utf-8').readlines(): universal newlines,
+    translated to '\\n'. Small files are decoded up front. Large files (lockfiles,
+    generated bundles) are memory-mapped and only their line offsets are computed
+    up front, so a finding only decodes the lines around it.
+
+    Supports len(), indexing and slicing like a list of lines.
+    """
+
+    def __init__(self, path: Path, mmap_threshold: int = MMAP_THRESHOLD_BYTES):
+        """
+        Read the file.
+
+        Args:
+            path: File to read
+            mmap_threshold: Size in bytes from which the file is memory-mapped
+
+        Raises:
+            OSError: If the file cannot be read
+            UnicodeDecodeError: If a small file is not valid UTF-8
+        """
+        self.path = Path(path)
+        self._lines: Optional[List[str]] = None
+        self._data = None
+        with open(self.path, 'rb') as f:
+            self.size = os.fstat(f.fileno()).st_size
+            if self.size < mmap_threshold or self.size == 0:
+                self._lines = io.TextIOWrapper(io.BytesIO(f.read()), encoding='utf-8').readlines()
+                return
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        # (start, end) byte offsets of every line, excluding the line break
+        self._line_starts: List[int] = [0]
+        self._line_ends: List[int] = []
+        for match in _LINE_BREAK.finditer(self._data):
+            self._line_ends.append(match.start())
+            self._line_starts.append(match.end())
+        if self._line_starts[-1] == self.size:
+            self._line_starts.pop()  # File ends with a line break
+        else:
+            self._line_ends.append(self.size)
+
+    def _decode_line(self, idx: int) -> str:
+        start, end = self._line_starts[idx], self._line_ends[idx]
+        line = self._data[start:end].decode('utf-8')
+        return line + '\n' if end < self.size else line
+
+    def __len__(self) -> int:
+        return len(self._lines) if self._lines is not None else len(self._line_starts)
+
+    def __getitem__(self, key):
+        if self._lines is not None:
+            return self._lines[key]
+        if isinstance(key, slice):
+            return [self._decode_line(i) for i in range(*key.indices(len(self)))]
+        if key < 0:
+            key += len(self)
+        if not 0 <= key < len(self):
+            raise IndexError('line index out of range')
+        return self._decode_line(key)
+
+    def lines(self) -> List[str]:
+        """All lines of the file (decoded once; memory-mapped files are released afterwards)."""
+        if self._lines is None:
+            self._lines = self[:]
+            self.close()
+        return self._lines
+
+    def close(self):
+        """Release the memory map, if any."""
+        if self._data is not None:
+            self._data.close()
+            self._data = None
+
+
+# Path cache lookup result for scan paths that have not been resolved yet
+_UNRESOLVED = object()
+
+
+class _VulnerabilityLocation(NamedTuple):
+    """Where a vulnerability points to in the project."""
+    file_path: str
+    abs_file_path: Path
+    line_num: int
+    col_num: Optional[int]
+
+
 @dataclass
 class CodeContext:
     """
@@ -98,15 +692,26 @@ class VulnerableCodeExtractor:
     surrounding code context to enable more specific security analysis.
     """
     
-    def __init__(self, project_root: Optional[Path] = None):
+    def __init__(self, project_root: Optional[Path] = None, path_cache_size: int = DEFAULT_PATH_CACHE_SIZE,
+                 source_cache_size: int = DEFAULT_SOURCE_CACHE_SIZE,
+                 ignored_dirs: frozenset = DEFAULT_IGNORED_DIRS | VENDORED_DIRS):
         """
         Initialize the code extractor.
         
         Args:
             project_root: Root directory of the project. If None, auto-detects.
+            path_cache_size: Maximum number of resolved scan paths to remember
+            source_cache_size: Maximum number of source files to keep read (and of their
+                function/class scope indexes); the least recently used file is released
+                (its memory map closed) beyond that
+            ignored_dirs: Directory names never indexed when resolving scan paths. By default
+                vendored dependencies are skipped and build outputs (generated sources) are indexed.
         """
         self.logger = logging.getLogger(__name__)
         self.project_root = project_root or self._detect_project_root()
+        self.ignored_dirs = ignored_dirs
+        # Search location → file index, fetched once per extractor (see get_project_file_index)
+        self._file_indexes: Dict[int, ProjectFileIndex] = {}
         
         # Language detection mappings
         self.language_map = {
@@ -169,6 +774,20 @@ class VulnerableCodeExtractor:
             'typescript': [r'^(\s*)(?:export\s+)?(?:abstract\s+)?class\s+(\w+)'],
             'python': [r'^(\s*)class\s+(\w+)']
         }
+
+        self._compiled_function_patterns = {
+            language: [re.compile(p) for p in patterns] for language, patterns in self.function_patterns.items()
+        }
+        self._compiled_class_patterns = {
+            language: [re.compile(p) for p in patterns] for language, patterns in self.class_patterns.items()
+        }
+
+        # Per-instance caches, shared by every report parsed with this extractor:
+        # scan path → resolved project file (None for non-source paths), and
+        # absolute file path → file contents / function and class scopes
+        self._resolved_paths = BoundedLRUCache(path_cache_size)
+        self._source_files = BoundedLRUCache(source_cache_size, on_evict=lambda path, source: source.close())
+        self._scope_index_cache = BoundedLRUCache(source_cache_size)
     
     def _detect_project_root(self) -> Path:
         """Auto-detect project root directory."""
@@ -190,128 +809,229 @@ class VulnerableCodeExtractor:
             ContextExtractionResult with extracted code context
         """
         try:
-            # Extract basic vulnerability info
-            # Check for both 'path' (standard) and 'file_path' (URL-mapped) fields
-            file_path = vulnerability.get('file_path') or vulnerability.get('path', '')
-            start_info = vulnerability.get('start', {})
-            tool_name = vulnerability.get('tool', 'unknown')
-            
-            # For URL-mapped vulnerabilities, use line_number if available
-            if vulnerability.get('line_number') and not start_info.get('line'):
-                start_info = {'line': vulnerability.get('line_number')}
-            
-            # Intelligent file search - find actual file regardless of path format
-            if file_path:
-                # Check if this is a Docker image path (with or without dockerfile:// prefix)
-                # Docker image paths from Trivy represent container images, not source files
-                if (file_path.startswith('dockerfile://') or
-                    ('/' in file_path and not any(ext in file_path.lower() for ext in ['.kt', '.java', '.js', '.cjs', '.ts', '.py', '.html', '.xml', '.yml', '.yaml', '.json', '.dockerfile', '.md']))):
-
-                    # TODO: Future Enhancement - Docker Context Mapping
-                    # Currently we skip code extraction for Docker image paths because:
-                    # 1. Trivy scans built container images (e.g., "hitoshura25/webauthn-server")
-                    # 2. These are registry image names, not source file paths
-                    # 3. Container CVEs are about packages inside images, not Dockerfile syntax
-                    #
-                    # FUTURE: We could map Docker image names to actual Dockerfile paths:
-                    # - Map "hitoshura25/webauthn-server" → "webauthn-server/Dockerfile"
-                    # - Extract Dockerfile context around security issues (FROM lines, USER directives)
-                    # - Show source lines that introduced vulnerable packages or privilege escalation
-                    # - This would provide valuable Dockerfile context for container security fixes
-                    #
-                    # Implementation would require:
-                    # - Docker image name → project Dockerfile path mapping
-                    # - Dockerfile parsing to correlate CVEs with specific lines
-                    # - Enhanced context extraction for Infrastructure-as-Code security issues
-
-                    return ContextExtractionResult(
-                        success=True,
-                        code_context=None,
-                        error_message=None,
-                        extraction_metadata={
-                            'extraction_type': 'container',
-                            'original_path': file_path,
-                            'reason': 'Container image path - no source code context available (could be enhanced with Dockerfile mapping)'
-                        }
-                    )
-
-                actual_file_path = self._find_actual_file(file_path)
-                if actual_file_path:
-                    file_path = str(actual_file_path)
+            location = self._locate_vulnerability(vulnerability)
+            if isinstance(location, ContextExtractionResult):
+                return location
+            return self._extract_located(location)
+        except Exception as e:
+            self.logger.error(f"Extraction failed: {e}")
+            raise
+
+    def extract_vulnerability_contexts(self, vulnerabilities: Iterable[Dict[str, Any]],
+                                       max_workers: int = 1) -> List[ContextExtractionResult]:
+        """
+        Extract code context for many vulnerabilities, grouped by source file.
+
+        Every finding is located first; findings are then grouped by resolved file,
+        so each file is read (memory-mapped when large) and indexed once and all of
+        its findings are extracted together. With max_workers > 1, files are
+        processed on a thread pool.
+
+        Args:
+            vulnerabilities: Vulnerability data from security tools
+            max_workers: Number of threads extracting files concurrently
+
+        Returns:
+            Extraction results, in the same order as the vulnerabilities
+        """
+        results: List[Optional[ContextExtractionResult]] = []
+        by_file: Dict[Path, List[Tuple[int, _VulnerabilityLocation]]] = {}
+        try:
+            for vulnerability in vulnerabilities:
+                location = self._locate_vulnerability(vulnerability)
+                if isinstance(location, ContextExtractionResult):
+                    results.append(location)
                 else:
-                    # Infrastructure vulnerability - no source file available for code context
-                    # Return success but with no code context (infrastructure vulnerabilities are still valuable)
-                    return ContextExtractionResult(
-                        success=True,
-                        code_context=None,
-                        error_message=None,
-                        extraction_metadata={
-                            'extraction_type': 'infrastructure',
-                            'original_path': file_path,
-                            'reason': 'Infrastructure vulnerability - no source code context available'
-                        }
-                    )
-            
-            if not file_path or not start_info:
-                return ContextExtractionResult(
-                    success=False,
-                    code_context=None,
-                    error_message="Missing file path or start location information"
-                )
-            
-            line_num = start_info.get('line')
-            col_num = start_info.get('col')
-            
-            if not line_num:
-                return ContextExtractionResult(
-                    success=False,
-                    code_context=None,
-                    error_message="Missing line number information"
-                )
-            
-            # Resolve absolute file path
-            abs_file_path = self._resolve_file_path(file_path)
-            if not abs_file_path.exists():
+                    by_file.setdefault(location.abs_file_path, []).append((len(results), location))
+                    results.append(None)
+
+            def extract_file(abs_file_path: Path, file_locations: List[Tuple[int, _VulnerabilityLocation]]):
+                # Held by this group rather than the shared source cache, so other
+                # threads cannot evict (and close) it while its findings are extracted
+                try:
+                    source = SourceFile(abs_file_path)
+                except (OSError, UnicodeDecodeError):
+                    source = None  # Each finding reports the read error
+                try:
+                    for result_idx, location in file_locations:
+                        results[result_idx] = self._extract_located(location, source)
+                finally:
+                    if source is not None:
+                        source.close()
+
+            if max_workers > 1 and len(by_file) > 1:
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    # list() re-raises the first extraction error
+                    list(executor.map(extract_file, by_file.keys(), by_file.values()))
+            else:
+                for abs_file_path, file_locations in by_file.items():
+                    extract_file(abs_file_path, file_locations)
+        except Exception as e:
+            self.logger.error(f"Extraction failed: {e}")
+            raise
+
+        return results
+
+    def _locate_vulnerability(self, vulnerability: Dict[str, Any]) -> Union[_VulnerabilityLocation, ContextExtractionResult]:
+        """
+        Resolve where a vulnerability points to in the project.
+
+        Returns:
+            The vulnerability's location, or the final result if no code context
+            can be extracted for it (container images, missing files, etc.)
+        """
+        # Extract basic vulnerability info
+        # Check for both 'path' (standard) and 'file_path' (URL-mapped) fields
+        file_path = vulnerability.get('file_path') or vulnerability.get('path', '')
+        start_info = vulnerability.get('start', {})
+        tool_name = vulnerability.get('tool', 'unknown')
+        
+        # For URL-mapped vulnerabilities, use line_number if available
+        if vulnerability.get('line_number') and not start_info.get('line'):
+            start_info = {'line': vulnerability.get('line_number')}
+        
+        # Intelligent file search - find actual file regardless of path format
+        if file_path:
+            # Check if this is a Docker image path (with or without dockerfile:// prefix)
+            # Docker image paths from Trivy represent container images, not source files
+            if (file_path.startswith('dockerfile://') or
+                ('/' in file_path and not any(ext in file_path.lower() for ext in ['.kt', '.java', '.js', '.cjs', '.ts', '.py', '.html', '.xml', '.yml', '.yaml', '.json', '.dockerfile', '.md']))):
+
+                # TODO: Future Enhancement - Docker Context Mapping
+                # Currently we skip code extraction for Docker image paths because:
+                # 1. Trivy scans built container images (e.g., "hitoshura25/webauthn-server")
+                # 2. These are registry image names, not source file paths
+                # 3. Container CVEs are about packages inside images, not Dockerfile syntax
+                #
+                # FUTURE: We could map Docker image names to actual Dockerfile paths:
+                # - Map "hitoshura25/webauthn-server" → "webauthn-server/Dockerfile"
+                # - Extract Dockerfile context around security issues (FROM lines, USER directives)
+                # - Show source lines that introduced vulnerable packages or privilege escalation
+                # - This would provide valuable Dockerfile context for container security fixes
+                #
+                # Implementation would require:
+                # - Docker image name → project Dockerfile path mapping
+                # - Dockerfile parsing to correlate CVEs with specific lines
+                # - Enhanced context extraction for Infrastructure-as-Code security issues
+
                 return ContextExtractionResult(
-                    success=False,
+                    success=True,
                     code_context=None,
-                    error_message=f"File not found: {abs_file_path}"
+                    error_message=None,
+                    extraction_metadata={
+                        'extraction_type': 'container',
+                        'original_path': file_path,
+                        'reason': 'Container image path - no source code context available (could be enhanced with Dockerfile mapping)'
+                    }
                 )
-            
-            # Read file content
-            try:
-                with open(abs_file_path, 'r', encoding='utf-8') as f:
-                    file_lines = f.readlines()
-            except Exception as e:
+
+            actual_file_path = self._resolve_scan_path(file_path)
+            if actual_file_path:
+                file_path = str(actual_file_path)
+            else:
+                # Infrastructure vulnerability - no source file available for code context
+                # Return success but with no code context (infrastructure vulnerabilities are still valuable)
                 return ContextExtractionResult(
-                    success=False,
+                    success=True,
                     code_context=None,
-                    error_message=f"Failed to read file: {e}"
+                    error_message=None,
+                    extraction_metadata={
+                        'extraction_type': 'infrastructure',
+                        'original_path': file_path,
+                        'reason': 'Infrastructure vulnerability - no source code context available'
+                    }
                 )
-            
-            # Extract code context
+        
+        if not file_path or not start_info:
+            return ContextExtractionResult(
+                success=False,
+                code_context=None,
+                error_message="Missing file path or start location information"
+            )
+        
+        line_num = start_info.get('line')
+        col_num = start_info.get('col')
+        
+        if not line_num:
+            return ContextExtractionResult(
+                success=False,
+                code_context=None,
+                error_message="Missing line number information"
+            )
+        
+        # Resolve absolute file path
+        abs_file_path = self._resolve_file_path(file_path)
+        if not abs_file_path.exists():
+            return ContextExtractionResult(
+                success=False,
+                code_context=None,
+                error_message=f"File not found: {abs_file_path}"
+            )
+        
+        return _VulnerabilityLocation(file_path, abs_file_path, line_num, col_num)
+
+    def _extract_located(self, location: _VulnerabilityLocation,
+                         source: Optional[SourceFile] = None) -> ContextExtractionResult:
+        """Extract the code context at a resolved location (from source if already read)."""
+        # Read file content (once per file)
+        try:
+            if source is None:
+                source = self._get_source_file(location.abs_file_path)
             code_context = self._extract_code_context(
-                file_lines=file_lines,
-                file_path=file_path,
-                line_num=line_num,
-                col_num=col_num,
-                abs_file_path=abs_file_path
+                source=source,
+                file_path=location.file_path,
+                line_num=location.line_num,
+                col_num=location.col_num,
+                abs_file_path=location.abs_file_path
             )
-            
+        except (OSError, UnicodeDecodeError) as e:
             return ContextExtractionResult(
-                success=True,
-                code_context=code_context,
-                extraction_metadata={
-                    'total_lines': len(file_lines),
-                    'file_size_bytes': abs_file_path.stat().st_size,
-                    'extraction_method': 'static_analysis'
-                }
+                success=False,
+                code_context=None,
+                error_message=f"Failed to read file: {e}"
             )
-            
-        except Exception as e:
-            self.logger.error(f"Extraction failed: {e}")
-            raise
+
+        return ContextExtractionResult(
+            success=True,
+            code_context=code_context,
+            extraction_metadata={
+                'total_lines': len(source),
+                'file_size_bytes': source.size,
+                'extraction_method': 'static_analysis'
+            }
+        )
     
+    def _resolve_scan_path(self, scan_file_path: str) -> Optional[Path]:
+        """Resolve a scan path to a project file, caching the outcome (including misses)."""
+        resolved = self._resolved_paths.get(scan_file_path, _UNRESOLVED)
+        if resolved is _UNRESOLVED:
+            resolved = self._find_actual_file(scan_file_path)
+            self._resolved_paths.put(scan_file_path, resolved)
+        return resolved
+
+    def _get_source_file(self, abs_file_path: Path) -> SourceFile:
+        """Read a source file once and reuse it for later vulnerabilities in the same file."""
+        source = self._source_files.get(abs_file_path)
+        if source is None:
+            source = SourceFile(abs_file_path)
+            self._source_files.put(abs_file_path, source)
+        return source
+
+    def _get_scope_index(self, abs_file_path: Path, source: SourceFile,
+                         language: str) -> Optional[FileScopeIndex]:
+        """Build a file's scope index once and reuse it for later vulnerabilities in the same file."""
+        if not len(source) or language not in self._compiled_function_patterns:
+            return None
+        scope_index = self._scope_index_cache.get(abs_file_path)
+        if scope_index is None:
+            scope_index = FileScopeIndex(
+                source.lines(), language,
+                function_patterns=self._compiled_function_patterns[language],
+                class_patterns=self._compiled_class_patterns.get(language, [])
+            )
+            self._scope_index_cache.put(abs_file_path, scope_index)
+        return scope_index
+
     def _find_actual_file(self, scan_file_path: str) -> Path:
         """
         Intelligently find the actual file in the project regardless of scan path format.
@@ -426,6 +1146,23 @@ class VulnerableCodeExtractor:
         
         return candidates
     
+    def _get_file_index(self, location_idx: int) -> ProjectFileIndex:
+        """
+        Get the file index for a search location, building it lazily.
+
+        Location 0 is the project root; location 1 is its parent (for sibling
+        projects), which excludes the project root since it is indexed already.
+        """
+        index = self._file_indexes.get(location_idx)
+        if index is None:
+            if location_idx == 0:
+                index = get_project_file_index(self.project_root, ignored_dirs=self.ignored_dirs)
+            else:
+                index = get_project_file_index(self.project_root.parent, excluded_paths=[self.project_root],
+                                               ignored_dirs=self.ignored_dirs)
+            self._file_indexes[location_idx] = index
+        return index
+
     def _search_for_file(self, relative_path: str) -> Path:
         """Search for a file using various strategies."""
         if not relative_path:
@@ -438,23 +1175,19 @@ class VulnerableCodeExtractor:
         
         filename = Path(relative_path).name
         
-        for base_location in search_locations:
+        for location_idx, base_location in enumerate(search_locations):
             # Strategy 1: Direct path match
             direct_path = base_location / relative_path
             if direct_path.exists():
                 return direct_path
             
-            # Strategy 2: Find by filename using glob search
-            try:
-                matches = list(base_location.glob(f"**/{filename}"))
-                if matches:
-                    # If multiple matches, prefer ones that match more of the original path
-                    best_match = self._find_best_path_match(matches, relative_path)
-                    if best_match:
-                        return best_match
-            except Exception as e:
-                self.logger.error(f"Error during glob search: {e}")
-                raise
+            # Strategy 2: Find by filename using the prebuilt project file index
+            matches = self._get_file_index(location_idx).find(filename)
+            if matches:
+                # If multiple matches, prefer ones that match more of the original path
+                best_match = self._find_best_path_match(matches, relative_path)
+                if best_match:
+                    return best_match
         
         return None
     
@@ -469,7 +1202,7 @@ class VulnerableCodeExtractor:
         
         for candidate in candidates:
             # Score based on how many path components match
-            candidate_parts = str(candidate).lower().split('/')
+            candidate_parts = set(str(candidate).lower().split('/'))
             score = 0
             for target_part in target_parts:
                 if target_part in candidate_parts:
@@ -496,7 +1229,7 @@ class VulnerableCodeExtractor:
         clean_path = file_path.strip('./')
         return self.project_root / clean_path
     
-    def _extract_code_context(self, file_lines: List[str], file_path: str, 
+    def _extract_code_context(self, source: SourceFile, file_path: str, 
                             line_num: int, col_num: Optional[int],
                             abs_file_path: Path) -> CodeContext:
         """Extract detailed code context around vulnerability."""
@@ -519,23 +1252,22 @@ class VulnerableCodeExtractor:
         
         # Get vulnerable line (1-indexed to 0-indexed)
         vuln_line_idx = line_num - 1
-        if not (0 <= vuln_line_idx < len(file_lines)):
+        if not (0 <= vuln_line_idx < len(source)):
             return None
-        vulnerable_code = file_lines[vuln_line_idx].rstrip() if vuln_line_idx < len(file_lines) else ""
+        vulnerable_code = source[vuln_line_idx].rstrip()
         
         # Extract context lines
         context_size = 10
         start_idx = max(0, vuln_line_idx - context_size)
-        end_idx = min(len(file_lines), vuln_line_idx + context_size + 1)
-        
-        before_lines = [line.rstrip() for line in file_lines[start_idx:vuln_line_idx]]
-        after_lines = [line.rstrip() for line in file_lines[vuln_line_idx + 1:end_idx]]
+        end_idx = min(len(source), vuln_line_idx + context_size + 1)
         
-        # Find function context
-        function_info = self._find_function_context(file_lines, vuln_line_idx, language)
+        before_lines = [line.rstrip() for line in source[start_idx:vuln_line_idx]]
+        after_lines = [line.rstrip() for line in source[vuln_line_idx + 1:end_idx]]
         
-        # Find class context  
-        class_info = self._find_class_context(file_lines, vuln_line_idx, language)
+        # Find enclosing function and class
+        scope_index = self._get_scope_index(abs_file_path, source, language)
+        function_info = scope_index.function_context(vuln_line_idx) if scope_index else {}
+        class_info = scope_index.class_context(vuln_line_idx) if scope_index else {}
         
         return CodeContext(
             file_path=file_path,
@@ -555,119 +1287,6 @@ class VulnerableCodeExtractor:
             language=language
         )
     
-    def _find_function_context(self, file_lines: List[str], vuln_line_idx: int, language: str) -> Dict[str, Any]:
-        """Find the function containing the vulnerable line."""
-        if not file_lines or language not in self.function_patterns:
-            return {}
-        
-        patterns = self.function_patterns[language]
-        
-        # Search backwards for function declaration
-        for i in range(vuln_line_idx, -1, -1):
-            line = file_lines[i].strip()
-            
-            for pattern in patterns:
-                match = re.search(pattern, file_lines[i])
-                if match:
-                    # Extract function name from match groups
-                    function_name = None
-                    for group in match.groups():
-                        if group and group.strip() and not group.isspace():
-                            if not group.startswith((' ', '\t')):  # Skip indentation groups
-                                function_name = group.strip()
-                                break
-                    
-                    if function_name:
-                        # Find function end (simple brace matching)
-                        func_start = i
-                        func_end = self._find_function_end(file_lines, func_start, language)
-                        
-                        if func_start <= vuln_line_idx <= func_end:
-                            function_code = ''.join(file_lines[func_start:func_end + 1])
-                            
-                            return {
-                                'name': function_name,
-                                'start_line': func_start + 1,  # Convert to 1-indexed
-                                'end_line': func_end + 1,
-                                'code': function_code.rstrip()
-                            }
-        
-        return {}
-    
-    def _find_class_context(self, file_lines: List[str], vuln_line_idx: int, language: str) -> Dict[str, Any]:
-        """Find the class containing the vulnerable line."""
-        if not file_lines or language not in self.class_patterns:
-            return {}
-        
-        patterns = self.class_patterns[language]
-        
-        # Search backwards for class declaration
-        for i in range(vuln_line_idx, -1, -1):
-            for pattern in patterns:
-                match = re.search(pattern, file_lines[i])
-                if match:
-                    # Extract class name
-                    class_name = match.groups()[-1]  # Usually last group is class name
-                    
-                    if class_name:
-                        # For class context, just return the class declaration line
-                        class_code = file_lines[i].rstrip()
-                        
-                        return {
-                            'name': class_name,
-                            'start_line': i + 1,  # Convert to 1-indexed
-                            'code': class_code
-                        }
-        
-        return {}
-    
-    def _find_function_end(self, file_lines: List[str], start_idx: int, language: str) -> int:
-        """Find the end of a function using simple brace/indentation matching."""
-        if language in ['python']:
-            # Python uses indentation
-            return self._find_python_function_end(file_lines, start_idx)
-        else:
-            # Most languages use braces
-            return self._find_brace_function_end(file_lines, start_idx)
-    
-    def _find_python_function_end(self, file_lines: List[str], start_idx: int) -> int:
-        """Find end of Python function by indentation."""
-        if start_idx >= len(file_lines):
-            return start_idx
-        
-        # Get base indentation
-        start_line = file_lines[start_idx]
-        base_indent = len(start_line) - len(start_line.lstrip())
-        
-        for i in range(start_idx + 1, len(file_lines)):
-            line = file_lines[i]
-            if line.strip():  # Skip empty lines
-                current_indent = len(line) - len(line.lstrip())
-                if current_indent <= base_indent:
-                    return i - 1
-        
-        return len(file_lines) - 1
-    
-    def _find_brace_function_end(self, file_lines: List[str], start_idx: int) -> int:
-        """Find end of function using brace matching."""
-        brace_count = 0
-        found_first_brace = False
-        
-        for i in range(start_idx, len(file_lines)):
-            line = file_lines[i]
-            
-            for char in line:
-                if char == '{':
-                    brace_count += 1
-                    found_first_brace = True
-                elif char == '}':
-                    brace_count -= 1
-                    
-                    if found_first_brace and brace_count == 0:
-                        return i
-        
-        return len(file_lines) - 1
-    
     def extract_multiple_vulnerabilities(self, vulnerabilities: List[Dict[str, Any]]) -> List[ContextExtractionResult]:
         """
         Extract code context for multiple vulnerabilities.
@@ -678,13 +1297,7 @@ class VulnerableCodeExtractor:
         Returns:
             List of extraction results
         """
-        results = []
-        
-        for vuln in vulnerabilities:
-            result = self.extract_vulnerability_context(vuln)
-            results.append(result)
-        
-        return results
+        return self.extract_vulnerability_contexts(vulnerabilities)
     
     def get_extraction_summary(self, results: List[ContextExtractionResult]) -> Dict[str, Any]:
         """
@@ -717,7 +1330,10 @@ class VulnerableCodeExtractor:
             'success_rate': successful / total if total > 0 else 0,
             'languages_processed': languages,
             'unique_files': len(files),
-            'files_processed': list(files)
+            'files_processed': list(files),
+            'path_resolution_cache': self._resolved_paths.stats(),
+            'source_file_cache': self._source_files.stats(),
+            'scope_index_cache': self._scope_index_cache.stats()
         }
 
 